@@ -17,6 +17,7 @@ from ..tools.compliance_tools import (
     check_fair_trade_compliance,
     check_internal_policy_compliance,
     perform_full_compliance_check,
+    batch_compliance_check,
     generate_compliance_suggestions,
     save_validation_results,
     query_validation_history,
@@ -38,6 +39,7 @@ def compliance_agent(state: AgentState) -> dict:
         check_fair_trade_compliance,
         check_internal_policy_compliance,
         perform_full_compliance_check,
+        batch_compliance_check,
         generate_compliance_suggestions,
         save_validation_results,
         query_validation_history,
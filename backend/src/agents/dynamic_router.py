@@ -11,6 +11,18 @@ from langchain_openai import ChatOpenAI
 from ..state.enhanced_state import EnhancedAgentState
 
 
+def pending_parallel_group(execution_plan: Dict[str, Any], results: Dict[str, Any]) -> List[str]:
+    """
+    First parallel group from the plan with more than one agent still to run
+    Returns an empty list when no group can be fanned out
+    """
+    for group in execution_plan.get("parallel_tasks", []):
+        pending_in_group = [a for a in group if a not in results]
+        if len(pending_in_group) > 1:
+            return pending_in_group
+    return []
+
+
 class DynamicRouter:
     """
     Intelligent router that handles:
@@ -106,9 +118,10 @@ class DynamicRouter:
         # Check parallel tasks
         for group in parallel_tasks:
             pending_in_group = [a for a in group if a not in completed_agents]
+            if len(pending_in_group) > 1:
+                # The parallel_agents node runs the whole group concurrently
+                return ("parallel_agents", f"Parallel group: {pending_in_group}")
             if pending_in_group:
-                # Return first pending agent from parallel group
-                # In real implementation, these would run in parallel
                 return (pending_in_group[0], f"Part of parallel group: {group}")
         
         # Check if there are conditional tasks
@@ -243,16 +256,13 @@ class DynamicRouter:
             "progress": progress
         }
         
-        # Update routing history
-        routing_history = state.get("routing_history", [])
-        routing_history.append(routing_entry)
-        
         return {
             "next_agent": next_agent,
             "routing_reason": reason,
             "completion_percentage": progress,
             "estimated_remaining_time": remaining_time,
-            "routing_history": routing_history
+            # routing_history is an append channel; return only the new entry
+            "routing_history": [routing_entry]
         }
 
 
@@ -309,6 +319,7 @@ def dynamic_router_agent(state: EnhancedAgentState) -> Dict[str, Any]:
         # No execution plan - route to execution planner
         return {
             "current_agent": "execution_planner",
+            "next_agent": "execution_planner",
             "progress": [{
                 "agent": "dynamic_router",
                 "timestamp": datetime.now().isoformat(),
@@ -397,6 +408,7 @@ def dynamic_router_agent(state: EnhancedAgentState) -> Dict[str, Any]:
         return {
             "messages": [completion_message],
             "current_agent": "supervisor",
+            "next_agent": "END",
             "is_complete": True,
             "completion_percentage": 100.0,
             "progress": [{
@@ -443,7 +455,7 @@ def route_from_dynamic_router(state: EnhancedAgentState) -> str:
         return "end"
     elif next_agent in ["analytics", "search", "document", "compliance"]:
         return next_agent
-    elif next_agent in ["query_analyzer", "execution_planner"]:
+    elif next_agent in ["query_analyzer", "execution_planner", "parallel_agents"]:
         return next_agent
     else:
         return "supervisor"
\ No newline at end of file
@@ -94,6 +94,10 @@ AGENT_DESCRIPTIONS = {
 }
 
 
+# LLM complexity labels -> enum; state stores the enum's string value
+COMPLEXITY_MAP = {complexity.value: complexity for complexity in QueryComplexity}
+
+
 class DescriptionBasedAnalyzer:
     """Description-based query analyzer using LLM"""
     
@@ -342,13 +346,7 @@ def query_analyzer_agent(state: EnhancedAgentState) -> Dict[str, Any]:
     entities = analyzer.extract_entities_from_context(query, analysis_result)
     
     # Map complexity to enum
-    complexity_map = {
-        "simple": QueryComplexity.SIMPLE,
-        "moderate": QueryComplexity.MODERATE,
-        "complex": QueryComplexity.COMPLEX,
-        "advanced": QueryComplexity.ADVANCED
-    }
-    query_complexity = complexity_map.get(analysis_result["complexity"], QueryComplexity.MODERATE)
+    query_complexity = COMPLEXITY_MAP.get(analysis_result["complexity"], QueryComplexity.MODERATE)
     
     # Build execution plan from analysis
     execution_plan = {
@@ -19,7 +19,7 @@ from ..tools.search_tools import (
     merge_search_results,
     semantic_search
 )
-from ..state.enhanced_state import EnhancedAgentState as AgentState
+from ..state.enhanced_state import EnhancedAgentState as AgentState, dump_blob
 
 
 def search_agent(state: AgentState) -> dict:
@@ -172,6 +172,7 @@ def search_agent(state: AgentState) -> dict:
         
         # Rerank all documents using BGE-reranker-ko
         reranked_results = None
+        reranked_blob = None
         if all_documents:
             logger.info(f"Reranking {len(all_documents)} documents...")
             reranked_result = rerank_search_results.invoke({
@@ -180,6 +181,7 @@ def search_agent(state: AgentState) -> dict:
                 "top_k": min(10, len(all_documents))
             })
             reranked_results = json.loads(reranked_result)
+            reranked_blob = reranked_result.encode()
         
         # Merge all search results
         logger.info("Merging search results...")
@@ -279,8 +281,9 @@ def search_agent(state: AgentState) -> dict:
             "timestamp": datetime.now().isoformat(),
             "query": task_description,
             "search_stats": search_stats,
-            "merged_results": merged_data,
-            "reranked_results": reranked_results,
+            # Full document payloads are only read outside the graph; keep them as JSON bytes
+            "merged_results": dump_blob(merged_data),
+            "reranked_results": reranked_blob,
             "llm_insights": llm_response.content,
             "raw_data": {  # Structured data for other agents
                 "companies_found": list(set(companies_found[:10])),  # Deduplicated top 10
@@ -2,14 +2,31 @@
 Supervisor Agent for LangGraph 0.6.6
 Manages task routing and coordination between agents
 """
-from typing import Dict, Any
+from typing import Dict, Any, Final, Literal, get_args
 from datetime import datetime
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_openai import ChatOpenAI
 from ..state.enhanced_state import EnhancedAgentState as AgentState
-TaskType = str  # Compatibility alias
 import json
 
+# Task types the supervisor writes to state["task_type"]: agent names from the
+# execution plan plus the legacy intent-style aliases
+TaskType = Literal["analytics", "analyze", "search", "document", "validate", "compliance", "end"]
+TASK_TYPES: Final[tuple[str, ...]] = get_args(TaskType)
+
+# task_type -> graph node, resolved with a single dict lookup per routing call
+_TASK_ROUTES: Final[Dict[str, str]] = {
+    "analytics": "analytics",
+    "analyze": "analytics",
+    "search": "search",
+    "document": "document",
+    "compliance": "compliance",
+    "validate": "compliance",  # Validation handled by compliance
+    "end": "end"
+}
+# Every task type has a route and every route key is a declared task type
+assert set(_TASK_ROUTES) == set(TASK_TYPES), "_TASK_ROUTES keys must match TaskType"
+
 
 def supervisor_agent(state: AgentState) -> dict:
     """
@@ -133,8 +150,10 @@ def supervisor_agent(state: AgentState) -> dict:
         }
     
     # Check if there's a next_agent signal from previous agent (like compliance re-routing)
+    # "supervisor" is the router handing control back here (low confidence,
+    # no recovery route), not a target, so it falls through to the normal path
     next_agent = state.get("next_agent")
-    if next_agent:
+    if next_agent and next_agent != "supervisor":
         # Analyze why re-routing is needed
         re_route_reason = ""
         if next_agent == "document" and context.get("document_revision_needed"):
@@ -164,7 +183,8 @@ def supervisor_agent(state: AgentState) -> dict:
             "task_type": next_agent,
             "task_description": state.get("task_description", ""),
             "progress": [progress_update],
-            "context": context
+            "context": context,
+            "next_agent": None
         }
     
     # Normal routing based on user request
@@ -293,20 +313,4 @@ def route_by_task_type(state: AgentState) -> str:
     Routing function for conditional edges
     Returns the next node based on task_type
     """
-    task_type = state.get("task_type", "end")
-    
-    # Direct mapping for agent names (used in execution plan)
-    if task_type in ["analytics", "search", "document", "compliance"]:
-        return task_type
-    
-    # Map task types to agent nodes
-    routing_map = {
-        "analyze": "analytics",
-        "search": "search",
-        "document": "document",
-        "compliance": "compliance",
-        "validate": "compliance",  # Validation handled by compliance
-        "end": "end"
-    }
-    
-    return routing_map.get(task_type, "end")
\ No newline at end of file
+    return _TASK_ROUTES.get(state.get("task_type", "end"), "end")
\ No newline at end of file
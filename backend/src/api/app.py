@@ -1,32 +1,90 @@
 """
 Enhanced FastAPI main application with full LangGraph 0.6.6 integration
 """
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
+from fastapi import FastAPI, WebSocket, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, Any, List, Union
+from dataclasses import dataclass
 import os
 import json
+import orjson
 import asyncio
+import functools
+import itertools
+import secrets
+import time
 from datetime import datetime
 from dotenv import load_dotenv
 from loguru import logger
+from importlib.metadata import version as _package_version
 import traceback
 
 # Load environment variables
 load_dotenv()
 
 # Import our enhanced graph components
-from ..graph.enhanced_graph import create_enhanced_graph, execute_enhanced_query
-from ..state.enhanced_state import create_initial_state
+from ..graph.enhanced_graph import (
+    GRAPH_DURABILITY,
+    build_graph_config,
+    build_graph_input,
+    create_enhanced_graph,
+    execute_enhanced_query,
+    new_thread_id
+)
+from ..state.enhanced_state import decode_result_blobs
 # mock_db_router removed - moved to tests/mock_db.py (only used for testing)
 
 # Global enhanced graph instance
 enhanced_graph = None
 
+# Resolved once at import; langgraph is a namespace package without __version__
+LANGGRAPH_VERSION = _package_version("langgraph")
+
+# Monotonic counter plus random suffix keeps anonymous client ids unique
+_client_counter = itertools.count()
+
+# Error responses carry a timestamp only when opted in (proxies usually add one)
+ERROR_TIMESTAMPS = os.getenv("ERROR_TIMESTAMPS", "false").lower() == "true"
+
+
+@functools.lru_cache(maxsize=1)
+def _iso_second(epoch_second: int) -> str:
+    return datetime.fromtimestamp(epoch_second).isoformat()
+
+
+def _iso_now() -> str:
+    """Local ISO-8601 timestamp; the date/time part is formatted once per second"""
+    now = time.time()
+    second = int(now)
+    return f"{_iso_second(second)}.{int((now - second) * 1_000_000):06d}"
+
+
+def _error_content(content: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach the timestamp to an error body when ERROR_TIMESTAMPS is set"""
+    if ERROR_TIMESTAMPS:
+        content["timestamp"] = _iso_now()
+    return content
+
+# Shared SSE headers; X-Accel-Buffering stops nginx from buffering the stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+    "Connection": "keep-alive"
+}
+
+# Admission control: caps concurrent graph executions across /graph/invoke,
+# SSE streaming and the WebSocket handlers, which share one SQLite checkpointer
+MAX_CONCURRENT_GRAPHS = int(os.getenv("MAX_CONCURRENT_GRAPHS", "16"))
+_ADMISSION = asyncio.Semaphore(MAX_CONCURRENT_GRAPHS)
+
+# WebSocket backpressure: frames a client may fall behind before it is
+# dropped, and how long a closing endpoint waits for queued frames to flush
+WS_QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", "256"))
+WS_FLUSH_TIMEOUT = float(os.getenv("WS_FLUSH_TIMEOUT", "5"))
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -54,14 +112,20 @@ app = FastAPI(
     title="Sales Support AI API - Enhanced",
     description="LangGraph 0.6.6 based Sales Support AI System with full integration",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
-cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+cors_origins = tuple(
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+    if origin.strip()
+)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=cors_origins,
+    # CORSMiddleware only tests membership, so a frozenset keeps lookups O(1)
+    allow_origins=frozenset(cors_origins),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -76,6 +140,8 @@ app.add_middleware(
 # Request/Response Models
 class GraphInvokeRequest(BaseModel):
     """Request model for graph invocation"""
+    model_config = ConfigDict(populate_by_name=True)
+
     input: Dict[str, Any] = Field(description="Input to the graph")
     config: Optional[Dict[str, Any]] = Field(default=None, description="Configuration for the graph")
     thread_id: Optional[str] = Field(default=None, description="Thread ID for conversation continuity")
@@ -84,6 +150,8 @@ class GraphInvokeRequest(BaseModel):
 
 class GraphInvokeResponse(BaseModel):
     """Response model for graph invocation"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+
     output: Dict[str, Any]
     thread_id: str
     execution_time: float
@@ -93,52 +161,110 @@ class GraphInvokeResponse(BaseModel):
 
 class StreamEvent(BaseModel):
     """Model for streaming events"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+
     type: str
     node: Optional[str] = None
     data: Dict[str, Any]
     timestamp: str
 
 
+@dataclass(slots=True)
+class ProgressEvent:
+    """Per-node progress frame sent over the WebSocket (serialized by orjson)"""
+    node: str
+    node_count: int
+    current_agent: Optional[str]
+    progress: Any
+    execution_plan: list
+    current_step: int
+    total_steps: int
+    timestamp: str
+    type: str = "progress"
+
+
 # WebSocket Manager
 class EnhancedConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.connection_metadata: Dict[str, Dict] = {}
+        # Per-client outbound queue drained by a single writer task, so frames
+        # keep their order and handlers never block on (or race) socket writes.
+        # The queue is bounded: a client WS_QUEUE_SIZE frames behind is dropped
+        self.outbound_queues: Dict[str, asyncio.Queue] = {}
+        self.writers: Dict[str, asyncio.Task] = {}
 
     async def connect(self, websocket: WebSocket, client_id: str):
         await websocket.accept()
         self.active_connections[client_id] = websocket
         self.connection_metadata[client_id] = {
-            "connected_at": datetime.now().isoformat(),
+            "connected_at": _iso_now(),
             "message_count": 0
         }
+        queue: asyncio.Queue = asyncio.Queue(maxsize=WS_QUEUE_SIZE)
+        self.outbound_queues[client_id] = queue
+        self.writers[client_id] = asyncio.create_task(
+            self._writer(websocket, queue, client_id, self.connection_metadata[client_id])
+        )
         logger.info(f"WebSocket connected: {client_id}")
 
-    def disconnect(self, client_id: str):
+    def disconnect(self, client_id: str) -> Optional[asyncio.Task]:
+        """
+        Forget the client and return its writer, which exits once its queue is
+        flushed. With the queue full the client is stalled, so the writer is
+        cancelled and the queued frames are dropped
+        """
         if client_id in self.active_connections:
             del self.active_connections[client_id]
             del self.connection_metadata[client_id]
+            writer = self.writers.pop(client_id)
+            try:
+                self.outbound_queues.pop(client_id).put_nowait(None)
+            except asyncio.QueueFull:
+                if writer is not asyncio.current_task():
+                    writer.cancel()
             logger.info(f"WebSocket disconnected: {client_id}")
+            return writer
+        return None
 
-    async def send_message(self, message: str, client_id: str):
-        if client_id in self.active_connections:
-            websocket = self.active_connections[client_id]
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue, client_id: str, metadata: Dict):
+        while (message := await queue.get()) is not None:
             try:
                 await websocket.send_text(message)
-                self.connection_metadata[client_id]["message_count"] += 1
             except Exception as e:
                 logger.warning(f"Failed to send message to {client_id}: {e}")
-                # Remove disconnected client
                 self.disconnect(client_id)
-                return False
+                return
+            metadata["message_count"] += 1
+
+    async def send_message(self, message: str, client_id: str):
+        """Queue a frame; False when the client is gone or too far behind (then dropped)"""
+        queue = self.outbound_queues.get(client_id)
+        if queue is None:
+            return False
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning(f"WebSocket {client_id} is {queue.qsize()} frames behind, disconnecting")
+            self.disconnect(client_id)
+            return False
         return True
 
-    async def send_json(self, data: dict, client_id: str):
-        return await self.send_message(json.dumps(data, ensure_ascii=False), client_id)
+    async def flush(self, writer: asyncio.Task, client_id: str):
+        """Wait up to WS_FLUSH_TIMEOUT for queued frames to go out, then give up on the peer"""
+        done, _ = await asyncio.wait({writer}, timeout=WS_FLUSH_TIMEOUT)
+        if not done:
+            logger.warning(f"WebSocket {client_id} did not drain within {WS_FLUSH_TIMEOUT}s")
+            writer.cancel()
+
+    async def send_json(self, data: Union[dict, ProgressEvent], client_id: str):
+        payload = orjson.dumps(data, option=orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NON_STR_KEYS)
+        return await self.send_message(payload.decode(), client_id)
 
     async def broadcast(self, message: str):
-        for client_id, connection in self.active_connections.items():
-            await connection.send_text(message)
+        # Snapshot once: clients may disconnect while we enqueue
+        for client_id in list(self.active_connections):
+            await self.send_message(message, client_id)
 
     def get_connection_info(self, client_id: str) -> Optional[Dict]:
         return self.connection_metadata.get(client_id)
@@ -148,29 +274,37 @@ manager = EnhancedConnectionManager()
 
 
 # Main API Endpoints
+# Static system info serialized once; only the timestamp is appended per call
+_ROOT_PAYLOAD_PREFIX = orjson.dumps({
+    "message": "Sales Support AI API - Enhanced Version",
+    "version": "2.0.0",
+    "langgraph_version": LANGGRAPH_VERSION,
+    "status": "running",
+    "features": {
+        "graph_invoke": True,
+        "websocket_streaming": True,
+        "error_handling": "comprehensive"
+    }
+})[:-1]
+
+
 @app.get("/")
 async def root():
     """Enhanced root endpoint with system info"""
-    import langgraph
-    return {
-        "message": "Sales Support AI API - Enhanced Version",
-        "version": "2.0.0",
-        "langgraph_version": langgraph.__version__,
-        "status": "running",
-        "features": {
-            "graph_invoke": True,
-            "websocket_streaming": True,
-            "error_handling": "comprehensive"
-        },
-        "timestamp": datetime.now().isoformat()
-    }
+    return Response(
+        content=_ROOT_PAYLOAD_PREFIX + b',"timestamp":' + orjson.dumps(_iso_now()) + b"}",
+        media_type="application/json"
+    )
 
 
 @app.post("/api/graph/invoke", response_model=GraphInvokeResponse)
-async def invoke_graph(request: GraphInvokeRequest):
+async def invoke_graph(request: GraphInvokeRequest, include_history: bool = False):
     """
     Main endpoint to invoke the LangGraph StateGraph
     Following LangGraph 0.6.6 patterns
+    
+    The output carries only the final message unless include_history=true,
+    so the response does not grow with the thread's message history.
     """
     start_time = datetime.now()
     
@@ -189,21 +323,25 @@ async def invoke_graph(request: GraphInvokeRequest):
         if not user_input:
             raise HTTPException(status_code=400, detail="No input message provided")
         
+        thread_id = request.thread_id or new_thread_id()
+        
         # Process through graph
         if request.stream:
             # Return streaming response
             return StreamingResponse(
-                stream_graph_execution(user_input, request.thread_id),
-                media_type="text/event-stream"
+                stream_graph_execution(user_input, thread_id),
+                media_type="text/event-stream",
+                headers=SSE_HEADERS
             )
         else:
             # Regular invocation with enhanced graph
-            config = {"configurable": {"thread_id": request.thread_id or "default"}}
-            result = await execute_enhanced_query(
-                enhanced_graph,
-                query=user_input,
-                config=config
-            )
+            config = build_graph_config(thread_id)
+            async with _ADMISSION:
+                result = await execute_enhanced_query(
+                    enhanced_graph,
+                    query=user_input,
+                    config=config
+                )
             
             # Calculate execution time
             execution_time = (datetime.now() - start_time).total_seconds()
@@ -212,14 +350,26 @@ async def invoke_graph(request: GraphInvokeRequest):
             progress = result.get("progress", [])
             agent_path = [p.get("agent", "unknown") for p in progress]
             
-            return GraphInvokeResponse(
-                output=result,
-                thread_id=result.get("metadata", {}).get("thread_id", ""),
+            output = result
+            if result.get("results"):
+                output = {**result, "results": decode_result_blobs(result["results"])}
+            if not include_history and len(result.get("messages") or ()) > 1:
+                output = {**output, "messages": result["messages"][-1:]}
+            
+            response = GraphInvokeResponse(
+                output=output,
+                thread_id=thread_id,
                 execution_time=execution_time,
                 agent_path=agent_path,
                 status="success"
             )
             
+            # Serialize via pydantic-core directly, skipping jsonable_encoder
+            return Response(
+                content=response.model_dump_json(),
+                media_type="application/json"
+            )
+            
     except HTTPException:
         raise
     except Exception as e:
@@ -231,36 +381,35 @@ async def stream_graph_execution(user_input: str, thread_id: Optional[str] = Non
     """
     Stream graph execution as Server-Sent Events
     """
+    thread_id = thread_id or new_thread_id()
     try:
         # Stream with enhanced graph
-        config = {"configurable": {"thread_id": thread_id or "default"}}
-        initial_state = create_initial_state()
-        from langchain_core.messages import HumanMessage
-        initial_state["messages"] = [HumanMessage(content=user_input)]
-        initial_state["raw_query"] = user_input
+        config = build_graph_config(thread_id)
+        initial_state = build_graph_input(user_input)
         
-        async for output in enhanced_graph.astream(initial_state, config):
-            for node_name, node_output in output.items():
-                event = {
-                    "type": "node_output",
-                    "node": node_name,
-                    "data": {
-                        "current_agent": node_output.get("current_agent"),
-                        "progress": node_output.get("progress"),
-                        "message": str(node_output.get("messages", [])[-1].content) if node_output.get("messages") else None
-                    },
-                    "timestamp": datetime.now().isoformat()
-                }
-                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        async with _ADMISSION:
+            async for output in enhanced_graph.astream(initial_state, config, durability=GRAPH_DURABILITY):
+                for node_name, node_output in output.items():
+                    event = {
+                        "type": "node_output",
+                        "node": node_name,
+                        "data": {
+                            "current_agent": node_output.get("current_agent"),
+                            "progress": node_output.get("progress"),
+                            "message": str(node_output.get("messages", [])[-1].content) if node_output.get("messages") else None
+                        },
+                        "timestamp": _iso_now()
+                    }
+                    yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
         
         # Send completion event
-        yield f"data: {json.dumps({'type': 'complete', 'timestamp': datetime.now().isoformat()})}\n\n"
+        yield f"data: {json.dumps({'type': 'complete', 'thread_id': thread_id, 'timestamp': _iso_now()})}\n\n"
         
     except Exception as e:
         error_event = {
             "type": "error",
             "message": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _iso_now()
         }
         yield f"data: {json.dumps(error_event)}\n\n"
 
@@ -271,15 +420,14 @@ async def websocket_stream(websocket: WebSocket, client_id: Optional[str] = None
     Enhanced WebSocket endpoint for real-time streaming with progress updates
     """
     if not client_id:
-        client_id = f"client_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        client_id = f"c{next(_client_counter):x}_{secrets.token_hex(4)}"
     
     await manager.connect(websocket, client_id)
     
     try:
-        while True:
-            # Receive message from client
-            data = await websocket.receive_text()
-            message = json.loads(data)
+        # iter_text() ends cleanly when the client disconnects
+        async for data in websocket.iter_text():
+            message = orjson.loads(data)
             
             # Log received message
             logger.info(f"WebSocket received from {client_id}: {message.get('type', 'unknown')}")
@@ -291,10 +439,13 @@ async def websocket_stream(websocket: WebSocket, client_id: Optional[str] = None
             elif message.get("type") == "stream_events":
                 await handle_websocket_stream_events(websocket, client_id, message)
                 
+            elif message.get("type") == "stream_messages":
+                await handle_websocket_stream_messages(websocket, client_id, message)
+                
             elif message.get("type") == "ping":
                 await manager.send_json({
                     "type": "pong",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _iso_now()
                 }, client_id)
                 
             elif message.get("type") == "get_status":
@@ -303,18 +454,16 @@ async def websocket_stream(websocket: WebSocket, client_id: Optional[str] = None
                     "type": "status",
                     "client_id": client_id,
                     "connection_info": connection_info,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _iso_now()
                 }, client_id)
                 
             else:
                 await manager.send_json({
                     "type": "error",
                     "message": f"Unknown message type: {message.get('type')}",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _iso_now()
                 }, client_id)
                 
-    except WebSocketDisconnect:
-        manager.disconnect(client_id)
         logger.info(f"WebSocket {client_id} disconnected normally")
         
     except Exception as e:
@@ -322,9 +471,13 @@ async def websocket_stream(websocket: WebSocket, client_id: Optional[str] = None
         await manager.send_json({
             "type": "error",
             "message": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _iso_now()
         }, client_id)
-        manager.disconnect(client_id)
+    finally:
+        writer = manager.disconnect(client_id)
+        if writer is not None:
+            # Let already-queued frames go out before the endpoint returns
+            await manager.flush(writer, client_id)
 
 
 async def handle_websocket_invoke(websocket: WebSocket, client_id: str, message: dict):
@@ -332,91 +485,89 @@ async def handle_websocket_invoke(websocket: WebSocket, client_id: str, message:
     Handle graph invocation through WebSocket
     """
     user_input = message.get("input", "")
-    thread_id = message.get("thread_id")
+    thread_id = message.get("thread_id") or new_thread_id()
     
     # Send acknowledgment
     await manager.send_json({
         "type": "acknowledgment",
         "message": "Processing your request...",
         "thread_id": thread_id,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _iso_now()
     }, client_id)
     
     try:
         # Stream the enhanced graph execution with progress updates
         node_count = 0
-        config = {"configurable": {"thread_id": thread_id or "default"}}
-        initial_state = create_initial_state()
-        from langchain_core.messages import HumanMessage
-        initial_state["messages"] = [HumanMessage(content=user_input)]
-        initial_state["raw_query"] = user_input
+        config = build_graph_config(thread_id)
+        initial_state = build_graph_input(user_input)
         
-        async for output in enhanced_graph.astream(initial_state, config):
-            for node_name, node_output in output.items():
-                node_count += 1
+        async with _ADMISSION:
+            async for output in enhanced_graph.astream(initial_state, config, durability=GRAPH_DURABILITY):
+                for node_name, node_output in output.items():
+                    node_count += 1
                 
-                # Check if client is still connected before sending
-                if client_id not in manager.active_connections:
-                    logger.info(f"Client {client_id} disconnected, stopping stream")
-                    return
+                    # Check if client is still connected before sending
+                    if client_id not in manager.active_connections:
+                        logger.info(f"Client {client_id} disconnected, stopping stream")
+                        return
                 
-                # Check for execution plan from query_analyzer or execution_planner
-                if node_name in ["query_analyzer", "execution_planner"] and node_output.get("execution_plan"):
-                    # Send execution plan to frontend
-                    plan = node_output.get("execution_plan", {})
-                    agents = plan.get("sequential_tasks", []) + plan.get("parallel_tasks", [])
-                    await manager.send_json({
-                        "type": "execution_plan",
-                        "agents": agents,
-                        "total_steps": len(agents),
-                        "reason": plan.get("reasoning", ""),
-                        "timestamp": datetime.now().isoformat()
-                    }, client_id)
+                    # Check for execution plan from query_analyzer or execution_planner
+                    if node_name in ["query_analyzer", "execution_planner"] and node_output.get("execution_plan"):
+                        # Send execution plan to frontend
+                        plan = node_output.get("execution_plan", {})
+                        agents = plan.get("sequential_tasks", []) + plan.get("parallel_tasks", [])
+                        await manager.send_json({
+                            "type": "execution_plan",
+                            "agents": agents,
+                            "total_steps": len(agents),
+                            "reason": plan.get("reasoning", ""),
+                            "timestamp": _iso_now()
+                        }, client_id)
                 
-                # Send progress update
-                context = node_output.get("context", {})
-                execution_plan = context.get("execution_plan", [])
-                current_step = context.get("current_step", 0)
+                    # Send progress update
+                    context = node_output.get("context", {})
+                    execution_plan = context.get("execution_plan", [])
+                    current_step = context.get("current_step", 0)
                 
-                success = await manager.send_json({
-                    "type": "progress",
-                    "node": node_name,
-                    "node_count": node_count,
-                    "current_agent": node_output.get("current_agent"),
-                    "progress": node_output.get("progress"),
-                    "execution_plan": execution_plan,
-                    "current_step": current_step,
-                    "total_steps": len(execution_plan) if execution_plan else 1,
-                    "timestamp": datetime.now().isoformat()
-                }, client_id)
+                    success = await manager.send_json(ProgressEvent(
+                        node=node_name,
+                        node_count=node_count,
+                        current_agent=node_output.get("current_agent"),
+                        progress=node_output.get("progress"),
+                        execution_plan=execution_plan,
+                        current_step=current_step,
+                        total_steps=len(execution_plan) if execution_plan else 1,
+                        timestamp=_iso_now()
+                    ), client_id)
                 
-                if not success:
-                    logger.info(f"Failed to send to {client_id}, stopping stream")
-                    return
+                    if not success:
+                        logger.info(f"Failed to send to {client_id}, stopping stream")
+                        return
                 
-                # Send node output
-                if node_output.get("messages"):
-                    success = await manager.send_json({
-                        "type": "node_output",
-                        "node": node_name,
-                        "message": str(node_output.get("messages", [])[-1].content),
-                        "metadata": {
-                            "agent": node_output.get("current_agent"),
-                            "task_type": node_output.get("task_type")
-                        },
-                        "timestamp": datetime.now().isoformat()
-                    }, client_id)
+                    # Send node output
+                    if node_output.get("messages"):
+                        success = await manager.send_json({
+                            "type": "node_output",
+                            "node": node_name,
+                            "message": str(node_output.get("messages", [])[-1].content),
+                            "metadata": {
+                                "agent": node_output.get("current_agent"),
+                                "task_type": node_output.get("task_type")
+                            },
+                            "timestamp": _iso_now()
+                        }, client_id)
                 
-                # Small delay for better streaming experience
-                await asyncio.sleep(0.1)
+                    # Small delay for better streaming experience
+                    await asyncio.sleep(0.1)
         
         # Send completion message if client is still connected
         if client_id in manager.active_connections:
             await manager.send_json({
                 "type": "complete",
                 "message": "Request processed successfully",
+                "thread_id": thread_id,
                 "total_nodes": node_count,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _iso_now()
             }, client_id)
         
     except Exception as e:
@@ -426,45 +577,55 @@ async def handle_websocket_invoke(websocket: WebSocket, client_id: str, message:
             await manager.send_json({
             "type": "error",
             "message": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _iso_now()
         }, client_id)
 
 
 async def handle_websocket_stream_events(websocket: WebSocket, client_id: str, message: dict):
     """
     Handle LangGraph 0.6.6 event streaming through WebSocket
+    Optional include_names/include_types lists in the message are passed to
+    astream_events, so unwanted events are dropped before they are serialized
     """
     user_input = message.get("input", "")
-    thread_id = message.get("thread_id")
+    thread_id = message.get("thread_id") or new_thread_id()
     
     try:
         event_count = 0
-        config = {"configurable": {"thread_id": thread_id or "default"}}
-        initial_state = create_initial_state()
-        from langchain_core.messages import HumanMessage
-        initial_state["messages"] = [HumanMessage(content=user_input)]
-        initial_state["raw_query"] = user_input
+        config = build_graph_config(thread_id)
+        initial_state = build_graph_input(user_input)
         
-        async for event in enhanced_graph.astream_events(initial_state, version="v2", config=config):
-            event_count += 1
+        async with _ADMISSION:
+            async for event in enhanced_graph.astream_events(
+                initial_state,
+                version="v2",
+                config=config,
+                durability=GRAPH_DURABILITY,
+                include_names=message.get("include_names"),
+                include_types=message.get("include_types")
+            ):
+                event_count += 1
             
-            # Send each event with enhanced metadata
-            await manager.send_json({
-                "type": "langgraph_event",
-                "event_number": event_count,
-                "event_data": event,
-                "timestamp": datetime.now().isoformat()
-            }, client_id)
+                # Send each event with enhanced metadata
+                if not await manager.send_json({
+                    "type": "langgraph_event",
+                    "event_number": event_count,
+                    "event_data": event,
+                    "timestamp": _iso_now()
+                }, client_id):
+                    logger.info(f"Failed to send to {client_id}, stopping stream")
+                    return
             
-            # Rate limiting for events
-            if event_count % 10 == 0:
-                await asyncio.sleep(0.05)
+                # Rate limiting for events
+                if event_count % 10 == 0:
+                    await asyncio.sleep(0.05)
         
         # Send completion
         await manager.send_json({
             "type": "events_complete",
+            "thread_id": thread_id,
             "total_events": event_count,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _iso_now()
         }, client_id)
         
     except Exception as e:
@@ -472,7 +633,59 @@ async def handle_websocket_stream_events(websocket: WebSocket, client_id: str, m
         await manager.send_json({
             "type": "error",
             "message": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _iso_now()
+        }, client_id)
+
+
+async def handle_websocket_stream_messages(websocket: WebSocket, client_id: str, message: dict):
+    """
+    Stream only LLM token chunks through WebSocket
+    Pre-filtered stream_events for chat UIs: only chat model runs are traced
+    and each chunk is sent as a small message_chunk frame
+    """
+    user_input = message.get("input", "")
+    thread_id = message.get("thread_id") or new_thread_id()
+    
+    try:
+        chunk_count = 0
+        config = build_graph_config(thread_id)
+        initial_state = build_graph_input(user_input)
+        
+        async with _ADMISSION:
+            async for event in enhanced_graph.astream_events(
+                initial_state,
+                version="v2",
+                config=config,
+                durability=GRAPH_DURABILITY,
+                include_types=["chat_model"]
+            ):
+                if event["event"] != "on_chat_model_stream":
+                    continue
+                chunk_count += 1
+            
+                if not await manager.send_json({
+                    "type": "message_chunk",
+                    "node": event.get("metadata", {}).get("langgraph_node"),
+                    "content": event["data"]["chunk"].content,
+                    "timestamp": _iso_now()
+                }, client_id):
+                    logger.info(f"Failed to send to {client_id}, stopping stream")
+                    return
+        
+        # Send completion
+        await manager.send_json({
+            "type": "messages_complete",
+            "thread_id": thread_id,
+            "total_chunks": chunk_count,
+            "timestamp": _iso_now()
+        }, client_id)
+        
+    except Exception as e:
+        logger.error(f"Error in message streaming: {str(e)}")
+        await manager.send_json({
+            "type": "error",
+            "message": str(e),
+            "timestamp": _iso_now()
         }, client_id)
 
 
@@ -480,81 +693,84 @@ async def handle_websocket_stream_events(websocket: WebSocket, client_id: str, m
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors"""
-    logger.error(f"Validation error: {exc}")
+    logger.opt(lazy=True).error("Validation error: {exc}", exc=lambda: exc)
     return JSONResponse(
         status_code=422,
-        content={
+        content=_error_content({
             "error": "Validation Error",
             "details": exc.errors(),
-            "body": exc.body if hasattr(exc, 'body') else None,
-            "timestamp": datetime.now().isoformat()
-        }
+            "body": exc.body if hasattr(exc, 'body') else None
+        })
     )
 
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions"""
-    logger.error(f"HTTP exception: {exc.detail}")
+    logger.opt(lazy=True).error("HTTP exception: {detail}", detail=lambda: exc.detail)
     return JSONResponse(
         status_code=exc.status_code,
-        content={
+        content=_error_content({
             "error": "HTTP Error",
             "message": exc.detail,
-            "status_code": exc.status_code,
-            "timestamp": datetime.now().isoformat()
-        }
+            "status_code": exc.status_code
+        })
     )
 
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler"""
-    logger.error(f"Unhandled exception: {exc}\n{traceback.format_exc()}")
+    logger.opt(lazy=True).error(
+        "Unhandled exception: {exc}\n{tb}", exc=lambda: exc, tb=traceback.format_exc
+    )
     return JSONResponse(
         status_code=500,
-        content={
+        content=_error_content({
             "error": "Internal Server Error",
             "message": "An unexpected error occurred",
-            "type": type(exc).__name__,
-            "timestamp": datetime.now().isoformat()
-        }
+            "type": type(exc).__name__
+        })
     )
 
 
 # Health and Monitoring Endpoints
+# Static part of the /health payload, built once
+_HEALTH_STATIC = {
+    "langgraph": LANGGRAPH_VERSION,
+    "agents": ["supervisor", "analytics", "search", "document", "compliance"]
+}
+
+
 @app.get("/health")
 async def health_check():
     """Comprehensive health check"""
-    health_status = {
-        "status": "healthy",
-        "langgraph": "0.6.6",
+    return {
+        # Degraded until the lifespan hook has built the graph
+        "status": "healthy" if enhanced_graph else "degraded",
+        **_HEALTH_STATIC,
         "services": {
-            "graph": "operational" if sales_app else "not_initialized",
+            "graph": "operational" if enhanced_graph else "not_initialized",
             "websocket": f"{len(manager.active_connections)} active connections"
         },
-        "agents": ["supervisor", "analytics", "search", "document", "compliance"],
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _iso_now()
     }
-    
-    # Check if any service is not operational
-    if not sales_app:
-        health_status["status"] = "degraded"
-        
-    return health_status
+
+
+async def _stream_metrics():
+    """Yield the metrics JSON object one connection row at a time"""
+    client_ids = list(manager.active_connections)
+    yield b'{"websocket_connections":%d,"connection_details":[' % len(client_ids)
+    for index, client_id in enumerate(client_ids):
+        row = orjson.dumps({
+            "client_id": client_id,
+            "metadata": manager.connection_metadata.get(client_id, {})
+        })
+        yield row if index == 0 else b"," + row
+    yield b'],"timestamp":' + orjson.dumps(_iso_now()) + b"}"
 
 
 @app.get("/metrics")
 async def get_metrics():
     """Get application metrics"""
-    return {
-        "websocket_connections": len(manager.active_connections),
-        "connection_details": [
-            {
-                "client_id": client_id,
-                "metadata": manager.connection_metadata.get(client_id, {})
-            }
-            for client_id in manager.active_connections.keys()
-        ],
-        "timestamp": datetime.now().isoformat()
-    }
\ No newline at end of file
+    return StreamingResponse(_stream_metrics(), media_type="application/json")
\ No newline at end of file
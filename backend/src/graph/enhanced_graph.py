@@ -2,30 +2,279 @@
 Enhanced Graph Structure with Advanced Query Analysis
 Integrates Query Analyzer, Execution Planner, and Dynamic Router
 """
-from typing import Dict, Any, Literal
+from typing import Dict, Any, List, Literal, Callable, Optional
 import os
+import functools
+import itertools
+import time
+from types import MappingProxyType
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+from loguru import logger
 
 # Import enhanced state
-from ..state.enhanced_state import EnhancedAgentState, create_initial_state
+from ..state.enhanced_state import EnhancedAgentState, RESET_ROUTING_HISTORY, create_initial_state
 
-# Import new intelligent agents
-from ..agents.query_analyzer import query_analyzer_agent
-from ..agents.execution_planner import execution_planner_agent
-from ..agents.dynamic_router import dynamic_router_agent, route_from_dynamic_router
+# Agents, tools and the SQLite checkpointer pull in LLM clients, embedding
+# models and pandas; they are imported inside the graph factories so that
+# importing this module (e.g. for build_graph_input) stays cheap
 
-# Import existing agents
-from ..agents.supervisor import supervisor_agent
-from ..agents.analytics import analytics_agent
-from ..agents.search import search_agent
-from ..agents.document import document_agent
-from ..agents.compliance import compliance_agent
 
-# Import tools
-from ..tools.search_tools import search_internal_db, search_vector_db
-from ..tools.analytics_tools import analyze_sales_trend, calculate_kpis
+def offload_to_thread(node_fn: Callable[[EnhancedAgentState], Dict[str, Any]]) -> RunnableLambda:
+    """
+    Wrap a CPU-heavy sync node so async graph runs execute it in a worker thread.
+    LangGraph calls sync nodes inline on the event loop during astream, which
+    stalls WebSocket sends for every other client; sync invoke is unchanged.
+    """
+    async def run_in_thread(state: EnhancedAgentState) -> Dict[str, Any]:
+        return await asyncio.to_thread(node_fn, state)
+    
+    return RunnableLambda(node_fn, afunc=run_in_thread, name=node_fn.__name__)
+
+
+def merge_agent_outputs(state: EnhancedAgentState, outputs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine the updates of agents that ran in the same parallel group
+    results/context are dict-merged, messages/progress concatenated, newly
+    raised errors appended once; other keys keep the last agent's value
+    """
+    prior_errors = state.get("errors") or []
+    merged = {
+        "results": dict(state.get("results") or {}),
+        "context": dict(state.get("context") or {}),
+        "messages": [],
+        "progress": [],
+        "errors": list(prior_errors)
+    }
+    for output in outputs:
+        for key, value in output.items():
+            if key in ("results", "context"):
+                merged[key].update(value or {})
+            elif key in ("messages", "progress"):
+                merged[key].extend(value or [])
+            elif key == "errors":
+                merged[key].extend((value or [])[len(prior_errors):])
+            else:
+                merged[key] = value
+    return merged
+
+
+def parallel_agents_node(agents: Dict[str, Callable[[EnhancedAgentState], Dict[str, Any]]]) -> RunnableLambda:
+    """
+    Node that fans out the pending parallel group of the execution plan
+    The agents run concurrently in worker threads, each on its own copy of
+    results/context, and their updates are merged into one write, so the group
+    costs the slowest agent's latency instead of the sum
+    """
+    from ..agents.dynamic_router import pending_parallel_group
+    
+    def branch_state(state: EnhancedAgentState) -> Dict[str, Any]:
+        return {
+            **state,
+            "results": dict(state.get("results") or {}),
+            "context": dict(state.get("context") or {})
+        }
+    
+    def group_of(state: EnhancedAgentState) -> List[str]:
+        group = pending_parallel_group(state.get("execution_plan") or {}, state.get("results") or {})
+        return [name for name in group if name in agents]
+    
+    def run_group(state: EnhancedAgentState) -> Dict[str, Any]:
+        group = group_of(state)
+        if not group:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(group)) as pool:
+            outputs = list(pool.map(lambda name: agents[name](branch_state(state)), group))
+        return merge_agent_outputs(state, outputs)
+    
+    async def arun_group(state: EnhancedAgentState) -> Dict[str, Any]:
+        group = group_of(state)
+        if not group:
+            return {}
+        outputs = await asyncio.gather(
+            *(asyncio.to_thread(agents[name], branch_state(state)) for name in group)
+        )
+        return merge_agent_outputs(state, list(outputs))
+    
+    return RunnableLambda(run_group, afunc=arun_group, name="parallel_agents")
+
+
+class BoundedMemorySaver(MemorySaver):
+    """
+    MemorySaver keeping only the newest max_checkpoints checkpoints per thread
+    Every superstep adds a checkpoint, so the stock saver grows for the life of
+    the process; older checkpoints, their pending writes and the channel blobs
+    no newer checkpoint references are dropped on put
+    """
+    
+    def __init__(self, max_checkpoints: int = 32, **kwargs):
+        super().__init__(**kwargs)
+        self.max_checkpoints = max_checkpoints
+        # (thread_id, checkpoint_ns) -> {checkpoint_id: channel_versions}
+        self._channel_versions: Dict[tuple, Dict[str, Any]] = {}
+        # (thread_id, checkpoint_ns) -> blob keys written for that namespace
+        self._blob_keys: Dict[tuple, List[tuple]] = {}
+    
+    def put(self, config, checkpoint, metadata, new_versions):
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        key = (thread_id, checkpoint_ns)
+        versions = self._channel_versions.setdefault(key, {})
+        versions[checkpoint["id"]] = dict(checkpoint["channel_versions"])
+        self._blob_keys.setdefault(key, []).extend(
+            (thread_id, checkpoint_ns, channel, version)
+            for channel, version in new_versions.items()
+        )
+        
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if len(checkpoints) > self.max_checkpoints:
+            # Checkpoint ids are time-ordered and inserted in order
+            for checkpoint_id in list(itertools.islice(
+                checkpoints, len(checkpoints) - self.max_checkpoints
+            )):
+                del checkpoints[checkpoint_id]
+                versions.pop(checkpoint_id, None)
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            # Channel versions only grow, so a blob older than the oldest
+            # retained checkpoint's version of that channel is unreachable
+            floor = versions[next(iter(checkpoints))]
+            live_keys = []
+            for blob_key in self._blob_keys[key]:
+                if blob_key[3] < floor.get(blob_key[2], blob_key[3]):
+                    self.blobs.pop(blob_key, None)
+                else:
+                    live_keys.append(blob_key)
+            self._blob_keys[key] = live_keys
+        return next_config
+    
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        for key in [key for key in self._blob_keys if key[0] == thread_id]:
+            del self._blob_keys[key]
+            self._channel_versions.pop(key, None)
+
+
+# Checkpoint durability for graph runs. "sync" persists each checkpoint before
+# the next superstep, so at most one write is in flight; the default "async"
+# queues a pending write per superstep, each pinning the loop and channel data.
+# Use "exit" only for fire-and-forget workloads with a memory ceiling in place
+GRAPH_DURABILITY = os.getenv("GRAPH_DURABILITY", "sync")
+
+def _checkpoint_db_path(filename: str) -> str:
+    """Absolute path of a checkpoint database in the root database folder"""
+    db_path = os.path.abspath(os.path.join(
+        os.path.dirname(__file__), "..", "..", "..",
+        "database", "checkpoints", filename
+    ))
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    return db_path
+
+
+# Checkpoint backend: "sqlite" persists threads across restarts, "memory"
+# keeps the last GRAPH_MEMORY_CHECKPOINTS checkpoints per thread in process
+GRAPH_CHECKPOINTER = os.getenv("GRAPH_CHECKPOINTER", "sqlite")
+GRAPH_MEMORY_CHECKPOINTS = int(os.getenv("GRAPH_MEMORY_CHECKPOINTS", "32"))
+
+# One long-lived saver per checkpoint database, shared by every graph using it
+_checkpointers: Dict[str, BaseCheckpointSaver] = {}
+_checkpointer_lock = asyncio.Lock()
+
+
+async def _get_checkpointer(filename: str) -> BaseCheckpointSaver:
+    """
+    Get the shared checkpointer for a checkpoint database
+    The SQLite connection is opened once in WAL mode with synchronous=NORMAL so
+    readers don't block the writer and commits skip the per-transaction fsync;
+    tables are created here instead of on the first checkpoint write
+    """
+    db_path = _checkpoint_db_path(filename)
+    async with _checkpointer_lock:
+        checkpointer = _checkpointers.get(db_path)
+        if checkpointer is None and GRAPH_CHECKPOINTER == "memory":
+            checkpointer = BoundedMemorySaver(max_checkpoints=GRAPH_MEMORY_CHECKPOINTS)
+            _checkpointers[db_path] = checkpointer
+        elif checkpointer is None:
+            import aiosqlite
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+            conn = aiosqlite.connect(db_path)
+            # The connection lives as long as the process; its worker thread
+            # must not keep the interpreter alive at exit
+            conn.daemon = True
+            await conn
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.execute("PRAGMA synchronous=NORMAL")
+            checkpointer = AsyncSqliteSaver(conn)
+            await checkpointer.setup()
+            _checkpointers[db_path] = checkpointer
+    return checkpointer
+
+
+# ===== Routing Tables =====
+# Built once at import. add_conditional_edges only accepts a plain dict (and
+# copies it), so the factories pass dict(...) of these read-only views
+_AGENT_NODES = frozenset(("analytics", "search", "document", "compliance"))
+
+_DYNAMIC_ROUTER_MAP = MappingProxyType({
+    "analytics": "analytics",
+    "search": "search",
+    "document": "document",
+    "compliance": "compliance",
+    "supervisor": "supervisor",
+    "query_analyzer": "query_analyzer",
+    "execution_planner": "execution_planner",
+    "parallel_agents": "parallel_agents",
+    "end": END
+})
+
+_SUPERVISOR_MAP = MappingProxyType({
+    "analytics": "analytics",
+    "search": "search",
+    "document": "document",
+    "compliance": "compliance",
+    "query_analyzer": "query_analyzer",
+    "dynamic_router": "dynamic_router",
+    "end": END
+})
+
+_PLANNER_MAP = MappingProxyType({
+    "analytics": "analytics",
+    "search": "search",
+    "document": "document"
+})
+
+
+def route_from_supervisor(state: EnhancedAgentState) -> str:
+    """Route from supervisor based on state"""
+    # Check if complete
+    if state.get("is_complete", False):
+        return "end"
+    
+    # Check if needs re-analysis
+    if state.get("requires_reanalysis", False):
+        return "query_analyzer"
+    
+    # Check next agent from state
+    next_agent = state.get("next_agent", "")
+    if next_agent in _AGENT_NODES:
+        return next_agent
+    
+    # Default to dynamic router
+    return "dynamic_router"
+
+
+def route_from_planner(state: EnhancedAgentState) -> str:
+    """Route the simplified graph to the first agent of the execution plan"""
+    plan = state.get("execution_plan", {})
+    sequential = plan.get("sequential_tasks", [])
+    if sequential:
+        return sequential[0]
+    return "analytics"  # Default
 
 
 async def create_enhanced_graph():
@@ -39,7 +288,35 @@ async def create_enhanced_graph():
     4. Dynamic Router → Agents (Based on plan)
     5. Agents → Dynamic Router (For next routing)
     6. Complete → Supervisor (Final review)
+    
+    The compiled graph is cached, so every call returns the same instance and
+    shares its checkpointer; the saver serializes its own writes behind a lock
     """
+    checkpointer = await _get_checkpointer("enhanced_graph.db")
+    return _compile_enhanced_graph(checkpointer)
+
+
+# compile() validates the topology and builds the Pregel channels; the
+# checkpointer is a per-database singleton, so each graph compiles once
+@functools.lru_cache(maxsize=1)
+def _compile_enhanced_graph(checkpointer: BaseCheckpointSaver):
+    """Wire and compile the enhanced graph against a checkpointer"""
+    # Import new intelligent agents
+    from ..agents.query_analyzer import query_analyzer_agent
+    from ..agents.execution_planner import execution_planner_agent
+    from ..agents.dynamic_router import dynamic_router_agent, route_from_dynamic_router
+    
+    # Import existing agents
+    from ..agents.supervisor import supervisor_agent
+    from ..agents.analytics import analytics_agent
+    from ..agents.search import search_agent
+    from ..agents.document import document_agent
+    from ..agents.compliance import compliance_agent
+    
+    # Import tools
+    from langgraph.prebuilt import ToolNode, tools_condition
+    from ..tools.search_tools import search_internal_db, search_vector_db
+    from ..tools.analytics_tools import analyze_sales_trend, calculate_kpis
     
     # Initialize StateGraph with EnhancedAgentState
     graph = StateGraph(EnhancedAgentState)
@@ -53,11 +330,20 @@ async def create_enhanced_graph():
     graph.add_node("supervisor", supervisor_agent)
     
     # ===== Add Agent Nodes =====
-    graph.add_node("analytics", analytics_agent)
-    graph.add_node("search", search_agent)
+    # analytics (pandas/numpy) and search (embeddings + reranker) run in threads
+    graph.add_node("analytics", offload_to_thread(analytics_agent))
+    graph.add_node("search", offload_to_thread(search_agent))
     graph.add_node("document", document_agent)
     graph.add_node("compliance", compliance_agent)
     
+    # Parallel groups from the execution plan fan out through one node
+    graph.add_node("parallel_agents", parallel_agents_node({
+        "analytics": analytics_agent,
+        "search": search_agent,
+        "document": document_agent,
+        "compliance": compliance_agent
+    }))
+    
     # ===== Add Tool Nodes =====
     # Search tools
     search_tools = [search_internal_db, search_vector_db]
@@ -84,16 +370,7 @@ async def create_enhanced_graph():
     graph.add_conditional_edges(
         "dynamic_router",
         route_from_dynamic_router,
-        {
-            "analytics": "analytics",
-            "search": "search",
-            "document": "document",
-            "compliance": "compliance",
-            "supervisor": "supervisor",
-            "query_analyzer": "query_analyzer",
-            "execution_planner": "execution_planner",
-            "end": END
-        }
+        dict(_DYNAMIC_ROUTER_MAP)
     )
     
     # ===== Agent Return Paths =====
@@ -102,39 +379,14 @@ async def create_enhanced_graph():
     graph.add_edge("search", "dynamic_router")
     graph.add_edge("document", "dynamic_router")
     graph.add_edge("compliance", "dynamic_router")
+    graph.add_edge("parallel_agents", "dynamic_router")
     
     # ===== Supervisor Routing =====
     # Supervisor can route to any agent or back to query analyzer
-    def route_from_supervisor(state: EnhancedAgentState) -> str:
-        """Route from supervisor based on state"""
-        # Check if complete
-        if state.get("is_complete", False):
-            return "end"
-        
-        # Check if needs re-analysis
-        if state.get("requires_reanalysis", False):
-            return "query_analyzer"
-        
-        # Check next agent from state
-        next_agent = state.get("next_agent", "")
-        if next_agent in ["analytics", "search", "document", "compliance"]:
-            return next_agent
-        
-        # Default to dynamic router
-        return "dynamic_router"
-    
     graph.add_conditional_edges(
         "supervisor",
         route_from_supervisor,
-        {
-            "analytics": "analytics",
-            "search": "search",
-            "document": "document",
-            "compliance": "compliance",
-            "query_analyzer": "query_analyzer",
-            "dynamic_router": "dynamic_router",
-            "end": END
-        }
+        dict(_SUPERVISOR_MAP)
     )
     
     # ===== Tool Integration =====
@@ -161,26 +413,10 @@ async def create_enhanced_graph():
     graph.add_edge("analytics_tools", "analytics")
     
     # ===== Compile with Persistence =====
-    # Create database path in root database folder
-    db_path = os.path.join(
-        os.path.dirname(__file__), "..", "..", "..", 
-        "database", "checkpoints", "enhanced_graph.db"
-    )
-    db_path = os.path.abspath(db_path)
-    
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    
-    # Create AsyncSqliteSaver with persistent connection
-    # We need to create the saver without using context manager for long-lived graphs
-    import aiosqlite
-    conn = await aiosqlite.connect(db_path)
-    checkpointer = AsyncSqliteSaver(conn)
-    
     compiled_graph = graph.compile(checkpointer=checkpointer)
     
     # Store connection reference for cleanup if needed
-    compiled_graph._db_connection = conn
+    compiled_graph._db_connection = getattr(checkpointer, "conn", None)
     return compiled_graph
 
 
@@ -188,14 +424,29 @@ async def create_simple_enhanced_graph():
     """
     Create a simplified version for testing
     User → Query Analyzer → Execution Planner → Agents
+    Cached like create_enhanced_graph
     """
+    # Same checkpoint backend as the main graph
+    checkpointer = await _get_checkpointer("simple_enhanced_graph.db")
+    return _compile_simple_enhanced_graph(checkpointer)
+
+
+@functools.lru_cache(maxsize=1)
+def _compile_simple_enhanced_graph(checkpointer: BaseCheckpointSaver):
+    """Wire and compile the simplified graph against a checkpointer"""
+    from ..agents.query_analyzer import query_analyzer_agent
+    from ..agents.execution_planner import execution_planner_agent
+    from ..agents.analytics import analytics_agent
+    from ..agents.search import search_agent
+    from ..agents.document import document_agent
+    
     graph = StateGraph(EnhancedAgentState)
     
     # Add nodes
     graph.add_node("query_analyzer", query_analyzer_agent)
     graph.add_node("execution_planner", execution_planner_agent)
-    graph.add_node("analytics", analytics_agent)
-    graph.add_node("search", search_agent)
+    graph.add_node("analytics", offload_to_thread(analytics_agent))
+    graph.add_node("search", offload_to_thread(search_agent))
     graph.add_node("document", document_agent)
     
     # Define flow
@@ -203,22 +454,10 @@ async def create_simple_enhanced_graph():
     graph.add_edge("query_analyzer", "execution_planner")
     
     # Simple routing from planner
-    def route_from_planner(state: EnhancedAgentState) -> str:
-        # Get first agent from execution plan
-        plan = state.get("execution_plan", {})
-        sequential = plan.get("sequential_tasks", [])
-        if sequential:
-            return sequential[0]
-        return "analytics"  # Default
-    
     graph.add_conditional_edges(
         "execution_planner",
         route_from_planner,
-        {
-            "analytics": "analytics",
-            "search": "search",
-            "document": "document"
-        }
+        dict(_PLANNER_MAP)
     )
     
     # All agents go to END
@@ -226,35 +465,18 @@ async def create_simple_enhanced_graph():
     graph.add_edge("search", END)
     graph.add_edge("document", END)
     
-    # Use AsyncSqliteSaver for simple graph too
-    db_path = os.path.join(
-        os.path.dirname(__file__), "..", "..", "..",
-        "database", "checkpoints", "simple_enhanced_graph.db"
-    )
-    db_path = os.path.abspath(db_path)
-    os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    
-    # Create AsyncSqliteSaver with persistent connection
-    # We need to create the saver without using context manager for long-lived graphs
-    import aiosqlite
-    conn = await aiosqlite.connect(db_path)
-    checkpointer = AsyncSqliteSaver(conn)
-    
     compiled_graph = graph.compile(checkpointer=checkpointer)
     
     # Store connection reference for cleanup if needed
-    compiled_graph._db_connection = conn
+    compiled_graph._db_connection = getattr(checkpointer, "conn", None)
     return compiled_graph
 
 
 # Utility functions for graph management
-def get_graph_visualization(graph):
-    """
-    Get graph structure for visualization
-    Returns nodes and edges in a format suitable for frontend display
-    """
-    # This would integrate with LangGraph's visualization capabilities
-    nodes = [
+# Static layout for the frontend; the topology is fixed at compile time, so it
+# is built once and shared by every caller (treat it as read-only)
+_FALLBACK_VIZ = {
+    "nodes": (
         {"id": "start", "label": "Start", "type": "entry"},
         {"id": "query_analyzer", "label": "Query Analyzer", "type": "intelligent"},
         {"id": "execution_planner", "label": "Execution Planner", "type": "intelligent"},
@@ -264,10 +486,10 @@ def get_graph_visualization(graph):
         {"id": "search", "label": "Search Agent", "type": "agent"},
         {"id": "document", "label": "Document Agent", "type": "agent"},
         {"id": "compliance", "label": "Compliance Agent", "type": "agent"},
+        {"id": "parallel_agents", "label": "Parallel Agents", "type": "agent"},
         {"id": "end", "label": "End", "type": "exit"}
-    ]
-    
-    edges = [
+    ),
+    "edges": (
         {"from": "start", "to": "query_analyzer", "type": "fixed"},
         {"from": "query_analyzer", "to": "execution_planner", "type": "fixed"},
         {"from": "execution_planner", "to": "dynamic_router", "type": "fixed"},
@@ -275,14 +497,74 @@ def get_graph_visualization(graph):
         {"from": "dynamic_router", "to": "search", "type": "conditional"},
         {"from": "dynamic_router", "to": "document", "type": "conditional"},
         {"from": "dynamic_router", "to": "compliance", "type": "conditional"},
+        {"from": "dynamic_router", "to": "parallel_agents", "type": "conditional"},
         {"from": "analytics", "to": "dynamic_router", "type": "fixed"},
         {"from": "search", "to": "dynamic_router", "type": "fixed"},
         {"from": "document", "to": "dynamic_router", "type": "fixed"},
         {"from": "compliance", "to": "dynamic_router", "type": "fixed"},
+        {"from": "parallel_agents", "to": "dynamic_router", "type": "fixed"},
         {"from": "dynamic_router", "to": "end", "type": "conditional"}
-    ]
-    
-    return {"nodes": nodes, "edges": edges}
+    )
+}
+
+
+def get_graph_visualization(graph):
+    """
+    Get graph structure for visualization
+    Returns nodes and edges in a format suitable for frontend display
+    """
+    # This would integrate with LangGraph's visualization capabilities
+    return _FALLBACK_VIZ
+
+
+# Validated once; model_copy skips re-validation for each query message. The
+# dict fields are replaced on copy so messages never share them
+_HUMAN_MESSAGE_TEMPLATE = HumanMessage(content="")
+
+
+def build_graph_input(user_input: str) -> Dict[str, Any]:
+    """
+    Create the initial graph state for a user query
+    routing_history is an append channel, so the turn's input restarts it
+    instead of adding to the previous turn's decisions on the same thread
+    """
+    state = create_initial_state(
+        query=user_input,
+        messages=[_HUMAN_MESSAGE_TEMPLATE.model_copy(update={
+            "content": user_input,
+            "additional_kwargs": {},
+            "response_metadata": {}
+        })]
+    )
+    state["routing_history"] = [RESET_ROUTING_HISTORY]
+    return state
+
+
+# Monotonic counter plus nanosecond clock keeps minted thread ids unique
+_thread_counter = itertools.count()
+
+
+def new_thread_id() -> str:
+    """Mint a thread id for a conversation started without one"""
+    return f"thread_{next(_thread_counter)}_{time.time_ns()}"
+
+
+def build_graph_config(thread_id: Optional[str] = None) -> Dict[str, Any]:
+    """Create the run config for a conversation thread, minting an id if none is given"""
+    return {"configurable": {"thread_id": thread_id or new_thread_id()}}
+
+
+async def get_last_messages(graph, thread_id: str) -> List[BaseMessage]:
+    """
+    Get the messages stored in a thread's latest checkpoint
+    Reads the checkpointer directly; aget_state would also rebuild the full
+    StateSnapshot (pending tasks, interrupts, parent config) on every turn
+    """
+    config = {"configurable": {"thread_id": thread_id}}
+    checkpoint_tuple = await graph.checkpointer.aget_tuple(config)
+    if checkpoint_tuple is None:
+        return []
+    return checkpoint_tuple.checkpoint["channel_values"].get("messages", [])
 
 
 async def execute_enhanced_query(graph, query: str, config: Dict[str, Any] = None):
@@ -297,57 +579,54 @@ async def execute_enhanced_query(graph, query: str, config: Dict[str, Any] = Non
     Returns:
         Final state after execution
     """
-    from langchain_core.messages import HumanMessage
-    
     # Prepare initial state
-    initial_state = create_initial_state()
-    initial_state["messages"] = [HumanMessage(content=query)]
-    initial_state["raw_query"] = query
+    initial_state = build_graph_input(query)
     
     # Default config if not provided
     if config is None:
-        config = {"configurable": {"thread_id": "default"}}
+        config = build_graph_config()
     
     # Execute the graph
     try:
-        result = await graph.ainvoke(initial_state, config)
+        result = await graph.ainvoke(initial_state, config, durability=GRAPH_DURABILITY)
         return result
     except Exception as e:
-        print(f"Error executing query: {e}")
+        logger.exception("execute_enhanced_query failed")
+        # Same shape as the state's errors channel (List[str]); the exception
+        # type leads so callers can still tell failures apart
         return {
-            "errors": [str(e)],
+            "errors": [f"{type(e).__name__}: {e}"],
             "is_complete": False
         }
 
 
-from typing import List
 def get_execution_trace(state: EnhancedAgentState) -> List[Dict[str, Any]]:
     """
     Extract execution trace from state for debugging
+    progress is not guaranteed to be in timestamp order (a parallel group's
+    entries are appended in group order, not completion order), so the
+    combined trace is sorted; the sort is stable, so ties keep routing first
     """
-    trace = []
-    
-    # Add routing history
-    for routing in state.get("routing_history", []):
-        trace.append({
+    routing_trace = (
+        {
             "type": "routing",
             "timestamp": routing["timestamp"],
             "from": routing["from_agent"],
             "to": routing["to_agent"],
             "reason": routing["reason"]
-        })
+        }
+        for routing in state.get("routing_history", [])
+    )
     
-    # Add progress entries
-    for progress in state.get("progress", []):
-        trace.append({
+    progress_trace = (
+        {
             "type": "progress",
             "timestamp": progress["timestamp"],
             "agent": progress["agent"],
             "action": progress["action"],
             "details": progress.get("details", {})
-        })
-    
-    # Sort by timestamp
-    trace.sort(key=lambda x: x.get("timestamp", ""))
+        }
+        for progress in state.get("progress", [])
+    )
     
-    return trace
\ No newline at end of file
+    return sorted(itertools.chain(routing_trace, progress_trace), key=lambda x: x.get("timestamp", ""))
@@ -2,9 +2,13 @@
 Enhanced Agent State for Advanced Query Analysis
 LangGraph 0.6.6 compatible state with query analysis capabilities
 """
-from typing import Annotated, List, Dict, Any, Optional, Tuple
-from langgraph.graph.message import MessagesState, add_messages
-from langchain_core.messages import BaseMessage
+from typing import Annotated, List, Dict, Any, Optional, Tuple, TypedDict
+import operator
+from bisect import bisect_right
+import numpy as np
+import orjson
+from langgraph.graph.message import add_messages
+from langchain_core.messages import AnyMessage, BaseMessage
 from enum import Enum
 from datetime import datetime
 
@@ -43,15 +47,6 @@ class EntityType(str, Enum):
     QUANTITY = "quantity"  # 수량
 
 
-def add_progress(existing: list[dict], new: list[dict]) -> list[dict]:
-    """Reducer function to accumulate progress logs"""
-    if not existing:
-        existing = []
-    if not new:
-        return existing
-    return existing + new
-
-
 def merge_entities(existing: Dict[str, List[str]], new: Dict[str, List[str]]) -> Dict[str, List[str]]:
     """Reducer function to merge entity dictionaries"""
     if not existing:
@@ -62,16 +57,58 @@ def merge_entities(existing: Dict[str, List[str]], new: Dict[str, List[str]]) ->
     merged = existing.copy()
     for key, values in new.items():
         if key in merged:
-            # Avoid duplicates while preserving order
-            for value in values:
-                if value not in merged[key]:
-                    merged[key].append(value)
+            # Avoid duplicates while preserving order; builds a new list so the
+            # previous state's list is left untouched
+            current = merged[key]
+            seen = set(current)
+            merged[key] = current + [
+                value for value in values
+                if not (value in seen or seen.add(value))
+            ]
         else:
             merged[key] = values.copy()
     return merged
 
 
-class QueryAnalysis(dict):
+# First element of a routing_history update that replaces the channel instead
+# of extending it (as add_messages' REMOVE_ALL_MESSAGES); each turn's graph
+# input starts with it so routing decisions never carry over between turns
+RESET_ROUTING_HISTORY = "__reset__"
+
+
+def add_routing_history(existing: List[Dict[str, Any]], new: List[Any]) -> List[Dict[str, Any]]:
+    """Reducer for routing_history: append new entries, or restart the list on RESET_ROUTING_HISTORY"""
+    if new and new[0] == RESET_ROUTING_HISTORY:
+        return list(new[1:])
+    return (existing or []) + new
+
+
+def dump_blob(payload: Any) -> bytes:
+    """
+    Serialize a bulky agent payload to JSON bytes for the results channel
+    Payloads only read outside the graph stay opaque bytes in state and
+    checkpoints instead of nested dicts; decode with load_blob
+    """
+    return orjson.dumps(payload, default=str)
+
+
+def load_blob(blob: Optional[bytes]) -> Any:
+    """Decode a payload stored with dump_blob"""
+    return orjson.loads(blob) if blob is not None else None
+
+
+def decode_result_blobs(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of the results channel with JSON-bytes fields decoded, for API output"""
+    return {
+        agent: {
+            key: load_blob(value) if isinstance(value, bytes) else value
+            for key, value in payload.items()
+        } if isinstance(payload, dict) else payload
+        for agent, payload in results.items()
+    }
+
+
+class QueryAnalysis(TypedDict, total=False):
     """Query analysis results structure"""
     raw_query: str
     normalized_query: str
@@ -88,7 +125,7 @@ class QueryAnalysis(dict):
     suggested_clarifications: List[str]
 
 
-class ExecutionPlan(dict):
+class ExecutionPlan(TypedDict, total=False):
     """Execution plan structure"""
     sequential_tasks: List[str]  # Tasks to run in sequence
     parallel_tasks: List[List[str]]  # Groups of tasks to run in parallel
@@ -100,7 +137,7 @@ class ExecutionPlan(dict):
     optimization_hints: List[str]  # Suggestions for optimization
 
 
-class AgentResults(dict):
+class AgentResults(TypedDict, total=False):
     """Enhanced results structure for agent outputs"""
     analytics: Optional[Dict[str, Any]]
     search: Optional[Dict[str, Any]]
@@ -110,12 +147,16 @@ class AgentResults(dict):
     execution_metrics: Optional[Dict[str, Any]]
 
 
-class EnhancedAgentState(MessagesState):
+class EnhancedAgentState(TypedDict, total=False):
     """
     Enhanced State for Advanced Query Analysis System
-    Extends MessagesState with sophisticated query analysis capabilities
+    Plain-dict state schema: the message channel (as in MessagesState) plus
+    sophisticated query analysis capabilities
     """
     
+    # === Messages ===
+    messages: Annotated[List[AnyMessage], add_messages]
+    
     # === Core Agent Management ===
     current_agent: str
     task_type: str
@@ -147,9 +188,11 @@ class EnhancedAgentState(MessagesState):
     
     # === Dynamic Routing ===
     next_agents: List[str]  # Ordered list of next agents
+    next_agent: Optional[str]  # Routing decision read by route_from_dynamic_router
+    routing_reason: str
     parallel_agents: List[str]  # Agents to run in parallel
     conditional_branches: Dict[str, str]  # Condition -> agent mapping
-    routing_history: List[Dict[str, Any]]  # Track routing decisions
+    routing_history: Annotated[List[Dict[str, Any]], add_routing_history]  # Routing decisions of the current turn
     
     # === Context & Memory ===
     context: Dict[str, Any]
@@ -158,7 +201,7 @@ class EnhancedAgentState(MessagesState):
     user_preferences: Dict[str, Any]  # Learned user preferences
     
     # === Progress Tracking ===
-    progress: Annotated[List[Dict], add_progress]
+    progress: Annotated[List[Dict], operator.add]  # Nodes return a list, [] when nothing new
     completion_percentage: float
     estimated_remaining_time: float
     bottlenecks: List[str]  # Identified bottlenecks
@@ -217,77 +260,114 @@ class ConfidenceLevel(str, Enum):
     VERY_HIGH = "very_high"  # > 0.8
 
 
+# Level boundaries (each bin's lower edge) and the level for each bin
+_CONFIDENCE_BINS = (0.2, 0.4, 0.6, 0.8)
+_CONFIDENCE_LEVELS = (
+    ConfidenceLevel.VERY_LOW,
+    ConfidenceLevel.LOW,
+    ConfidenceLevel.MEDIUM,
+    ConfidenceLevel.HIGH,
+    ConfidenceLevel.VERY_HIGH,
+)
+_CONFIDENCE_BINS_ARRAY = np.array(_CONFIDENCE_BINS)
+_CONFIDENCE_LEVELS_ARRAY = np.array(_CONFIDENCE_LEVELS, dtype=object)
+
+
 def calculate_confidence_level(score: float) -> ConfidenceLevel:
     """Convert numeric confidence score to level"""
-    if score < 0.2:
-        return ConfidenceLevel.VERY_LOW
-    elif score < 0.4:
-        return ConfidenceLevel.LOW
-    elif score < 0.6:
-        return ConfidenceLevel.MEDIUM
-    elif score < 0.8:
-        return ConfidenceLevel.HIGH
-    else:
-        return ConfidenceLevel.VERY_HIGH
-
-
-def create_initial_state() -> Dict[str, Any]:
-    """Create initial enhanced state with default values"""
-    return {
-        "messages": [],
-        "current_agent": "supervisor",
-        "task_type": "",
-        "task_description": "",
-        "query_analysis": None,
-        "raw_query": "",
-        "normalized_query": "",
-        "query_language": "ko",
-        "primary_intent": None,
-        "secondary_intents": [],
-        "intent_confidence": 0.0,
-        "intent_history": [],
-        "entities": {},
-        "entity_relations": [],
-        "entity_confidence_scores": {},
-        "execution_plan": None,
-        "plan_version": 0,
-        "plan_status": "idle",
-        "original_plan": None,
-        "plan_modifications": [],
-        "next_agents": [],
-        "parallel_agents": [],
-        "conditional_branches": {},
-        "routing_history": [],
-        "context": {},
-        "conversation_context": [],
-        "domain_context": {},
-        "user_preferences": {},
-        "progress": [],
-        "completion_percentage": 0.0,
-        "estimated_remaining_time": 0.0,
-        "bottlenecks": [],
-        "results": {},
-        "intermediate_results": {},
-        "cached_results": {},
-        "errors": [],
-        "error_recovery_attempts": 0,
-        "max_recovery_attempts": 3,
-        "fallback_triggered": False,
-        "query_processing_time": 0.0,
-        "total_execution_time": 0.0,
-        "agent_execution_times": {},
-        "llm_call_count": 0,
-        "llm_token_usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
-        "is_complete": False,
-        "requires_human_input": False,
-        "auto_mode": True,
-        "debug_mode": False,
-        "suggested_optimizations": [],
-        "parallel_execution_possible": False,
-        "cacheable_operations": [],
-        "session_id": datetime.now().strftime("%Y%m%d_%H%M%S"),
-        "user_id": None,
-        "timestamp": datetime.now().isoformat(),
-        "version": "2.0.0",
-        "metadata": {}
-    }
\ No newline at end of file
+    return _CONFIDENCE_LEVELS[bisect_right(_CONFIDENCE_BINS, score)]
+
+
+def calculate_confidence_levels_vec(scores: np.ndarray) -> np.ndarray:
+    """Vectorized calculate_confidence_level: array of ConfidenceLevel, one per score"""
+    return _CONFIDENCE_LEVELS_ARRAY[np.digitize(scores, _CONFIDENCE_BINS_ARRAY)]
+
+
+# Defaults shared by every new state, built once; create_initial_state copies
+# it and gives each state its own list/dict containers
+_STATE_TEMPLATE: Dict[str, Any] = {
+    "messages": [],
+    "current_agent": "supervisor",
+    "task_type": "",
+    "task_description": "",
+    "query_analysis": None,
+    "raw_query": "",
+    "normalized_query": "",
+    "query_language": "ko",
+    "primary_intent": None,
+    "secondary_intents": [],
+    "intent_confidence": 0.0,
+    "intent_history": [],
+    "entities": {},
+    "entity_relations": [],
+    "entity_confidence_scores": {},
+    "execution_plan": None,
+    "plan_version": 0,
+    "plan_status": "idle",
+    "original_plan": None,
+    "plan_modifications": [],
+    "next_agents": [],
+    "next_agent": None,
+    "routing_reason": "",
+    "parallel_agents": [],
+    "conditional_branches": {},
+    "routing_history": [],
+    "context": {},
+    "conversation_context": [],
+    "domain_context": {},
+    "user_preferences": {},
+    "progress": [],
+    "completion_percentage": 0.0,
+    "estimated_remaining_time": 0.0,
+    "bottlenecks": [],
+    "results": {},
+    "intermediate_results": {},
+    "cached_results": {},
+    "errors": [],
+    "error_recovery_attempts": 0,
+    "max_recovery_attempts": 3,
+    "fallback_triggered": False,
+    "query_processing_time": 0.0,
+    "total_execution_time": 0.0,
+    "agent_execution_times": {},
+    "llm_call_count": 0,
+    "llm_token_usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    "is_complete": False,
+    "requires_human_input": False,
+    "auto_mode": True,
+    "debug_mode": False,
+    "suggested_optimizations": [],
+    "parallel_execution_possible": False,
+    "cacheable_operations": [],
+    "session_id": "",
+    "user_id": None,
+    "timestamp": "",
+    "version": "2.0.0",
+    "metadata": {}
+}
+_MUTABLE_STATE_KEYS = tuple(
+    key for key, value in _STATE_TEMPLATE.items()
+    if isinstance(value, (list, dict)) and key != "messages"
+)
+
+
+def create_initial_state(query: str = "", messages: Optional[List[BaseMessage]] = None) -> Dict[str, Any]:
+    """
+    Create initial enhanced state with default values
+    query and messages seed raw_query and the conversation in the same build
+    """
+    state = _STATE_TEMPLATE.copy()
+    for key in _MUTABLE_STATE_KEYS:
+        state[key] = _STATE_TEMPLATE[key].copy()
+    state["messages"] = messages if messages is not None else []
+    state["raw_query"] = query
+    
+    # session_id is the timestamp's digits (%Y%m%d_%H%M%S), sliced from the
+    # ISO string instead of formatting the clock a second time
+    timestamp = datetime.now().isoformat()
+    state["session_id"] = (
+        f"{timestamp[0:4]}{timestamp[5:7]}{timestamp[8:10]}_"
+        f"{timestamp[11:13]}{timestamp[14:16]}{timestamp[17:19]}"
+    )
+    state["timestamp"] = timestamp
+    return state
@@ -1,30 +1,60 @@
 """
 Tools module for LangGraph agents
-Each agent has its own tool module
+Each agent has its own tool module; tools are imported on first access
+(PEP 562) so touching one agent's tools doesn't load the others' dependencies
 """
-from .analytics_tools import *
-from .search_tools import *
-from .document_tools import *
-from .compliance_tools import *
-from .database import MockDatabase
+import importlib
+from typing import Any
 
-__all__ = [
-    "MockDatabase",
+# Public name -> submodule that defines it
+_LAZY = {
+    "MockDatabase": "database",
     # Analytics tools
-    "query_performance_data",
-    "analyze_sales_trend",
-    "calculate_kpis",
-    "predict_sales_trend",
+    "query_performance_data": "analytics_tools",
+    "analyze_sales_trend": "analytics_tools",
+    "calculate_kpis": "analytics_tools",
+    "predict_sales_trend": "analytics_tools",
     # Search tools
-    "search_knowledge_base",
-    "search_customer_data",
-    "search_competitor_info",
+    "search_internal_db": "search_tools",
+    "search_vector_db": "search_tools",
+    "search_external_api": "search_tools",
+    "rerank_search_results": "search_tools",
+    "merge_search_results": "search_tools",
+    "semantic_search": "search_tools",
     # Document tools
-    "create_sales_proposal",
-    "create_meeting_minutes",
-    "create_analysis_report",
+    "parse_natural_language": "document_tools",
+    "create_visit_report": "document_tools",
+    "create_product_demo_request": "document_tools",
+    "create_sample_request": "document_tools",
+    "create_general_document": "document_tools",
+    "natural_language_to_document": "document_tools",
+    "determine_document_structure": "document_tools",
+    "retrieve_document": "document_tools",
+    "prepare_compliance_check": "document_tools",
     # Compliance tools
-    "validate_data_privacy",
-    "check_regulatory_compliance",
-    "validate_contract_terms"
-]
\ No newline at end of file
+    "check_medical_law_compliance": "compliance_tools",
+    "check_rebate_law_compliance": "compliance_tools",
+    "check_fair_trade_compliance": "compliance_tools",
+    "check_internal_policy_compliance": "compliance_tools",
+    "perform_full_compliance_check": "compliance_tools",
+    "batch_compliance_check": "compliance_tools",
+    "generate_compliance_suggestions": "compliance_tools",
+    "save_validation_results": "compliance_tools",
+    "query_validation_history": "compliance_tools",
+    "get_compliance_report": "compliance_tools",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
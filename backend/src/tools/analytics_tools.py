@@ -2,21 +2,196 @@
 Analytics Tools for LangGraph 0.6.6
 Pandas-based data analysis and insights generation
 """
-from typing import Dict, Any, List, Optional
-import pandas as pd
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from collections import OrderedDict
+import functools
+import inspect
+import threading
+import time
 import numpy as np
 from datetime import datetime, timedelta
-import json
+import orjson
 from langchain_core.tools import tool
 from loguru import logger
-from .database import MockDatabase
+from .database import MockDatabase, on_seed
+from .db_cache import SNAPSHOT_TTL, TableCache
 
 
-# Initialize database connection
-db = MockDatabase()
+@functools.lru_cache(maxsize=None)
+def _db() -> MockDatabase:
+    """Open the database on first use so importing the module stays cheap"""
+    return MockDatabase()
+
+
+# Tools read through the snapshot cache
+tables = TableCache(_db)
+
+
+def _dumps(payload: Any) -> str:
+    """
+    Serialize a tool result; NumPy scalars and arrays are encoded natively
+    Dates are formatted when the payload is built, so no default= hook is
+    needed; an unexpected type raises instead of being stringified
+    """
+    return orjson.dumps(
+        payload,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    ).decode()
+
+
+# Fixed early-exit payloads, serialized once
+_ERR_NO_DATA = _dumps({"error": "No data found", "count": 0})
+_ERR_INSUFFICIENT_DATA = _dumps({"error": "Insufficient data for prediction"})
+_ERR_NEED_3_MONTHS = _dumps({"error": "Need at least 3 months of data for prediction"})
+
+
+class ToolResultCache:
+    """
+    LRU cache of tool results with a per-entry TTL
+    Keyed by tool name and call arguments; thread-safe because parallel agent
+    groups invoke tools from worker threads
+    """
+    
+    def __init__(self, maxsize: int = 2000, ttl: float = SNAPSHOT_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: tuple) -> Optional[str]:
+        """Return the cached result, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return result
+    
+    def put(self, key: tuple, result: str) -> None:
+        """Store a result, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop every cached result (e.g. after the database is reseeded)"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Results expire on the same TTL as the table snapshots they are computed from
+_tool_cache = ToolResultCache()
+
+
+def clear_caches() -> None:
+    """Drop cached tool results and table snapshots"""
+    _tool_cache.clear()
+    tables.clear()
+
+
+on_seed(clear_caches)
+
+# Shared generator for prediction noise (one vector draw per call)
+_rng = np.random.default_rng()
+
+
+def _top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest values, largest first; ties keep index order"""
+    if values.size > k:
+        candidates = np.argpartition(-values, k - 1)[:k]
+    else:
+        candidates = np.arange(values.size)
+    return candidates[np.lexsort((candidates, -values[candidates]))]
+
+
+def _value_counts(codes: np.ndarray, labels: np.ndarray) -> Dict[Any, int]:
+    """Label -> count, most frequent first; ties keep first-appearance order (as value_counts)"""
+    present, first, counts = np.unique(codes, return_index=True, return_counts=True)
+    order = np.lexsort((first, -counts))
+    return {labels[present[i]]: int(counts[i]) for i in order}
+
+
+def _department_breakdown(df) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-department sales/score/deals in the groupby().agg().to_dict() shape
+    ({column: {department: value}}, departments sorted), via bincount
+    """
+    departments, codes = np.unique(df['department'].to_numpy(), return_inverse=True)
+    counts = np.bincount(codes, minlength=departments.size)
+    sales = np.bincount(codes, weights=df['monthly_sales'].to_numpy(), minlength=departments.size)
+    scores = np.bincount(codes, weights=df['performance_score'].to_numpy(), minlength=departments.size)
+    deals = np.bincount(codes, weights=df['deals_closed'].to_numpy(), minlength=departments.size)
+    return {
+        "monthly_sales": {dept: float(sales[i]) for i, dept in enumerate(departments)},
+        "performance_score": {dept: float(scores[i] / counts[i]) for i, dept in enumerate(departments)},
+        "deals_closed": {dept: int(deals[i]) for i, dept in enumerate(departments)}
+    }
+
+
+def _trend_kernel(y: np.ndarray, months_ahead: int, z: np.ndarray) -> Tuple[float, float, float, np.ndarray]:
+    """
+    Linear-trend forecast over a series of monthly totals
+    Returns slope, intercept, sample std and a (months_ahead, 3) array of
+    prediction / low / high bands; z holds standard-normal draws for the
+    noise term, scaled to 10% of the std, and predictions are floored at 0
+    """
+    # Closed-form least squares; polyfit would build a Vandermonde matrix
+    # and go through lstsq for two coefficients
+    x = np.arange(y.size, dtype=np.float64)
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    slope = float((dx * (y - y_mean)).sum() / (dx * dx).sum())
+    intercept = float(y_mean - slope * x_mean)
+    std = float(y.std(ddof=1))
+    
+    bands = np.empty((months_ahead, 3))
+    steps = np.arange(y.size + 1, y.size + months_ahead + 1)
+    np.maximum(slope * steps + intercept + z * (std * 0.1), 0, out=bands[:, 0])
+    np.multiply(bands[:, 0], 0.8, out=bands[:, 1])
+    np.multiply(bands[:, 0], 1.2, out=bands[:, 2])
+    return slope, intercept, std, bands
+
+
+def cached_tool_result(fn: Optional[Callable[..., str]] = None, *,
+                       cacheable: Optional[Callable[[Dict[str, Any]], bool]] = None):
+    """
+    Serve repeated tool calls from _tool_cache
+    Apply beneath @tool, bare or with cacheable=, a predicate over the bound
+    arguments that leaves nondeterministic calls uncached. Arguments are bound
+    to the signature with defaults applied, so f() and f(x=None) share a key;
+    error payloads are not cached so failures are retried
+    """
+    def decorate(fn: Callable[..., str]) -> Callable[..., str]:
+        signature = inspect.signature(fn)
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            if cacheable is not None and not cacheable(bound.arguments):
+                return fn(*args, **kwargs)
+            
+            key = (fn.__name__, tuple(bound.arguments.items()))
+            result = _tool_cache.get(key)
+            if result is None:
+                result = fn(*args, **kwargs)
+                if not result.startswith('{"error"'):
+                    _tool_cache.put(key, result)
+            return result
+        return wrapper
+    
+    return decorate(fn) if fn is not None else decorate
 
 
 @tool
+@cached_tool_result
 def query_performance_data(employee_id: Optional[str] = None, department: Optional[str] = None) -> str:
     """
     Query employee performance data from SQLite database
@@ -30,14 +205,18 @@ def query_performance_data(employee_id: Optional[str] = None, department: Option
     """
     try:
         # Get employee performance data
-        df = db.get_employee_performance(employee_id)
+        df = tables.get_employee_performance(employee_id)
         
         # Filter by department if specified
         if department and not employee_id:
             df = df[df['department'] == department]
         
         if df.empty:
-            return json.dumps({"error": "No data found", "count": 0}, ensure_ascii=False)
+            return _ERR_NO_DATA
+        
+        # Top performer by score, without relying on the query's sort order
+        scores = df['performance_score'].to_numpy()
+        top = int(np.argmax(scores))
         
         # Calculate statistics
         stats = {
@@ -46,34 +225,27 @@ def query_performance_data(employee_id: Optional[str] = None, department: Option
             "total_monthly_sales": float(df['monthly_sales'].sum()),
             "avg_performance_score": float(df['performance_score'].mean()),
             "top_performer": {
-                "name": df.iloc[0]['name'],
-                "score": float(df.iloc[0]['performance_score']),
-                "monthly_sales": float(df.iloc[0]['monthly_sales'])
-            } if not df.empty else None,
-            "department_breakdown": df.groupby('department').agg({
-                'monthly_sales': 'sum',
-                'performance_score': 'mean',
-                'deals_closed': 'sum'
-            }).to_dict() if len(df) > 1 else None
+                "name": df['name'].iat[top],
+                "score": float(scores[top]),
+                "monthly_sales": float(df['monthly_sales'].iat[top])
+            },
+            "department_breakdown": _department_breakdown(df) if len(df) > 1 else None
         }
         
         # Add individual employee data if querying specific employee
         if employee_id and not df.empty:
-            emp_data = df.iloc[0].to_dict()
-            stats["employee_details"] = {
-                k: float(v) if isinstance(v, (np.integer, np.floating)) else v
-                for k, v in emp_data.items()
-            }
+            stats["employee_details"] = {column: df[column].iat[0] for column in df.columns}
         
         logger.info(f"Performance data queried: {len(df)} records")
-        return json.dumps(stats, ensure_ascii=False, default=str)
+        return _dumps(stats)
         
     except Exception as e:
         logger.error(f"Error querying performance data: {e}")
-        return json.dumps({"error": str(e)}, ensure_ascii=False)
+        return _dumps({"error": str(e)})
 
 
 @tool
+@cached_tool_result
 def analyze_sales_trend(period_days: int = 30, customer_id: Optional[str] = None) -> str:
     """
     Analyze sales trends using Pandas
@@ -87,13 +259,11 @@ def analyze_sales_trend(period_days: int = 30, customer_id: Optional[str] = None
     """
     try:
         # Get sales summary
-        summary = db.get_sales_summary(period_days)
+        summary = tables.get_sales_summary(period_days)
         
         # Get customer trends if specified
-        if customer_id:
-            customer_df = db.get_customer_trends(customer_id, months=12)
-        else:
-            customer_df = db.get_customer_trends(months=3)
+        trend_months = 12 if customer_id else 3
+        trends = tables.customer_trends(customer_id, months=trend_months)
         
         # Analyze trends
         trend_analysis = {
@@ -102,64 +272,75 @@ def analyze_sales_trend(period_days: int = 30, customer_id: Optional[str] = None
             "customer_analysis": {}
         }
         
-        if not customer_df.empty:
-            # Group by customer for overall trends
-            customer_grouped = customer_df.groupby('customer_name').agg({
-                'monthly_revenue': ['mean', 'sum', 'std'],
-                'growth_rate': 'mean',
-                'satisfaction_score': 'mean',
-                'order_count': 'sum'
-            })
-            
-            # Calculate trend direction
-            recent_df = customer_df[customer_df['trend_date'] >= (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")]
-            older_df = customer_df[customer_df['trend_date'] < (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")]
+        if trends['monthly_revenue'].size:
+            # Calculate trend direction: rows are sorted by date, so the last
+            # 30 days are everything from the cutoff's insertion point on
+            cutoff = np.datetime64((datetime.now() - timedelta(days=30)).date())
+            split = int(np.searchsorted(trends['trend_date'], cutoff))
+            revenue = trends['monthly_revenue']
             
-            if not recent_df.empty and not older_df.empty:
-                recent_avg = recent_df['monthly_revenue'].mean()
-                older_avg = older_df['monthly_revenue'].mean()
+            if 0 < split < revenue.size:
+                recent_avg = revenue[split:].mean()
+                older_avg = revenue[:split].mean()
                 trend_direction = "increasing" if recent_avg > older_avg else "decreasing"
                 trend_percentage = ((recent_avg - older_avg) / older_avg * 100) if older_avg > 0 else 0
             else:
                 trend_direction = "stable"
                 trend_percentage = 0
             
-            # Top customers by revenue
-            top_customers = customer_df.groupby('customer_name')['monthly_revenue'].sum().nlargest(5)
+            # Per-customer revenue totals in one bincount pass; the overall
+            # total and mean fold out of the K-sized array
+            customer_names = trends['customer_name_labels']
+            customer_totals = np.bincount(
+                trends['customer_name_codes'], weights=revenue, minlength=customer_names.size
+            )
+            total_revenue = float(customer_totals.sum())
+            top_customers = {
+                customer_names[i]: float(customer_totals[i])
+                for i in _top_k_indices(customer_totals, 5)
+            }
             
             trend_analysis["customer_analysis"] = {
-                "total_customers": customer_df['customer_id'].nunique(),
-                "avg_monthly_revenue": float(customer_df['monthly_revenue'].mean()),
-                "total_revenue": float(customer_df['monthly_revenue'].sum()),
+                "total_customers": int(trends['customer_id_labels'].size),
+                "avg_monthly_revenue": total_revenue / revenue.size,
+                "total_revenue": total_revenue,
                 "trend_direction": trend_direction,
                 "trend_percentage": float(trend_percentage),
-                "top_customers": top_customers.to_dict() if not top_customers.empty else {},
-                "avg_satisfaction": float(customer_df['satisfaction_score'].mean()),
-                "risk_distribution": customer_df['risk_level'].value_counts().to_dict()
+                "top_customers": top_customers,
+                "avg_satisfaction": float(trends['satisfaction_score'].mean()),
+                "risk_distribution": _value_counts(
+                    trends['risk_level_codes'], trends['risk_level_labels']
+                )
             }
         
         # Get top performers for the period
-        top_performers = db.get_top_performers(limit=3)
+        top_performers = tables.get_top_performers(limit=3)
         if not top_performers.empty:
             trend_analysis["top_performers"] = [
                 {
-                    "name": row['name'],
-                    "department": row['department'],
-                    "recent_revenue": float(row['recent_revenue']) if row['recent_revenue'] else 0,
-                    "performance_score": float(row['performance_score'])
+                    "name": name,
+                    "department": department,
+                    "recent_revenue": float(recent_revenue) if recent_revenue else 0,
+                    "performance_score": float(score)
                 }
-                for _, row in top_performers.iterrows()
+                for name, department, recent_revenue, score in zip(
+                    top_performers['name'],
+                    top_performers['department'],
+                    top_performers['recent_revenue'],
+                    top_performers['performance_score']
+                )
             ]
         
         logger.info(f"Sales trend analysis completed for {period_days} days")
-        return json.dumps(trend_analysis, ensure_ascii=False, default=str)
+        return _dumps(trend_analysis)
         
     except Exception as e:
         logger.error(f"Error analyzing sales trend: {e}")
-        return json.dumps({"error": str(e)}, ensure_ascii=False)
+        return _dumps({"error": str(e)})
 
 
 @tool
+@cached_tool_result
 def calculate_kpis() -> str:
     """
     Calculate key performance indicators (KPIs)
@@ -169,11 +350,11 @@ def calculate_kpis() -> str:
     """
     try:
         # Get various data
-        employees_df = db.get_employee_performance()
-        sales_30d = db.get_sales_summary(30)
-        sales_90d = db.get_sales_summary(90)
-        products_df = db.get_product_performance()
-        market_df = db.get_market_analysis()
+        employees = tables.employees()
+        sales_30d = tables.get_sales_summary(30)
+        sales_90d = tables.get_sales_summary(90)
+        products = tables.products()
+        market = tables.market()
         
         # Calculate KPIs
         kpis = {
@@ -184,14 +365,14 @@ def calculate_kpis() -> str:
         }
         
         # Employee KPIs
-        if not employees_df.empty:
+        if employees["employee_id"].size:
             kpis["employee_kpis"] = {
-                "total_employees": len(employees_df),
-                "avg_performance_score": float(employees_df['performance_score'].mean()),
-                "top_performer_score": float(employees_df['performance_score'].max()),
-                "avg_conversion_rate": float(employees_df['conversion_rate'].mean()),
-                "total_deals_closed": int(employees_df['deals_closed'].sum()),
-                "avg_customer_satisfaction": float(employees_df['customer_satisfaction'].mean())
+                "total_employees": int(employees["employee_id"].size),
+                "avg_performance_score": float(employees['performance_score'].mean()),
+                "top_performer_score": float(employees['performance_score'].max()),
+                "avg_conversion_rate": float(employees['conversion_rate'].mean()),
+                "total_deals_closed": int(employees['deals_closed'].sum()),
+                "avg_customer_satisfaction": float(employees['customer_satisfaction'].mean())
             }
         
         # Sales KPIs
@@ -221,34 +402,41 @@ def calculate_kpis() -> str:
                 kpis["sales_kpis"]["growth_rate"] = float(growth_rate)
         
         # Product KPIs
-        if not products_df.empty:
+        if products["product_id"].size:
+            best = int(np.argmax(products['revenue']))
             kpis["product_kpis"] = {
-                "total_products": len(products_df),
-                "total_units_sold": int(products_df['units_sold'].sum()),
-                "total_product_revenue": float(products_df['revenue'].sum()),
-                "avg_product_rating": float(products_df['avg_rating'].mean()),
-                "avg_return_rate": float(products_df['return_rate'].mean()),
+                "total_products": int(products["product_id"].size),
+                "total_units_sold": int(products['units_sold'].sum()),
+                "total_product_revenue": float(products['revenue'].sum()),
+                "avg_product_rating": float(products['avg_rating'].mean()),
+                "avg_return_rate": float(products['return_rate'].mean()),
                 "best_selling_product": {
-                    "name": products_df.iloc[0]['product_name'],
-                    "revenue": float(products_df.iloc[0]['revenue']),
-                    "units_sold": int(products_df.iloc[0]['units_sold'])
-                } if not products_df.empty else None
+                    "name": products['product_name'][best],
+                    "revenue": float(products['revenue'][best]),
+                    "units_sold": int(products['units_sold'][best])
+                }
             }
         
-        # Market KPIs
-        if not market_df.empty:
-            recent_market = market_df[market_df['analysis_date'] >= (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")]
+        # Market KPIs: rows stay in query order (newest first, best
+        # opportunity first) so argmax picks the same segment as nlargest
+        if market['analysis_date'].size:
+            cutoff = np.datetime64(datetime.now().date() - timedelta(days=30))
+            recent = market['analysis_date'] >= cutoff
             
-            if not recent_market.empty:
+            if recent.any():
+                opportunity = market['opportunity_score'][recent]
+                best = int(np.argmax(opportunity))
                 kpis["market_kpis"] = {
-                    "avg_market_share": float(recent_market['our_market_share'].mean()),
-                    "avg_growth_forecast": float(recent_market['growth_forecast'].mean()),
-                    "avg_opportunity_score": float(recent_market['opportunity_score'].mean()),
-                    "threat_levels": recent_market['threat_level'].value_counts().to_dict(),
+                    "avg_market_share": float(market['our_market_share'][recent].mean()),
+                    "avg_growth_forecast": float(market['growth_forecast'][recent].mean()),
+                    "avg_opportunity_score": float(opportunity.mean()),
+                    "threat_levels": _value_counts(
+                        market['threat_level_codes'][recent], market['threat_level_labels']
+                    ),
                     "best_segment": {
-                        "name": recent_market.nlargest(1, 'opportunity_score').iloc[0]['market_segment'],
-                        "opportunity_score": float(recent_market.nlargest(1, 'opportunity_score').iloc[0]['opportunity_score'])
-                    } if not recent_market.empty else None
+                        "name": market['market_segment'][recent][best],
+                        "opportunity_score": float(opportunity[best])
+                    }
                 }
         
         # Overall health score (weighted average of key metrics)
@@ -277,87 +465,67 @@ def calculate_kpis() -> str:
             kpis["overall_health_score"] = float(health_score / weight_sum)
         
         logger.info("KPIs calculated successfully")
-        return json.dumps(kpis, ensure_ascii=False, default=str)
+        return _dumps(kpis)
         
     except Exception as e:
         logger.error(f"Error calculating KPIs: {e}")
-        return json.dumps({"error": str(e)}, ensure_ascii=False)
+        return _dumps({"error": str(e)})
 
 
 @tool
-def predict_sales_trend(months_ahead: int = 3) -> str:
+@cached_tool_result(cacheable=lambda arguments: arguments["seed"] is not None)
+def predict_sales_trend(months_ahead: int = 3, seed: Optional[int] = None) -> str:
     """
     Simple trend prediction using moving averages
     
     Args:
         months_ahead: Number of months to predict ahead
+        seed: Optional random seed for reproducible predictions
     
     Returns:
         JSON string with predictions
     """
     try:
         # Get historical customer trends
-        customer_df = db.get_customer_trends(months=12)
+        trends = tables.customer_trends(months=12)
         
-        if customer_df.empty:
-            return json.dumps({"error": "Insufficient data for prediction"}, ensure_ascii=False)
+        if not trends['monthly_revenue'].size:
+            return _ERR_INSUFFICIENT_DATA
         
-        # Convert trend_date to datetime
-        customer_df['trend_date'] = pd.to_datetime(customer_df['trend_date'])
-        
-        # Group by month and calculate monthly totals
-        monthly_revenue = customer_df.groupby(pd.Grouper(key='trend_date', freq='M'))['monthly_revenue'].sum()
+        # Monthly totals over the full month range; rows are date-sorted and
+        # empty months total 0, as with a monthly Grouper sum
+        months = trends['trend_date'].astype('datetime64[M]')
+        first_month = months[0]
+        monthly_revenue = np.bincount(
+            (months - first_month).astype(np.int64),
+            weights=np.nan_to_num(trends['monthly_revenue'])
+        )
         
         if len(monthly_revenue) < 3:
-            return json.dumps({"error": "Need at least 3 months of data for prediction"}, ensure_ascii=False)
-        
-        # Calculate moving average and trend
-        ma_3 = monthly_revenue.rolling(window=3).mean()
-        
-        # Simple linear trend
-        x = np.arange(len(monthly_revenue))
-        y = monthly_revenue.values
-        
-        # Remove NaN values
-        mask = ~np.isnan(y)
-        x_clean = x[mask]
-        y_clean = y[mask]
-        
-        if len(x_clean) < 2:
-            return json.dumps({"error": "Insufficient clean data for trend calculation"}, ensure_ascii=False)
-        
-        # Fit linear trend
-        z = np.polyfit(x_clean, y_clean, 1)
-        trend_slope = z[0]
-        trend_intercept = z[1]
-        
-        # Make predictions
-        predictions = []
-        last_x = len(monthly_revenue)
-        
-        for i in range(1, months_ahead + 1):
-            predicted_value = trend_slope * (last_x + i) + trend_intercept
-            
-            # Add some randomness based on historical volatility
-            std_dev = monthly_revenue.std()
-            noise = np.random.normal(0, std_dev * 0.1)  # 10% of historical volatility
-            predicted_value += noise
-            
-            # Ensure positive values
-            predicted_value = max(predicted_value, 0)
-            
-            future_date = monthly_revenue.index[-1] + pd.DateOffset(months=i)
-            
-            predictions.append({
-                "month": future_date.strftime("%Y-%m"),
-                "predicted_revenue": float(predicted_value),
-                "confidence_low": float(predicted_value * 0.8),
-                "confidence_high": float(predicted_value * 1.2)
-            })
+            return _ERR_NEED_3_MONTHS
+        
+        # Linear trend, volatility and predictions in one pass; the noise
+        # (10% of historical volatility) is drawn here so the kernel is pure
+        rng = _rng if seed is None else np.random.default_rng(seed)
+        trend_slope, trend_intercept, std_dev, bands = _trend_kernel(
+            monthly_revenue, months_ahead, rng.standard_normal(months_ahead)
+        )
+        
+        last_month = len(monthly_revenue) - 1
+        predictions = [
+            {
+                "month": str(first_month + last_month + i),
+                "predicted_revenue": float(value),
+                "confidence_low": float(low),
+                "confidence_high": float(high)
+            }
+            for i, (value, low, high) in enumerate(bands, start=1)
+        ]
         
         # Calculate trend indicators
         recent_avg = monthly_revenue[-3:].mean()
-        older_avg = monthly_revenue[-6:-3].mean() if len(monthly_revenue) >= 6 else monthly_revenue[:-3].mean()
+        older_revenue = monthly_revenue[-6:-3] if len(monthly_revenue) >= 6 else monthly_revenue[:-3]
+        older_avg = older_revenue.mean() if older_revenue.size else 0
         
         trend_direction = "upward" if trend_slope > 0 else "downward" if trend_slope < 0 else "stable"
         momentum = ((recent_avg - older_avg) / older_avg * 100) if older_avg > 0 else 0
@@ -369,24 +537,24 @@ def predict_sales_trend(months_ahead: int = 3) -> str:
                 "slope": float(trend_slope),
                 "momentum_percentage": float(momentum),
                 "recent_average": float(recent_avg),
-                "volatility": float(monthly_revenue.std())
+                "volatility": float(std_dev)
             },
             "historical_context": {
                 "months_analyzed": len(monthly_revenue),
                 "highest_month": {
-                    "date": monthly_revenue.idxmax().strftime("%Y-%m"),
+                    "date": str(first_month + int(np.argmax(monthly_revenue))),
                     "value": float(monthly_revenue.max())
                 },
                 "lowest_month": {
-                    "date": monthly_revenue.idxmin().strftime("%Y-%m"),
+                    "date": str(first_month + int(np.argmin(monthly_revenue))),
                     "value": float(monthly_revenue.min())
                 }
             }
         }
         
         logger.info(f"Sales trend prediction completed for {months_ahead} months")
-        return json.dumps(result, ensure_ascii=False, default=str)
+        return _dumps(result)
         
     except Exception as e:
         logger.error(f"Error predicting sales trend: {e}")
-        return json.dumps({"error": str(e)}, ensure_ascii=False)
\ No newline at end of file
+        return _dumps({"error": str(e)})
\ No newline at end of file
@@ -3,15 +3,88 @@ Compliance Tools for LangGraph 0.6.6
 Rule Engine Pattern for Legal and Policy Validation
 Following rules.md: tools must use @tool decorator
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
-import json
 import re
+import orjson
 from enum import Enum
 from langchain_core.tools import tool
 from loguru import logger
 import sqlite3
 import os
+import queue
+import threading
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+def _load_re2():
+    """
+    google-re2 when installed, else None (stdlib backtracking engine)
+    google-re2 matches in linear time and scans every rule in one pass via
+    RE2::Set. Other distributions (pyre2, re2 0.2.x) also install a top-level
+    "re2" module without Options/Set, so the API used here is probed first
+    """
+    try:
+        import re2
+        options = re2.Options()
+        options.case_sensitive = False
+        re2.Set.SearchSet(options)
+    except (ImportError, AttributeError, TypeError):
+        return None
+    return re2
+
+
+re2 = _load_re2()
+
+
+def _compile_pattern(pattern: str):
+    """Compile a rule pattern case-insensitively, with RE2 when available"""
+    if re2 is not None:
+        options = re2.Options()
+        options.case_sensitive = False
+        return re2.compile(pattern, options)
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def _dumps(payload: Any) -> str:
+    """
+    Serialize a tool result or stored JSON column (UTF-8, non-ASCII kept as is)
+    Dicts handed to the tools come from the model, so int/float keys are
+    stringified as the stdlib json module did instead of raising
+    """
+    return orjson.dumps(
+        payload,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    ).decode()
+
+
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+
+
+def _literal_anchors(pattern: str) -> Optional[List[str]]:
+    """
+    Casefolded literal prefix of each branch of a "(a|b|...)" rule pattern;
+    the pattern can only match text containing one of them. None when some
+    branch doesn't start with a literal (the rule is always evaluated)
+    """
+    body = pattern[1:-1] if pattern.startswith("(") and pattern.endswith(")") else pattern
+    if any(ch in body for ch in "()[]"):
+        return None
+    
+    anchors = []
+    for branch in body.split("|"):
+        length = 0
+        while length < len(branch) and branch[length] not in _REGEX_META:
+            length += 1
+        # A trailing *, ? or {m,n} makes the last literal character optional
+        if length < len(branch) and branch[length] in "*?{":
+            length -= 1
+        if length <= 0:
+            return None
+        anchors.append(branch[:length].casefold())
+    return anchors
 
 
 class ViolationType(Enum):
@@ -38,9 +111,36 @@ class RuleEngine:
     
     def __init__(self):
         self.rules = self._initialize_rules()
+        for rules in self.rules.values():
+            for rule in rules:
+                rule["compiled"] = _compile_pattern(rule["pattern"])
+                rule["anchors"] = _literal_anchors(rule["pattern"])
+        
+        # Prebuilt matchers: one over every rule, one per rule type
+        self._rule_set = self._build_rule_set(
+            [rule for rules in self.rules.values() for rule in rules]
+        )
+        self._type_rule_sets = {
+            rule_type: self._build_rule_set(rules) for rule_type, rules in self.rules.items()
+        }
         
+    def _build_rule_set(self, rules: List[Dict]) -> Optional[Tuple[Any, List[str]]]:
+        """RE2::Set over the rules' patterns with set index -> rule id (None without RE2)"""
+        if re2 is None:
+            return None
+        
+        options = re2.Options()
+        options.case_sensitive = False
+        rule_set = re2.Set.SearchSet(options)
+        for rule in rules:
+            rule_set.Add(rule["pattern"])
+        rule_set.Compile()
+        return rule_set, [rule["id"] for rule in rules]
+    
     def _initialize_rules(self) -> Dict[str, List[Dict]]:
         """Initialize compliance rules"""
+        # Gaps between terms are bounded (.{0,40}, about one sentence) so the
+        # stdlib fallback can't backtrack quadratically on long lines
         return {
             ViolationType.MEDICAL_LAW.value: [
                 {
@@ -64,7 +164,7 @@ class RuleEngine:
                 {
                     "id": "REB001",
                     "name": "부당한 경제적 이익 제공",
-                    "pattern": r"(리베이트|현금.*지급|금품.*제공|무료.*제공)",
+                    "pattern": r"(리베이트|현금.{0,40}지급|금품.{0,40}제공|무료.{0,40}제공)",
                     "level": ComplianceLevel.CRITICAL,
                     "description": "의료인에게 부당한 경제적 이익 제공 금지",
                     "suggestion": "정당한 할인이나 계약 조건으로 변경"
@@ -72,7 +172,7 @@ class RuleEngine:
                 {
                     "id": "REB002",
                     "name": "과도한 접대",
-                    "pattern": r"(접대|식사.*제공|골프|여행.*지원)",
+                    "pattern": r"(접대|식사.{0,40}제공|골프|여행.{0,40}지원)",
                     "level": ComplianceLevel.HIGH,
                     "description": "5만원 초과 접대 금지",
                     "suggestion": "5만원 이하로 제한하거나 제거"
@@ -80,7 +180,7 @@ class RuleEngine:
                 {
                     "id": "REB003",
                     "name": "학회 지원 제한",
-                    "pattern": r"(학회.*지원|세미나.*비용|교육.*지원)",
+                    "pattern": r"(학회.{0,40}지원|세미나.{0,40}비용|교육.{0,40}지원)",
                     "level": ComplianceLevel.MEDIUM,
                     "description": "학회 지원은 투명하게 공개되어야 함",
                     "suggestion": "공식 후원 계약서 작성 필요"
@@ -90,7 +190,7 @@ class RuleEngine:
                 {
                     "id": "FT001",
                     "name": "부당한 거래 거절",
-                    "pattern": r"(독점|거래.*거절|공급.*중단)",
+                    "pattern": r"(독점|거래.{0,40}거절|공급.{0,40}중단)",
                     "level": ComplianceLevel.HIGH,
                     "description": "시장 지배적 지위 남용 금지",
                     "suggestion": "공정한 거래 조건 명시"
@@ -98,7 +198,7 @@ class RuleEngine:
                 {
                     "id": "FT002",
                     "name": "가격 담합",
-                    "pattern": r"(가격.*협의|담합|경쟁사.*가격)",
+                    "pattern": r"(가격.{0,40}협의|담합|경쟁사.{0,40}가격)",
                     "level": ComplianceLevel.CRITICAL,
                     "description": "경쟁사와 가격 담합 금지",
                     "suggestion": "독립적인 가격 정책 수립"
@@ -106,7 +206,7 @@ class RuleEngine:
                 {
                     "id": "FT003",
                     "name": "허위 광고",
-                    "pattern": r"(최고|유일|1위|100%.*보장)",
+                    "pattern": r"(최고|유일|1위|100%.{0,40}보장)",
                     "level": ComplianceLevel.MEDIUM,
                     "description": "과장되거나 허위 광고 금지",
                     "suggestion": "객관적 근거 제시 또는 표현 수정"
@@ -116,7 +216,7 @@ class RuleEngine:
                 {
                     "id": "POL001",
                     "name": "할인율 제한",
-                    "pattern": r"(\d{3,}%.*할인|50%.*이상.*할인)",
+                    "pattern": r"(\d{3,}%.{0,40}할인|50%.{0,40}이상.{0,40}할인)",
                     "level": ComplianceLevel.MEDIUM,
                     "description": "회사 정책상 최대 할인율 30% 제한",
                     "suggestion": "할인율을 30% 이하로 조정"
@@ -124,7 +224,7 @@ class RuleEngine:
                 {
                     "id": "POL002",
                     "name": "계약 기간",
-                    "pattern": r"(5년.*이상|장기.*계약)",
+                    "pattern": r"(5년.{0,40}이상|장기.{0,40}계약)",
                     "level": ComplianceLevel.LOW,
                     "description": "5년 이상 장기 계약 제한",
                     "suggestion": "계약 기간을 3년으로 조정"
@@ -132,7 +232,7 @@ class RuleEngine:
                 {
                     "id": "POL003",
                     "name": "결제 조건",
-                    "pattern": r"(선불|전액.*선납)",
+                    "pattern": r"(선불|전액.{0,40}선납)",
                     "level": ComplianceLevel.INFO,
                     "description": "선불 결제는 승인 필요",
                     "suggestion": "분할 납부 조건 추가"
@@ -142,7 +242,7 @@ class RuleEngine:
                 {
                     "id": "PRIV001",
                     "name": "개인정보 수집",
-                    "pattern": r"(주민등록번호|여권.*번호|운전면허)",
+                    "pattern": r"(주민등록번호|여권.{0,40}번호|운전면허)",
                     "level": ComplianceLevel.CRITICAL,
                     "description": "민감 개인정보 수집 제한",
                     "suggestion": "필수 정보만 수집하도록 수정"
@@ -150,7 +250,7 @@ class RuleEngine:
                 {
                     "id": "PRIV002",
                     "name": "제3자 제공",
-                    "pattern": r"(정보.*제공|데이터.*공유|제3자)",
+                    "pattern": r"(정보.{0,40}제공|데이터.{0,40}공유|제3자)",
                     "level": ComplianceLevel.HIGH,
                     "description": "개인정보 제3자 제공시 동의 필요",
                     "suggestion": "명시적 동의 조항 추가"
@@ -160,18 +260,45 @@ class RuleEngine:
     
     def check_violations(self, text: str, rule_types: List[str] = None) -> List[Dict]:
         """Check text for compliance violations"""
-        violations = []
-        
         # Default to all rule types if not specified
         if not rule_types:
             rule_types = [vt.value for vt in ViolationType]
         
+        return self._scan(text, rule_types, self._rule_set)
+    
+    def check_by_type(self, text: str, rule_type: str) -> List[Dict]:
+        """Check text against a single rule type using that type's prebuilt matcher"""
+        return self._scan(text, [rule_type], self._type_rule_sets.get(rule_type))
+    
+    def _scan(self, text: str, rule_types: List[str], rule_set: Optional[Tuple[Any, List[str]]]) -> List[Dict]:
+        """Collect violations of the given rule types, prefiltered by rule_set when present"""
+        violations = []
+        
+        # With RE2, one Set scan tells which rules match anywhere in the text;
+        # otherwise rules whose literal anchors are all absent are skipped
+        matched_ids = None
+        if rule_set is not None:
+            pattern_set, rule_ids = rule_set
+            matched_ids = {rule_ids[i] for i in pattern_set.Match(text) or ()}
+        else:
+            folded = text.casefold()
+        
         for rule_type in rule_types:
             if rule_type not in self.rules:
                 continue
                 
             for rule in self.rules[rule_type]:
-                if re.search(rule["pattern"], text, re.IGNORECASE):
+                if matched_ids is not None:
+                    if rule["id"] not in matched_ids:
+                        continue
+                else:
+                    anchors = rule["anchors"]
+                    if anchors is not None and not any(anchor in folded for anchor in anchors):
+                        continue
+                
+                # One pass both detects the rule and collects its matches
+                matched_text = rule["compiled"].findall(text)
+                if matched_text:
                     violations.append({
                         "rule_id": rule["id"],
                         "rule_name": rule["name"],
@@ -179,7 +306,7 @@ class RuleEngine:
                         "level": rule["level"].value,
                         "description": rule["description"],
                         "suggestion": rule["suggestion"],
-                        "matched_text": re.findall(rule["pattern"], text, re.IGNORECASE)
+                        "matched_text": matched_text
                     })
         
         return violations
@@ -188,14 +315,69 @@ class RuleEngine:
 class ValidationDB:
     """Database for storing validation results"""
     
+    # Idle read connections kept open; extra ones opened under load are closed
+    # when returned, so worker threads never leave connections behind
+    READ_POOL_SIZE = 4
+    
     def __init__(self, db_path: str = "data/validation_results.db"):
+        # Nothing touches the file until the first save or query, so importing
+        # the module (and its singleton below) leaves the database untouched
         self.db_path = db_path
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self._init_db()
-    
-    def _init_db(self):
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._readers: queue.LifoQueue = queue.LifoQueue(maxsize=self.READ_POOL_SIZE)
+    
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """
+        One long-lived WAL connection for writes, opened on first use; the
+        lock serializes writers and each save commits as one transaction
+        """
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                    conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    self._init_db(conn)
+                    self._conn = conn
+        return self._conn
+    
+    @contextmanager
+    def read_connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a pooled read connection (kept open with a warm page cache);
+        under WAL readers don't wait for the writer
+        """
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            self.conn  # creates the file and schema on first use
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            try:
+                self._readers.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+    
+    def close(self):
+        """Close the pooled read connections and the write connection"""
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def _init_db(self, conn: sqlite3.Connection):
         """Initialize validation database"""
-        conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         # Create validation results table
@@ -234,24 +416,74 @@ class ValidationDB:
             )
         """)
         
+        # Indexes for the history filters (each ordered by date) and report lookups
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_results_date 
+            ON validation_results(validation_date)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_results_document 
+            ON validation_results(document_id, validation_date)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_results_status 
+            ON validation_results(status, validation_date)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_details_validation 
+            ON violation_details(validation_id)
+        """)
+        
         conn.commit()
-        conn.close()
+        
+        # Refresh planner statistics where they are stale
+        conn.execute("PRAGMA optimize")
     
     def save_validation_result(self, result: Dict) -> str:
         """Save validation result to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return self.save_validation_batch([result])[0]
+    
+    def save_validation_batch(self, results: List[Dict]) -> List[str]:
+        """Save several validation results in one transaction, returning their ids"""
+        rows = [self._result_rows(result) for result in results]
+        
+        with self._lock, self.conn:
+            cursor = self.conn.cursor()
+            
+            # Insert main validation results
+            cursor.executemany("""
+                INSERT INTO validation_results 
+                (validation_id, document_id, document_type, validation_date, 
+                 total_violations, critical_count, high_count, medium_count, low_count,
+                 compliance_score, status, violations, suggestions, metadata)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [result_row for _, result_row, _ in rows])
+            
+            # Insert violation details (one prepared statement for all rows)
+            cursor.executemany("""
+                INSERT INTO violation_details
+                (validation_id, rule_id, rule_name, violation_type, level, 
+                 description, suggestion, matched_text)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [detail for _, _, details in rows for detail in details])
         
-        validation_id = f"VAL-{datetime.now().strftime('%Y%m%d%H%M%S')}-{result.get('document_id', 'UNKNOWN')[:8]}"
+        return [validation_id for validation_id, _, _ in rows]
+    
+    def _result_rows(self, result: Dict) -> Tuple[str, tuple, List[tuple]]:
+        """Build the validation_results row and violation_details rows for one result"""
+        # The random suffix keeps ids unique for documents saved in the same
+        # second whose ids share the 8-character prefix
+        validation_id = (
+            f"VAL-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            f"-{result.get('document_id', 'UNKNOWN')[:8]}-{uuid.uuid4().hex[:12]}"
+        )
         
-        # Count violations by level
+        # Count violations by level in one pass
         violations = result.get("violations", [])
-        level_counts = {
-            "critical": sum(1 for v in violations if v.get("level") == "critical"),
-            "high": sum(1 for v in violations if v.get("level") == "high"),
-            "medium": sum(1 for v in violations if v.get("level") == "medium"),
-            "low": sum(1 for v in violations if v.get("level") == "low")
-        }
+        level_counts = Counter(v.get("level") for v in violations)
         
         # Calculate compliance score (100 - penalties)
         penalty = (level_counts["critical"] * 25 + 
@@ -260,14 +492,7 @@ class ValidationDB:
                   level_counts["low"] * 2)
         compliance_score = max(0, 100 - penalty)
         
-        # Insert main validation result
-        cursor.execute("""
-            INSERT INTO validation_results 
-            (validation_id, document_id, document_type, validation_date, 
-             total_violations, critical_count, high_count, medium_count, low_count,
-             compliance_score, status, violations, suggestions, metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        result_row = (
             validation_id,
             result.get("document_id"),
             result.get("document_type"),
@@ -279,19 +504,13 @@ class ValidationDB:
             level_counts["low"],
             compliance_score,
             "PASSED" if compliance_score >= 70 else "FAILED",
-            json.dumps(violations, ensure_ascii=False),
-            json.dumps(result.get("suggestions", []), ensure_ascii=False),
-            json.dumps(result.get("metadata", {}), ensure_ascii=False)
-        ))
-        
-        # Insert violation details
-        for violation in violations:
-            cursor.execute("""
-                INSERT INTO violation_details
-                (validation_id, rule_id, rule_name, violation_type, level, 
-                 description, suggestion, matched_text)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            _dumps(violations),
+            _dumps(result.get("suggestions", [])),
+            _dumps(result.get("metadata", {}))
+        )
+        
+        detail_rows = [
+            (
                 validation_id,
                 violation.get("rule_id"),
                 violation.get("rule_name"),
@@ -299,20 +518,43 @@ class ValidationDB:
                 violation.get("level"),
                 violation.get("description"),
                 violation.get("suggestion"),
-                json.dumps(violation.get("matched_text", []), ensure_ascii=False)
-            ))
-        
-        conn.commit()
-        conn.close()
+                _dumps(violation.get("matched_text", []))
+            )
+            for violation in violations
+        ]
         
-        return validation_id
+        return validation_id, result_row, detail_rows
+
 
+# Legal (1차) checks of the full compliance check, in report order
+_LEGAL_RULE_TYPES = [
+    ViolationType.MEDICAL_LAW.value,
+    ViolationType.REBATE_LAW.value,
+    ViolationType.FAIR_TRADE.value,
+    ViolationType.DATA_PRIVACY.value
+]
 
 # Initialize singletons
 rule_engine = RuleEngine()
 validation_db = ValidationDB()
 
 
+def _run_single_type_check(text: str, violation_type: str, label: str) -> str:
+    """Run one rule type over text and build the single-type tool payload"""
+    violations = rule_engine.check_by_type(text, violation_type)
+    
+    result = {
+        "check_type": violation_type,
+        "violations_found": len(violations),
+        "violations": violations,
+        "status": "PASSED" if not violations else "NEEDS_REVIEW",
+        "checked_at": datetime.now().isoformat()
+    }
+    
+    logger.info(f"{label}: {len(violations)} violations found")
+    return _dumps(result)
+
+
 @tool
 def check_medical_law_compliance(text: str) -> str:
     """
@@ -321,18 +563,7 @@ def check_medical_law_compliance(text: str) -> str:
     Args:
         text: Document text to validate
     """
-    violations = rule_engine.check_violations(text, [ViolationType.MEDICAL_LAW.value])
-    
-    result = {
-        "check_type": "medical_law",
-        "violations_found": len(violations),
-        "violations": violations,
-        "status": "PASSED" if len(violations) == 0 else "NEEDS_REVIEW",
-        "checked_at": datetime.now().isoformat()
-    }
-    
-    logger.info(f"Medical law check: {len(violations)} violations found")
-    return json.dumps(result, ensure_ascii=False)
+    return _run_single_type_check(text, ViolationType.MEDICAL_LAW.value, "Medical law check")
 
 
 @tool
@@ -343,18 +574,7 @@ def check_rebate_law_compliance(text: str) -> str:
     Args:
         text: Document text to validate
     """
-    violations = rule_engine.check_violations(text, [ViolationType.REBATE_LAW.value])
-    
-    result = {
-        "check_type": "rebate_law",
-        "violations_found": len(violations),
-        "violations": violations,
-        "status": "PASSED" if len(violations) == 0 else "NEEDS_REVIEW",
-        "checked_at": datetime.now().isoformat()
-    }
-    
-    logger.info(f"Rebate law check: {len(violations)} violations found")
-    return json.dumps(result, ensure_ascii=False)
+    return _run_single_type_check(text, ViolationType.REBATE_LAW.value, "Rebate law check")
 
 
 @tool
@@ -365,18 +585,7 @@ def check_fair_trade_compliance(text: str) -> str:
     Args:
         text: Document text to validate
     """
-    violations = rule_engine.check_violations(text, [ViolationType.FAIR_TRADE.value])
-    
-    result = {
-        "check_type": "fair_trade",
-        "violations_found": len(violations),
-        "violations": violations,
-        "status": "PASSED" if len(violations) == 0 else "NEEDS_REVIEW",
-        "checked_at": datetime.now().isoformat()
-    }
-    
-    logger.info(f"Fair trade check: {len(violations)} violations found")
-    return json.dumps(result, ensure_ascii=False)
+    return _run_single_type_check(text, ViolationType.FAIR_TRADE.value, "Fair trade check")
 
 
 @tool
@@ -387,66 +596,21 @@ def check_internal_policy_compliance(text: str) -> str:
     Args:
         text: Document text to validate
     """
-    violations = rule_engine.check_violations(text, [ViolationType.INTERNAL_POLICY.value])
-    
-    result = {
-        "check_type": "internal_policy",
-        "violations_found": len(violations),
-        "violations": violations,
-        "status": "PASSED" if len(violations) == 0 else "NEEDS_REVIEW",
-        "checked_at": datetime.now().isoformat()
-    }
-    
-    logger.info(f"Internal policy check: {len(violations)} violations found")
-    return json.dumps(result, ensure_ascii=False)
+    return _run_single_type_check(text, ViolationType.INTERNAL_POLICY.value, "Internal policy check")
 
 
-@tool
-def perform_full_compliance_check(document_id: str, document_text: str, document_type: str = "general") -> str:
-    """
-    Perform comprehensive compliance check (1차 법률 + 2차 내규)
-    
-    Args:
-        document_id: Document identifier
-        document_text: Full document text to validate
-        document_type: Type of document (proposal, contract, report, etc.)
-    """
+def _full_check_result(document_id: str, document_text: str, document_type: str) -> Dict:
+    """Scan one document (1차 법률 + 2차 내규) and build its unsaved validation result"""
     logger.info(f"Starting full compliance check for document {document_id}")
     
-    # 1차 검증: 법률 위반 체크
-    legal_violations = []
-    
-    # Medical law check
-    medical_check = rule_engine.check_violations(
-        document_text, [ViolationType.MEDICAL_LAW.value]
-    )
-    legal_violations.extend(medical_check)
-    
-    # Rebate law check
-    rebate_check = rule_engine.check_violations(
-        document_text, [ViolationType.REBATE_LAW.value]
-    )
-    legal_violations.extend(rebate_check)
-    
-    # Fair trade check
-    fair_trade_check = rule_engine.check_violations(
-        document_text, [ViolationType.FAIR_TRADE.value]
-    )
-    legal_violations.extend(fair_trade_check)
-    
-    # Data privacy check
-    privacy_check = rule_engine.check_violations(
-        document_text, [ViolationType.DATA_PRIVACY.value]
+    # 1차 검증 (법률) + 2차 검증 (회사 내규) in one scan, legal types first
+    all_violations = rule_engine.check_violations(
+        document_text, _LEGAL_RULE_TYPES + [ViolationType.INTERNAL_POLICY.value]
     )
-    legal_violations.extend(privacy_check)
-    
-    # 2차 검증: 회사 내규 체크
-    policy_violations = rule_engine.check_violations(
-        document_text, [ViolationType.INTERNAL_POLICY.value]
-    )
-    
-    # Combine all violations
-    all_violations = legal_violations + policy_violations
+    legal_violations = [
+        v for v in all_violations if v["violation_type"] != ViolationType.INTERNAL_POLICY.value
+    ]
+    policy_violations = all_violations[len(legal_violations):]
     
     # Generate suggestions
     suggestions = []
@@ -483,18 +647,22 @@ def perform_full_compliance_check(document_id: str, document_text: str, document
         }
     }
     
-    # Save to database
-    validation_id = validation_db.save_validation_result(validation_result)
+    return validation_result
+
+
+def _finish_full_check(validation_result: Dict, validation_id: str) -> Dict:
+    """Attach the saved validation id and the compliance status to a result"""
     validation_result["validation_id"] = validation_id
+    levels = {v.get("level") for v in validation_result["violations"]}
     
     # Calculate compliance status
-    if len(critical_violations) > 0:
+    if "critical" in levels:
         validation_result["compliance_status"] = "FAILED"
         validation_result["action_required"] = "REVISION_REQUIRED"
-    elif len(high_violations) > 0:
+    elif "high" in levels:
         validation_result["compliance_status"] = "CONDITIONAL"
         validation_result["action_required"] = "APPROVAL_REQUIRED"
-    elif len(all_violations) > 0:
+    elif validation_result["violations"]:
         validation_result["compliance_status"] = "PASSED_WITH_WARNINGS"
         validation_result["action_required"] = "REVIEW_RECOMMENDED"
     else:
@@ -502,7 +670,68 @@ def perform_full_compliance_check(document_id: str, document_text: str, document
         validation_result["action_required"] = "NONE"
     
     logger.info(f"Compliance check completed: {validation_result['compliance_status']}")
-    return json.dumps(validation_result, ensure_ascii=False)
+    return validation_result
+
+
+@tool
+def perform_full_compliance_check(document_id: str, document_text: str, document_type: str = "general") -> str:
+    """
+    Perform comprehensive compliance check (1차 법률 + 2차 내규)
+    
+    Args:
+        document_id: Document identifier
+        document_text: Full document text to validate
+        document_type: Type of document (proposal, contract, report, etc.)
+    """
+    validation_result = _full_check_result(document_id, document_text, document_type)
+    
+    # Save to database
+    validation_id = validation_db.save_validation_result(validation_result)
+    
+    return _dumps(_finish_full_check(validation_result, validation_id))
+
+
+@tool
+def batch_compliance_check(documents: List[Dict]) -> str:
+    """
+    Perform the full compliance check on a batch of documents (일괄 검증)
+    Documents are scanned in parallel and saved in one transaction
+    
+    Args:
+        documents: List of {"document_id", "document_text", "document_type"} dicts
+                   (document_type defaults to "general")
+    """
+    logger.info(f"Starting batch compliance check for {len(documents)} documents")
+    if not documents:
+        return _dumps({"count": 0, "results": []})
+    
+    # RuleEngine is read-only after __init__ and the RE2 scan releases the GIL
+    def check(document: Dict) -> Dict:
+        return _full_check_result(
+            document.get("document_id", "UNKNOWN"),
+            document.get("document_text", ""),
+            document.get("document_type", "general")
+        )
+    
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(documents), os.cpu_count() or 1)) as executor:
+            validation_results = list(executor.map(check, documents))
+        
+        validation_ids = validation_db.save_validation_batch(validation_results)
+        results = [
+            _finish_full_check(validation_result, validation_id)
+            for validation_result, validation_id in zip(validation_results, validation_ids)
+        ]
+        
+        return _dumps({"count": len(results), "results": results})
+        
+    except Exception as e:
+        logger.error(f"Error in batch compliance check: {str(e)}")
+        return _dumps({
+            "error": str(e),
+            "count": 0,
+            "results": []
+        })
 
 
 @tool
@@ -576,7 +805,7 @@ def generate_compliance_suggestions(violations: List[Dict]) -> str:
         "estimated_revision_time": f"{len(violations) * 15} minutes"
     }
     
-    return json.dumps(suggestions, ensure_ascii=False)
+    return _dumps(suggestions)
 
 
 @tool
@@ -598,15 +827,15 @@ def save_validation_results(validation_data: Dict) -> str:
         }
         
         logger.info(f"Validation results saved: {validation_id}")
-        return json.dumps(result, ensure_ascii=False)
+        return _dumps(result)
         
     except Exception as e:
         logger.error(f"Error saving validation results: {str(e)}")
-        return json.dumps({
+        return _dumps({
             "success": False,
             "error": str(e),
             "message": "Failed to save validation results"
-        }, ensure_ascii=False)
+        })
 
 
 @tool
@@ -621,10 +850,12 @@ def query_validation_history(document_id: str = None, status: str = None,
         date_from: Start date for filtering
         date_to: End date for filtering
     """
-    conn = sqlite3.connect(validation_db.db_path)
-    cursor = conn.cursor()
-    
-    query = "SELECT * FROM validation_results WHERE 1=1"
+    # Summary columns only; the violations/suggestions JSON stays on disk
+    query = """
+        SELECT validation_id, document_id, document_type, validation_date,
+               total_violations, compliance_score, status
+        FROM validation_results WHERE 1=1
+    """
     params = []
     
     if document_id:
@@ -645,27 +876,15 @@ def query_validation_history(document_id: str = None, status: str = None,
     
     query += " ORDER BY validation_date DESC LIMIT 100"
     
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    
-    results = []
-    for row in rows:
-        results.append({
-            "validation_id": row[0],
-            "document_id": row[1],
-            "document_type": row[2],
-            "validation_date": row[3],
-            "total_violations": row[4],
-            "compliance_score": row[9],
-            "status": row[10]
-        })
+    with validation_db.read_connection() as conn:
+        rows = conn.execute(query, params).fetchall()
     
-    conn.close()
+    results = [dict(row) for row in rows]
     
-    return json.dumps({
+    return _dumps({
         "count": len(results),
         "results": results
-    }, ensure_ascii=False)
+    })
 
 
 @tool
@@ -676,59 +895,61 @@ def get_compliance_report(validation_id: str) -> str:
     Args:
         validation_id: Validation ID to retrieve
     """
-    conn = sqlite3.connect(validation_db.db_path)
-    cursor = conn.cursor()
-    
-    # Get main validation result
-    cursor.execute(
-        "SELECT * FROM validation_results WHERE validation_id = ?",
-        (validation_id,)
-    )
-    main_result = cursor.fetchone()
-    
-    if not main_result:
-        return json.dumps({
-            "error": "Validation not found",
-            "validation_id": validation_id
-        }, ensure_ascii=False)
-    
-    # Get violation details
-    cursor.execute(
-        "SELECT * FROM violation_details WHERE validation_id = ?",
-        (validation_id,)
-    )
-    violations = cursor.fetchall()
-    
-    conn.close()
+    with validation_db.read_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Get main validation result
+        cursor.execute("""
+            SELECT validation_id, document_id, document_type, validation_date,
+                   compliance_score, status, total_violations, critical_count,
+                   high_count, medium_count, low_count, suggestions
+            FROM validation_results WHERE validation_id = ?
+        """, (validation_id,))
+        main_result = cursor.fetchone()
+        
+        if not main_result:
+            return _dumps({
+                "error": "Validation not found",
+                "validation_id": validation_id
+            })
+        
+        # Get violation details
+        cursor.execute("""
+            SELECT rule_id, rule_name, violation_type, level, description,
+                   suggestion, matched_text
+            FROM violation_details WHERE validation_id = ?
+            ORDER BY id
+        """, (validation_id,))
+        violations = cursor.fetchall()
     
     # Format report
     report = {
-        "validation_id": main_result[0],
-        "document_id": main_result[1],
-        "document_type": main_result[2],
-        "validation_date": main_result[3],
-        "compliance_score": main_result[9],
-        "status": main_result[10],
+        "validation_id": main_result["validation_id"],
+        "document_id": main_result["document_id"],
+        "document_type": main_result["document_type"],
+        "validation_date": main_result["validation_date"],
+        "compliance_score": main_result["compliance_score"],
+        "status": main_result["status"],
         "summary": {
-            "total_violations": main_result[4],
-            "critical": main_result[5],
-            "high": main_result[6],
-            "medium": main_result[7],
-            "low": main_result[8]
+            "total_violations": main_result["total_violations"],
+            "critical": main_result["critical_count"],
+            "high": main_result["high_count"],
+            "medium": main_result["medium_count"],
+            "low": main_result["low_count"]
         },
         "violations": [],
-        "suggestions": json.loads(main_result[12]) if main_result[12] else []
+        "suggestions": orjson.loads(main_result["suggestions"]) if main_result["suggestions"] else []
     }
     
     for violation in violations:
         report["violations"].append({
-            "rule_id": violation[2],
-            "rule_name": violation[3],
-            "type": violation[4],
-            "level": violation[5],
-            "description": violation[6],
-            "suggestion": violation[7],
-            "matched_text": json.loads(violation[8]) if violation[8] else []
+            "rule_id": violation["rule_id"],
+            "rule_name": violation["rule_name"],
+            "type": violation["violation_type"],
+            "level": violation["level"],
+            "description": violation["description"],
+            "suggestion": violation["suggestion"],
+            "matched_text": orjson.loads(violation["matched_text"]) if violation["matched_text"] else []
         })
     
-    return json.dumps(report, ensure_ascii=False)
\ No newline at end of file
+    return _dumps(report)
\ No newline at end of file
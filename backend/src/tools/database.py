@@ -10,10 +10,20 @@ import random
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from loguru import logger
 
 
+# Called after sample data is (re)seeded so read caches over the database
+# can drop what they hold
+_seed_listeners: List[Callable[[], None]] = []
+
+
+def on_seed(callback: Callable[[], None]) -> None:
+    """Register a callback to run whenever the sample data is seeded"""
+    _seed_listeners.append(callback)
+
+
 class MockDatabase:
     """Mock database with SQLite backend"""
     
@@ -253,6 +263,9 @@ class MockDatabase:
         
         self.conn.commit()
         logger.info("Database seeded with sample data")
+        
+        for callback in _seed_listeners:
+            callback()
     
     def query(self, sql: str, params: tuple = None) -> pd.DataFrame:
         """Execute SQL query and return DataFrame"""
@@ -0,0 +1,156 @@
+"""
+Snapshot cache over the mock database for the analytics tools
+Each query result is read once per TTL window and shared between tool calls;
+tables the tools reduce over are also exposed as read-only column arrays
+(one NumPy array per column) so KPI math skips pandas dispatch
+"""
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+from .database import MockDatabase
+
+
+# Column name -> NumPy array; categorical columns also carry
+# "<name>_codes" (int codes) and "<name>_labels" (code -> label)
+Columns = Dict[str, np.ndarray]
+
+SNAPSHOT_TTL = 300.0
+
+
+def to_columns(df: pd.DataFrame, categorical: Iterable[str] = ()) -> Columns:
+    """Convert a DataFrame into read-only column arrays, factorizing categorical columns"""
+    columns = {name: df[name].to_numpy() for name in df.columns}
+    for name in categorical:
+        codes, labels = pd.factorize(df[name], sort=True)
+        columns[f"{name}_codes"] = codes
+        columns[f"{name}_labels"] = np.asarray(labels, dtype=object)
+    for array in columns.values():
+        array.flags.writeable = False
+    return columns
+
+
+def _row_count(value: Any) -> int:
+    """
+    Rows in a snapshot: a frame's length, the length of column arrays (their
+    first entry is always a table column), or the size of a summary dict
+    """
+    if isinstance(value, dict) and value:
+        first = next(iter(value.values()))
+        if isinstance(first, np.ndarray):
+            return len(first)
+    return len(value)
+
+
+class TableCache:
+    """
+    TTL-memoized reads of MockDatabase queries
+    Cached frames and column arrays are shared by every caller and must be
+    treated as read-only; empty results are not cached so failed reads retry
+    """
+
+    def __init__(self, db: Union[MockDatabase, Callable[[], MockDatabase]], ttl: float = SNAPSHOT_TTL):
+        # A zero-argument factory defers opening the database to the first read
+        self._connect = db if callable(db) else (lambda: db)
+        self.ttl = ttl
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def db(self) -> MockDatabase:
+        return self._connect()
+
+    def _memo(self, key: tuple, load: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        value = load()
+        if _row_count(value):
+            with self._lock:
+                self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every snapshot (e.g. after the database is reseeded)"""
+        with self._lock:
+            self._entries.clear()
+
+    # ===== Query snapshots (same signatures as MockDatabase) =====
+
+    def get_employee_performance(self, employee_id: Optional[str] = None) -> pd.DataFrame:
+        return self._memo(
+            ("employee_performance", employee_id),
+            lambda: self.db.get_employee_performance(employee_id)
+        )
+
+    def get_customer_trends(self, customer_id: Optional[str] = None, months: int = 12) -> pd.DataFrame:
+        return self._memo(
+            ("customer_trends", customer_id, months),
+            lambda: self.db.get_customer_trends(customer_id, months=months)
+        )
+
+    def get_sales_summary(self, period_days: int = 30) -> Dict[str, Any]:
+        return self._memo(
+            ("sales_summary", period_days),
+            lambda: self.db.get_sales_summary(period_days)
+        )
+
+    def get_top_performers(self, limit: int = 5) -> pd.DataFrame:
+        return self._memo(
+            ("top_performers", limit),
+            lambda: self.db.get_top_performers(limit=limit)
+        )
+
+    def get_product_performance(self) -> pd.DataFrame:
+        return self._memo(("product_performance",), self.db.get_product_performance)
+
+    def get_market_analysis(self, segment: Optional[str] = None) -> pd.DataFrame:
+        return self._memo(
+            ("market_analysis", segment),
+            lambda: self.db.get_market_analysis(segment)
+        )
+
+    # ===== Column snapshots =====
+
+    def employees(self) -> Columns:
+        """All employees by performance_score descending, department factorized"""
+        return self._memo(
+            ("employees_columns",),
+            lambda: to_columns(self.get_employee_performance(), categorical=("department",))
+        )
+
+    def customer_trends(self, customer_id: Optional[str] = None, months: int = 12) -> Columns:
+        """
+        Customer trend rows sorted by trend_date ascending, trend_date as
+        datetime64 and customer_id/customer_name/risk_level factorized; date
+        ranges are searchsorted
+        """
+        def load() -> Columns:
+            df = self.get_customer_trends(customer_id, months=months)
+            df = df.assign(trend_date=pd.to_datetime(df["trend_date"]))
+            df = df.sort_values("trend_date", kind="stable")
+            return to_columns(df, categorical=("customer_id", "customer_name", "risk_level"))
+        return self._memo(("customer_trends_columns", customer_id, months), load)
+
+    def products(self) -> Columns:
+        """All products by revenue descending"""
+        return self._memo(
+            ("products_columns",),
+            lambda: to_columns(self.get_product_performance())
+        )
+
+    def market(self) -> Columns:
+        """
+        All market analysis rows in query order (newest first), analysis_date
+        as datetime64 and threat_level factorized
+        """
+        def load() -> Columns:
+            df = self.get_market_analysis()
+            df = df.assign(analysis_date=pd.to_datetime(df["analysis_date"]))
+            return to_columns(df, categorical=("threat_level",))
+        return self._memo(("market_columns",), load)
@@ -2,16 +2,31 @@
 Mock Database API for development and testing
 Simulates database operations without actual DB connection
 """
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple, Callable
 from datetime import datetime, timedelta
+from collections import OrderedDict, defaultdict
+from array import array
+from itertools import count, islice
+import base64
+import bisect
+import functools
+import time
 import json
-import uuid
+import os
+import orjson
 from loguru import logger
+import numpy as np
 import random
 
-router = APIRouter()
+# Endpoints return ORJSONResponse with the stored dicts directly, which skips
+# response_model validation; response_model is kept for the OpenAPI docs.
+# Handlers stay `async def` even without awaits: FastAPI runs those inline on
+# the event loop, whereas plain `def` handlers are dispatched to the threadpool
+# and would race on the unlocked indexes below.
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # In-memory mock database
 mock_database = {
@@ -23,8 +38,362 @@ mock_database = {
     "compliance_records": {}
 }
 
+# Row counters maintained by _store/_delete so /stats is a plain copy
+record_counts: Dict[str, int] = {**dict.fromkeys(mock_database, 0), "total_records": 0}
+
+# Id lists for tables we sample from, so rng.sample/choices need no list(keys)
+# copy; positions make removal an O(1) swap with the last element
+id_lists: Dict[str, List[str]] = {"customers": [], "products": []}
+_id_positions: Dict[str, Dict[str, int]] = {table: {} for table in id_lists}
+
+
+def _track_id(table: str, record_id: str):
+    if table in id_lists:
+        _id_positions[table][record_id] = len(id_lists[table])
+        id_lists[table].append(record_id)
+
+
+def _untrack_id(table: str, record_id: str):
+    if table in id_lists:
+        ids, positions = id_lists[table], _id_positions[table]
+        position = positions.pop(record_id)
+        last = ids.pop()
+        if last != record_id:
+            ids[position] = last
+            positions[last] = position
+
+
+class SalesColumns:
+    """
+    Column-oriented copy of the sales fields used in aggregations.
+    Amounts and status codes live in typed arrays so sums run as one NumPy
+    pass instead of a Python loop over row dicts.
+    """
+    STATUS_CODES = {"pending": 0, "completed": 1, "cancelled": 2}
+    
+    def __init__(self):
+        self.positions: Dict[str, int] = {}
+        self.ids: List[str] = []
+        self.total_amount = array("d")
+        self.status = array("b")
+    
+    def upsert(self, record: Dict[str, Any]):
+        amount = float(record.get("total_amount") or 0)
+        status = self.STATUS_CODES.get(record.get("status"), -1)
+        position = self.positions.get(record["id"])
+        if position is None:
+            self.positions[record["id"]] = len(self.ids)
+            self.ids.append(record["id"])
+            self.total_amount.append(amount)
+            self.status.append(status)
+        else:
+            self.total_amount[position] = amount
+            self.status[position] = status
+    
+    def remove(self, record_id: str):
+        # Swap the last row into the freed slot to keep removal O(1)
+        position = self.positions.pop(record_id)
+        last_id = self.ids.pop()
+        last_amount, last_status = self.total_amount.pop(), self.status.pop()
+        if last_id != record_id:
+            self.ids[position] = last_id
+            self.total_amount[position] = last_amount
+            self.status[position] = last_status
+            self.positions[last_id] = position
+    
+    def clear(self):
+        self.positions.clear()
+        self.ids.clear()
+        del self.total_amount[:]
+        del self.status[:]
+    
+    def revenue(self, status: str = "completed") -> float:
+        """Sum of total_amount over sales with the given status"""
+        amounts = np.frombuffer(self.total_amount, dtype=np.float64)
+        codes = np.frombuffer(self.status, dtype=np.int8)
+        total = float(amounts[codes == self.STATUS_CODES[status]].sum())
+        # Drop the buffer views so the arrays can grow again
+        del amounts, codes
+        return total
+
+
+sales_columns = SalesColumns()
+
+# Single RNG for all generated data; set MOCK_DB_SEED for reproducible runs
+rng = random.Random(os.getenv("MOCK_DB_SEED"))
+
+# Per-prefix id counters; cheaper than uuid4() and unique within the process
+_id_counters: Dict[str, Iterator[int]] = defaultdict(lambda: count(1))
+
+
+def next_id(prefix: str) -> str:
+    return f"{prefix}_{next(_id_counters[prefix]):08x}"
+
+
+# Secondary indexes: table -> field -> value -> ids. Buckets are dicts used as
+# ordered sets so filtered listings keep insertion order like the tables do.
+INDEXED_FIELDS = {
+    "customers": ("industry",),
+    "products": ("category",),
+    "sales": ("status", "customer_id"),
+    "analytics": ("type", "period"),
+    "documents": ("type",),
+    "compliance_records": ("status",)
+}
+# Fields filtered case-insensitively are indexed under their lowercased value
+CASE_INSENSITIVE_FIELDS = {("customers", "industry"), ("products", "category")}
+indexes: Dict[str, Dict[str, Dict[Any, Dict[str, None]]]] = {
+    table: {field: defaultdict(dict) for field in fields}
+    for table, fields in INDEXED_FIELDS.items()
+}
+
+# Keyset pagination: (sort value, id) keys kept sorted per paginated table
+SORT_FIELDS = {
+    "customers": "created_at",
+    "products": "created_at",
+    "sales": "sale_date",
+    "documents": "created_at"
+}
+sorted_keys: Dict[str, List[Tuple[str, str]]] = {table: [] for table in SORT_FIELDS}
+CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _sort_key(table: str, record: Dict[str, Any]) -> Tuple[str, str]:
+    value = record.get(SORT_FIELDS[table])
+    return (value.isoformat() if isinstance(value, datetime) else str(value or ""), record["id"])
+
+
+def _encode_cursor(key: Tuple[str, str]) -> str:
+    """Opaque cursor for a (sort value, id) key; ids may contain any character"""
+    return base64.urlsafe_b64encode(orjson.dumps(key)).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        key = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        key = None
+    if not (isinstance(key, list) and len(key) == 2 and all(isinstance(part, str) for part in key)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key[0], key[1]
+
+
+# In-process TTL cache for read-heavy GETs: namespace -> args key -> (expires_at, value).
+# Namespaces are table names; every write invalidates its table. Each namespace
+# is an LRU of at most `maxsize` entries, so distinct limit/offset/filter
+# combinations can't grow it between writes.
+_response_cache: Dict[str, "OrderedDict[Any, Tuple[float, Any]]"] = defaultdict(OrderedDict)
+
+
+def cached(namespace: str, expire: float, maxsize: int = 128) -> Callable:
+    """Cache an async endpoint's result per argument set for `expire` seconds"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            entries = _response_cache[namespace]
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            entry = entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    entries.move_to_end(key)
+                    return entry[1]
+                del entries[key]
+            value = await func(*args, **kwargs)
+            entries[key] = (now + expire, value)
+            while len(entries) > maxsize:
+                entries.popitem(last=False)
+            return value
+        return wrapper
+    return decorator
+
+
+def invalidate_cache(*namespaces: str):
+    for namespace in namespaces:
+        _response_cache.pop(namespace, None)
+
+
+def _index_key(table: str, field: str, value: Any) -> Any:
+    if (table, field) in CASE_INSENSITIVE_FIELDS and isinstance(value, str):
+        return value.lower()
+    return value
+
+
+def _index_record(table: str, record: Dict[str, Any]):
+    for field, index in indexes[table].items():
+        index[_index_key(table, field, record.get(field))][record["id"]] = None
+    if table in sorted_keys:
+        bisect.insort(sorted_keys[table], _sort_key(table, record))
+
+
+def _unindex_record(table: str, record: Dict[str, Any]):
+    for field, index in indexes[table].items():
+        value = _index_key(table, field, record.get(field))
+        bucket = index.get(value)
+        if bucket is not None:
+            bucket.pop(record["id"], None)
+            if not bucket:
+                del index[value]
+    if table in sorted_keys:
+        keys = sorted_keys[table]
+        key = _sort_key(table, record)
+        position = bisect.bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+
+def _store(table: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Insert or replace a record, keeping the secondary indexes in sync"""
+    previous = mock_database[table].get(record["id"])
+    if previous is not None:
+        _unindex_record(table, previous)
+    else:
+        record_counts[table] += 1
+        record_counts["total_records"] += 1
+        _track_id(table, record["id"])
+    mock_database[table][record["id"]] = record
+    _index_record(table, record)
+    if table == "sales":
+        sales_columns.upsert(record)
+    invalidate_cache(table)
+    return record
+
+
+def _delete(table: str, record_id: str):
+    _unindex_record(table, mock_database[table].pop(record_id))
+    _untrack_id(table, record_id)
+    if table == "sales":
+        sales_columns.remove(record_id)
+    record_counts[table] -= 1
+    record_counts["total_records"] -= 1
+    invalidate_cache(table)
+
+
+def _clear_tables():
+    for table in mock_database.values():
+        table.clear()
+    for table_indexes in indexes.values():
+        for index in table_indexes.values():
+            index.clear()
+    for keys in sorted_keys.values():
+        keys.clear()
+    for name in record_counts:
+        record_counts[name] = 0
+    for table in id_lists:
+        id_lists[table].clear()
+        _id_positions[table].clear()
+    sales_columns.clear()
+    _response_cache.clear()
+
+
+def _lookup(table: str, field: str, value: Any) -> Dict[str, None]:
+    """Ids whose field equals value, read from the index instead of scanning rows"""
+    return indexes[table][field].get(_index_key(table, field, value), {})
+
+
+def _filter_buckets(
+    table: str,
+    filters: Dict[str, Any]
+) -> Optional[List[Dict[str, None]]]:
+    """Index buckets for the active filters, smallest first (None when unfiltered)"""
+    active = [(field, value) for field, value in filters.items() if value]
+    if not active:
+        return None
+    return sorted((_lookup(table, field, value) for field, value in active), key=len)
+
+
+def _query(
+    table: str,
+    filters: Dict[str, Any],
+    offset: int = 0,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    List records matching equality filters (None values are ignored).
+    Every filter is resolved through its index; with several filters the
+    smallest bucket is walked and membership-tested against the others.
+    Pagination stops after offset + limit ids.
+    """
+    rows = mock_database[table]
+    buckets = _filter_buckets(table, filters)
+    if buckets is None:
+        ids: Iterable[str] = rows
+    elif len(buckets) == 1:
+        ids = buckets[0]
+    else:
+        smallest, others = buckets[0], buckets[1:]
+        ids = (i for i in smallest if all(i in bucket for bucket in others))
+    stop = None if limit is None else offset + limit
+    return [rows[i] for i in islice(ids, offset, stop)]
+
+
+def _query_page(
+    table: str,
+    filters: Dict[str, Any],
+    cursor: str,
+    limit: int
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Keyset variant of _query ordered by SORT_FIELDS[table] then id.
+    An empty cursor starts from the beginning; otherwise the scan resumes right
+    after the encoded key, so each page costs about limit + 1 matches.
+    Returns the page and the cursor for the next one (None on the last page).
+    """
+    keys = sorted_keys[table]
+    start = 0
+    if cursor:
+        start = bisect.bisect_right(keys, _decode_cursor(cursor))
+    
+    rows = mock_database[table]
+    buckets = _filter_buckets(table, filters)
+    candidates = None if buckets is None else set(buckets[0]).intersection(*buckets[1:])
+    
+    page: List[Tuple[str, str]] = []
+    for key in islice(keys, start, None):
+        if candidates is not None and key[1] not in candidates:
+            continue
+        page.append(key)
+        if len(page) > limit:
+            break
+    
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = _encode_cursor(page[-1])
+    return [rows[record_id] for _, record_id in page], next_cursor
+
+
+def _paginate(
+    table: str,
+    filters: Dict[str, Any],
+    offset: int,
+    limit: int,
+    cursor: Optional[str]
+) -> ORJSONResponse:
+    """Offset pagination by default; keyset pagination when a cursor is passed"""
+    if cursor is None:
+        return ORJSONResponse(_query(table, filters, offset, limit))
+    items, next_cursor = _query_page(table, filters, cursor, limit)
+    headers = {CURSOR_HEADER: next_cursor} if next_cursor else None
+    return ORJSONResponse(items, headers=headers)
+
+
+def _request_now(request: Request) -> datetime:
+    """Read the clock once per request; handlers and helpers share the value"""
+    now = getattr(request.state, "now", None)
+    if now is None:
+        now = request.state.now = datetime.now()
+    return now
+
+
 # Models
-class Customer(BaseModel):
+class MockRecord(BaseModel):
+    """Base for mock DB records: unknown fields are dropped, strings stripped,
+    and validators are only built on first use"""
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, defer_build=True)
+
+
+class Customer(MockRecord):
     id: Optional[str] = None
     name: str
     company: str
@@ -39,7 +408,7 @@ class Customer(BaseModel):
     metadata: Dict[str, Any] = {}
 
 
-class Product(BaseModel):
+class Product(MockRecord):
     id: Optional[str] = None
     name: str
     category: str
@@ -52,7 +421,7 @@ class Product(BaseModel):
     updated_at: Optional[datetime] = None
 
 
-class Sale(BaseModel):
+class Sale(MockRecord):
     id: Optional[str] = None
     customer_id: str
     product_id: str
@@ -64,7 +433,7 @@ class Sale(BaseModel):
     notes: Optional[str] = None
 
 
-class Analytics(BaseModel):
+class Analytics(MockRecord):
     id: Optional[str] = None
     type: str  # revenue, growth, conversion, etc.
     period: str  # daily, weekly, monthly, quarterly
@@ -72,7 +441,7 @@ class Analytics(BaseModel):
     generated_at: Optional[datetime] = None
 
 
-class Document(BaseModel):
+class Document(MockRecord):
     id: Optional[str] = None
     type: str  # proposal, report, contract, etc.
     title: str
@@ -83,7 +452,7 @@ class Document(BaseModel):
     metadata: Dict[str, Any] = {}
 
 
-class ComplianceRecord(BaseModel):
+class ComplianceRecord(MockRecord):
     id: Optional[str] = None
     type: str  # privacy, regulatory, contract, etc.
     status: str  # compliant, non_compliant, review_required
@@ -138,11 +507,13 @@ def initialize_mock_data():
         }
     ]
     
-    for customer_data in sample_customers:
+    now = datetime.now()
+    customer_ages = rng.choices(range(30, 366), k=len(sample_customers))
+    for customer_data, age_days in zip(sample_customers, customer_ages):
         customer = Customer(**customer_data)
-        customer.created_at = datetime.now() - timedelta(days=random.randint(30, 365))
-        customer.updated_at = datetime.now()
-        mock_database["customers"][customer.id] = customer.dict()
+        customer.created_at = now - timedelta(days=age_days)
+        customer.updated_at = now
+        _store("customers", customer.model_dump(mode="json"))
     
     # Sample products
     sample_products = [
@@ -175,25 +546,35 @@ def initialize_mock_data():
         }
     ]
     
-    for product_data in sample_products:
+    product_ages = rng.choices(range(60, 181), k=len(sample_products))
+    for product_data, age_days in zip(sample_products, product_ages):
         product = Product(**product_data)
-        product.created_at = datetime.now() - timedelta(days=random.randint(60, 180))
-        product.updated_at = datetime.now()
-        mock_database["products"][product.id] = product.dict()
-    
-    # Sample sales
-    for i in range(10):
+        product.created_at = now - timedelta(days=age_days)
+        product.updated_at = now
+        _store("products", product.model_dump(mode="json"))
+    
+    # Sample sales, generated column by column with one RNG call per field
+    sale_count = 10
+    sale_columns = zip(
+        rng.choices(id_lists["customers"], k=sale_count),
+        rng.choices(id_lists["products"], k=sale_count),
+        rng.choices(range(1, 11), k=sale_count),
+        rng.choices(range(1000000, 50000001), k=sale_count),
+        rng.choices(["completed", "pending", "completed"], k=sale_count),
+        rng.choices(range(1, 91), k=sale_count)
+    )
+    for i, (customer_id, product_id, quantity, amount, status, age_days) in enumerate(sale_columns):
         sale = Sale(
             id=f"sale_{str(i+1).zfill(3)}",
-            customer_id=random.choice(list(mock_database["customers"].keys())),
-            product_id=random.choice(list(mock_database["products"].keys())),
-            quantity=random.randint(1, 10),
-            total_amount=random.randint(1000000, 50000000),
-            status=random.choice(["completed", "pending", "completed"]),
-            sale_date=datetime.now() - timedelta(days=random.randint(1, 90)),
+            customer_id=customer_id,
+            product_id=product_id,
+            quantity=quantity,
+            total_amount=amount,
+            status=status,
+            sale_date=now - timedelta(days=age_days),
             notes=f"Sale transaction {i+1}"
         )
-        mock_database["sales"][sale.id] = sale.dict()
+        _store("sales", sale.model_dump(mode="json"))
     
     # Sample analytics
     analytics_data = Analytics(
@@ -206,9 +587,9 @@ def initialize_mock_data():
             "top_products": ["prod_001", "prod_002"],
             "conversion_rate": 3.5
         },
-        generated_at=datetime.now()
+        generated_at=now
     )
-    mock_database["analytics"][analytics_data.id] = analytics_data.dict()
+    _store("analytics", analytics_data.model_dump(mode="json"))
     
     logger.info("Mock database initialized with sample data")
 
@@ -222,19 +603,12 @@ initialize_mock_data()
 async def get_customers(
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    industry: Optional[str] = None
+    industry: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Keyset cursor; empty string for the first page")
 ):
     """Get list of customers with pagination"""
-    customers = list(mock_database["customers"].values())
-    
-    # Filter by industry if provided
-    if industry:
-        customers = [c for c in customers if c.get("industry", "").lower() == industry.lower()]
-    
-    # Apply pagination
-    paginated = customers[offset:offset + limit]
-    
-    return paginated
+    # Industry filter is case-insensitive (see CASE_INSENSITIVE_FIELDS)
+    return _paginate("customers", {"industry": industry}, offset, limit, cursor)
 
 
 @router.get("/customers/{customer_id}", response_model=Customer)
@@ -243,40 +617,47 @@ async def get_customer(customer_id: str):
     if customer_id not in mock_database["customers"]:
         raise HTTPException(status_code=404, detail="Customer not found")
     
-    return mock_database["customers"][customer_id]
+    return ORJSONResponse(mock_database["customers"][customer_id])
 
 
-@router.post("/customers", response_model=Customer)
-async def create_customer(customer: Customer):
-    """Create new customer"""
+def _insert_customer(customer: Customer, now: datetime) -> Dict[str, Any]:
+    """Assign id and timestamps, then store; shared by POST /customers and /seed"""
     if not customer.id:
-        customer.id = f"cust_{uuid.uuid4().hex[:8]}"
+        customer.id = next_id("cust")
     
-    customer.created_at = datetime.now()
-    customer.updated_at = datetime.now()
+    customer.created_at = now
+    customer.updated_at = now
     
-    mock_database["customers"][customer.id] = customer.dict()
+    # Dump once to JSON-ready primitives; the stored dict is also the response body
+    return _store("customers", customer.model_dump(mode="json"))
+
+
+@router.post("/customers", response_model=Customer)
+async def create_customer(customer: Customer, now: datetime = Depends(_request_now)):
+    """Create new customer"""
+    stored = _insert_customer(customer, now)
     logger.info(f"Created customer: {customer.id}")
     
-    return customer
+    return ORJSONResponse(stored)
 
 
 @router.put("/customers/{customer_id}", response_model=Customer)
-async def update_customer(customer_id: str, customer: Customer):
+async def update_customer(customer_id: str, customer: Customer, now: datetime = Depends(_request_now)):
     """Update existing customer"""
     if customer_id not in mock_database["customers"]:
         raise HTTPException(status_code=404, detail="Customer not found")
     
     customer.id = customer_id
-    customer.updated_at = datetime.now()
+    customer.updated_at = now
     
+    stored = customer.model_dump(mode="json")
     # Preserve created_at
-    customer.created_at = mock_database["customers"][customer_id].get("created_at")
+    stored["created_at"] = mock_database["customers"][customer_id].get("created_at")
     
-    mock_database["customers"][customer_id] = customer.dict()
+    _store("customers", stored)
     logger.info(f"Updated customer: {customer_id}")
     
-    return customer
+    return ORJSONResponse(stored)
 
 
 @router.delete("/customers/{customer_id}")
@@ -285,7 +666,7 @@ async def delete_customer(customer_id: str):
     if customer_id not in mock_database["customers"]:
         raise HTTPException(status_code=404, detail="Customer not found")
     
-    del mock_database["customers"][customer_id]
+    _delete("customers", customer_id)
     logger.info(f"Deleted customer: {customer_id}")
     
     return {"message": "Customer deleted successfully"}
@@ -293,22 +674,16 @@ async def delete_customer(customer_id: str):
 
 # Product endpoints
 @router.get("/products", response_model=List[Product])
+@cached("products", expire=5)
 async def get_products(
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Keyset cursor; empty string for the first page")
 ):
     """Get list of products with pagination"""
-    products = list(mock_database["products"].values())
-    
-    # Filter by category if provided
-    if category:
-        products = [p for p in products if p.get("category", "").lower() == category.lower()]
-    
-    # Apply pagination
-    paginated = products[offset:offset + limit]
-    
-    return paginated
+    # Category filter is case-insensitive (see CASE_INSENSITIVE_FIELDS)
+    return _paginate("products", {"category": category}, offset, limit, cursor)
 
 
 @router.get("/products/{product_id}", response_model=Product)
@@ -317,22 +692,22 @@ async def get_product(product_id: str):
     if product_id not in mock_database["products"]:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    return mock_database["products"][product_id]
+    return ORJSONResponse(mock_database["products"][product_id])
 
 
 @router.post("/products", response_model=Product)
-async def create_product(product: Product):
+async def create_product(product: Product, now: datetime = Depends(_request_now)):
     """Create new product"""
     if not product.id:
-        product.id = f"prod_{uuid.uuid4().hex[:8]}"
+        product.id = next_id("prod")
     
-    product.created_at = datetime.now()
-    product.updated_at = datetime.now()
+    product.created_at = now
+    product.updated_at = now
     
-    mock_database["products"][product.id] = product.dict()
+    stored = _store("products", product.model_dump(mode="json"))
     logger.info(f"Created product: {product.id}")
     
-    return product
+    return ORJSONResponse(stored)
 
 
 # Sales endpoints
@@ -341,21 +716,11 @@ async def get_sales(
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
     status: Optional[str] = None,
-    customer_id: Optional[str] = None
+    customer_id: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Keyset cursor; empty string for the first page")
 ):
     """Get list of sales with filters"""
-    sales = list(mock_database["sales"].values())
-    
-    # Apply filters
-    if status:
-        sales = [s for s in sales if s.get("status") == status]
-    if customer_id:
-        sales = [s for s in sales if s.get("customer_id") == customer_id]
-    
-    # Apply pagination
-    paginated = sales[offset:offset + limit]
-    
-    return paginated
+    return _paginate("sales", {"status": status, "customer_id": customer_id}, offset, limit, cursor)
 
 
 @router.get("/sales/{sale_id}", response_model=Sale)
@@ -364,64 +729,66 @@ async def get_sale(sale_id: str):
     if sale_id not in mock_database["sales"]:
         raise HTTPException(status_code=404, detail="Sale not found")
     
-    return mock_database["sales"][sale_id]
+    return ORJSONResponse(mock_database["sales"][sale_id])
 
 
-@router.post("/sales", response_model=Sale)
-async def create_sale(sale: Sale):
-    """Create new sale"""
+def _insert_sale(sale: Sale, now: datetime) -> Dict[str, Any]:
+    """Assign id and sale date, then store; shared by POST /sales and /seed"""
     if not sale.id:
-        sale.id = f"sale_{uuid.uuid4().hex[:8]}"
+        sale.id = next_id("sale")
     
     if not sale.sale_date:
-        sale.sale_date = datetime.now()
+        sale.sale_date = now
     
-    mock_database["sales"][sale.id] = sale.dict()
+    return _store("sales", sale.model_dump(mode="json"))
+
+
+@router.post("/sales", response_model=Sale)
+async def create_sale(sale: Sale, now: datetime = Depends(_request_now)):
+    """Create new sale"""
+    stored = _insert_sale(sale, now)
     logger.info(f"Created sale: {sale.id}")
     
-    return sale
+    return ORJSONResponse(stored)
 
 
 # Analytics endpoints
 @router.get("/analytics")
+@cached("analytics", expire=5)
 async def get_analytics(
     type: Optional[str] = None,
     period: Optional[str] = None
 ):
     """Get analytics data"""
-    analytics = list(mock_database["analytics"].values())
-    
-    # Apply filters
-    if type:
-        analytics = [a for a in analytics if a.get("type") == type]
-    if period:
-        analytics = [a for a in analytics if a.get("period") == period]
-    
-    return analytics
+    return ORJSONResponse(_query("analytics", {"type": type, "period": period}))
 
 
 @router.post("/analytics/generate")
-async def generate_analytics(type: str = "revenue", period: str = "monthly"):
+async def generate_analytics(
+    type: str = "revenue",
+    period: str = "monthly",
+    now: datetime = Depends(_request_now)
+):
     """Generate new analytics report"""
     analytics = Analytics(
-        id=f"analytics_{uuid.uuid4().hex[:8]}",
+        id=next_id("analytics"),
         type=type,
         period=period,
         metrics={
-            "total_revenue": random.randint(100000000, 500000000),
-            "growth_rate": round(random.uniform(5, 25), 1),
-            "conversion_rate": round(random.uniform(2, 5), 1),
-            "top_customers": random.sample(list(mock_database["customers"].keys()), 
-                                         min(3, len(mock_database["customers"]))),
-            "trend": random.choice(["increasing", "stable", "decreasing"])
+            # Real figure from the sales column store; the rest stays simulated
+            "total_revenue": sales_columns.revenue("completed"),
+            "growth_rate": round(rng.uniform(5, 25), 1),
+            "conversion_rate": round(rng.uniform(2, 5), 1),
+            "top_customers": rng.sample(id_lists["customers"], min(3, len(id_lists["customers"]))),
+            "trend": rng.choice(["increasing", "stable", "decreasing"])
         },
-        generated_at=datetime.now()
+        generated_at=now
     )
     
-    mock_database["analytics"][analytics.id] = analytics.dict()
+    stored = _store("analytics", analytics.model_dump(mode="json"))
     logger.info(f"Generated analytics: {analytics.id}")
     
-    return analytics
+    return ORJSONResponse(stored)
 
 
 # Document endpoints
@@ -429,33 +796,25 @@ async def generate_analytics(type: str = "revenue", period: str = "monthly"):
 async def get_documents(
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    type: Optional[str] = None
+    type: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Keyset cursor; empty string for the first page")
 ):
     """Get list of documents"""
-    documents = list(mock_database["documents"].values())
-    
-    # Filter by type if provided
-    if type:
-        documents = [d for d in documents if d.get("type") == type]
-    
-    # Apply pagination
-    paginated = documents[offset:offset + limit]
-    
-    return paginated
+    return _paginate("documents", {"type": type}, offset, limit, cursor)
 
 
 @router.post("/documents", response_model=Document)
-async def create_document(document: Document):
+async def create_document(document: Document, now: datetime = Depends(_request_now)):
     """Create new document"""
     if not document.id:
-        document.id = f"doc_{uuid.uuid4().hex[:8]}"
+        document.id = next_id("doc")
     
-    document.created_at = datetime.now()
+    document.created_at = now
     
-    mock_database["documents"][document.id] = document.dict()
+    stored = _store("documents", document.model_dump(mode="json"))
     logger.info(f"Created document: {document.id}")
     
-    return document
+    return ORJSONResponse(stored)
 
 
 # Compliance endpoints
@@ -464,31 +823,29 @@ async def get_compliance_records(
     status: Optional[str] = None
 ):
     """Get compliance records"""
-    records = list(mock_database["compliance_records"].values())
-    
-    # Filter by status if provided
-    if status:
-        records = [r for r in records if r.get("status") == status]
-    
-    return records
+    return ORJSONResponse(_query("compliance_records", {"status": status}))
 
 
 @router.post("/compliance/check")
-async def check_compliance(type: str = "privacy", data: Dict[str, Any] = {}):
+async def check_compliance(
+    type: str = "privacy",
+    data: Dict[str, Any] = {},
+    now: datetime = Depends(_request_now)
+):
     """Perform compliance check"""
     # Simulate compliance check
-    is_compliant = random.choice([True, True, False])  # 66% compliant
+    is_compliant = rng.choice([True, True, False])  # 66% compliant
     
     record = ComplianceRecord(
-        id=f"comp_{uuid.uuid4().hex[:8]}",
+        id=next_id("comp"),
         type=type,
         status="compliant" if is_compliant else "non_compliant",
         details={
             "checked_data": data,
             "rules_applied": ["PIPA", "GDPR", "Industry Standards"],
-            "score": random.randint(60, 100) if is_compliant else random.randint(30, 59)
+            "score": rng.randint(60, 100) if is_compliant else rng.randint(30, 59)
         },
-        checked_at=datetime.now(),
+        checked_at=now,
         recommendations=[] if is_compliant else [
             "Review data encryption policies",
             "Update privacy notice",
@@ -496,39 +853,24 @@ async def check_compliance(type: str = "privacy", data: Dict[str, Any] = {}):
         ]
     )
     
-    mock_database["compliance_records"][record.id] = record.dict()
+    stored = _store("compliance_records", record.model_dump(mode="json"))
     logger.info(f"Compliance check performed: {record.id}")
     
-    return record
+    return ORJSONResponse(stored)
 
 
 # Database management endpoints
 @router.get("/stats")
 async def get_database_stats():
     """Get mock database statistics"""
-    return {
-        "customers": len(mock_database["customers"]),
-        "products": len(mock_database["products"]),
-        "sales": len(mock_database["sales"]),
-        "analytics": len(mock_database["analytics"]),
-        "documents": len(mock_database["documents"]),
-        "compliance_records": len(mock_database["compliance_records"]),
-        "total_records": sum(len(table) for table in mock_database.values())
-    }
+    return dict(record_counts)
 
 
 @router.post("/reset")
 async def reset_database():
     """Reset mock database to initial state"""
-    global mock_database
-    mock_database = {
-        "customers": {},
-        "products": {},
-        "sales": {},
-        "analytics": {},
-        "documents": {},
-        "compliance_records": {}
-    }
+    # Clear in place so the indexes and any held references stay valid
+    _clear_tables()
     initialize_mock_data()
     
     logger.info("Mock database reset to initial state")
@@ -537,30 +879,48 @@ async def reset_database():
 
 
 @router.post("/seed")
-async def seed_additional_data(count: int = Query(5, ge=1, le=50)):
+async def seed_additional_data(
+    count: int = Query(5, ge=1, le=50),
+    now: datetime = Depends(_request_now)
+):
     """Seed additional random data"""
-    # Add random customers
-    for i in range(count):
-        customer = Customer(
-            name=f"Customer {uuid.uuid4().hex[:6]}",
-            company=f"Company {uuid.uuid4().hex[:6]}",
-            industry=random.choice(["Technology", "Healthcare", "Finance", "Manufacturing"]),
-            email=f"user_{uuid.uuid4().hex[:6]}@example.com",
-            tags=random.sample(["vip", "new", "enterprise", "sme"], random.randint(1, 3))
+    # Rows are generated here, so model_construct skips re-validating them and
+    # the insert helpers store them directly instead of going through the routes
+    # Add random customers; each field is drawn for the whole batch at once
+    customer_columns = zip(
+        rng.choices(["Technology", "Healthcare", "Finance", "Manufacturing"], k=count),
+        rng.choices(range(1, 4), k=count)
+    )
+    for industry, tag_count in customer_columns:
+        suffix = f"{rng.getrandbits(24):06x}"
+        customer = Customer.model_construct(
+            name=f"Customer {suffix}",
+            company=f"Company {suffix}",
+            industry=industry,
+            email=f"user_{suffix}@example.com",
+            tags=rng.sample(["vip", "new", "enterprise", "sme"], tag_count)
         )
-        await create_customer(customer)
+        _insert_customer(customer, now)
     
     # Add random sales
-    for i in range(count * 2):
-        if mock_database["customers"] and mock_database["products"]:
-            sale = Sale(
-                customer_id=random.choice(list(mock_database["customers"].keys())),
-                product_id=random.choice(list(mock_database["products"].keys())),
-                quantity=random.randint(1, 20),
-                total_amount=random.randint(500000, 10000000),
-                status=random.choice(["pending", "completed", "cancelled"])
+    if mock_database["customers"] and mock_database["products"]:
+        sale_count = count * 2
+        sale_columns = zip(
+            rng.choices(id_lists["customers"], k=sale_count),
+            rng.choices(id_lists["products"], k=sale_count),
+            rng.choices(range(1, 21), k=sale_count),
+            rng.choices(range(500000, 10000001), k=sale_count),
+            rng.choices(["pending", "completed", "cancelled"], k=sale_count)
+        )
+        for customer_id, product_id, quantity, amount, status in sale_columns:
+            sale = Sale.model_construct(
+                customer_id=customer_id,
+                product_id=product_id,
+                quantity=quantity,
+                total_amount=amount,
+                status=status
             )
-            await create_sale(sale)
+            _insert_sale(sale, now)
     
     stats = await get_database_stats()
     logger.info(f"Seeded additional data: {count} customers, {count*2} sales")
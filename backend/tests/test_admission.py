@@ -0,0 +1,88 @@
+"""
+Admission Control Tests
+Every graph entry point of the API shares the _ADMISSION semaphore
+"""
+import pytest
+import asyncio
+import importlib
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# src.api re-exports the FastAPI instance as `app`, shadowing the module
+api_app = importlib.import_module("src.api.app")
+
+
+class ConcurrencyGraph:
+    """Fake compiled graph recording how many runs overlap"""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+
+    async def _run(self):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.running -= 1
+
+    async def astream(self, state, config, **kwargs):
+        await self._run()
+        yield {"supervisor": {"current_agent": "supervisor"}}
+
+    async def astream_events(self, state, **kwargs):
+        await self._run()
+        yield {"event": "on_chain_end", "name": "supervisor", "data": {}}
+
+    async def ainvoke(self, state, config, **kwargs):
+        await self._run()
+        return {"messages": [], "progress": []}
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    fake = ConcurrencyGraph()
+    monkeypatch.setattr(api_app, "enhanced_graph", fake)
+    monkeypatch.setattr(api_app, "_ADMISSION", asyncio.Semaphore(1))
+    return fake
+
+
+async def _drain_sse(query: str):
+    return [event async for event in api_app.stream_graph_execution(query)]
+
+
+class TestAdmission:
+    """Graph runs beyond MAX_CONCURRENT_GRAPHS wait for a permit"""
+
+    @pytest.mark.asyncio
+    async def test_sse_streams_are_admitted(self, graph):
+        results = await asyncio.gather(*(_drain_sse(f"질문 {i}") for i in range(3)))
+
+        assert all('"complete"' in events[-1] for events in results)
+        assert graph.peak == 1
+
+    @pytest.mark.asyncio
+    async def test_websocket_handlers_are_admitted(self, graph, monkeypatch):
+        sent = []
+
+        async def send_json(data, client_id):
+            sent.append(data)
+            return True
+        monkeypatch.setattr(api_app.manager, "send_json", send_json)
+        monkeypatch.setitem(api_app.manager.active_connections, "c1", object())
+
+        message = {"input": "질문"}
+        await asyncio.gather(
+            api_app.handle_websocket_invoke(None, "c1", message),
+            api_app.handle_websocket_stream_events(None, "c1", message),
+            api_app.handle_websocket_stream_messages(None, "c1", message),
+            _drain_sse("질문")
+        )
+
+        assert not [frame for frame in sent if isinstance(frame, dict) and frame.get("type") == "error"]
+        assert graph.peak == 1
+
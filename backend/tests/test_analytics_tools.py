@@ -0,0 +1,213 @@
+"""
+Analytics Tools Cache Tests
+ToolResultCache, the cached_tool_result decorator and cache invalidation
+"""
+import pytest
+import json
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.tools import analytics_tools
+from src.tools.analytics_tools import ToolResultCache, cached_tool_result, predict_sales_trend
+from src.tools.database import MockDatabase
+from src.tools.db_cache import TableCache
+
+
+class FakeClock:
+    """Stands in for the time module inside analytics_tools"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(analytics_tools, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def tool_cache(monkeypatch):
+    """Fresh result cache for the decorated tools"""
+    cache = ToolResultCache(maxsize=8, ttl=60.0)
+    monkeypatch.setattr(analytics_tools, "_tool_cache", cache)
+    return cache
+
+
+class TestToolResultCache:
+    """ToolResultCache LRU + TTL behaviour"""
+
+    def test_hit(self, clock):
+        cache = ToolResultCache(maxsize=2, ttl=60.0)
+        cache.put(("tool",), "result")
+
+        assert cache.get(("tool",)) == "result"
+
+    def test_expiry(self, clock):
+        cache = ToolResultCache(maxsize=2, ttl=60.0)
+        cache.put(("tool",), "result")
+
+        clock.now += 59.0
+        assert cache.get(("tool",)) == "result"
+        clock.now += 2.0
+        assert cache.get(("tool",)) is None
+
+    def test_lru_eviction(self, clock):
+        cache = ToolResultCache(maxsize=2, ttl=60.0)
+        cache.put(("a",), "A")
+        cache.put(("b",), "B")
+        cache.get(("a",))  # "b" is now least recently used
+        cache.put(("c",), "C")
+
+        assert cache.get(("a",)) == "A"
+        assert cache.get(("b",)) is None
+        assert cache.get(("c",)) == "C"
+
+    def test_default_ttl_matches_snapshots(self):
+        from src.tools.db_cache import SNAPSHOT_TTL
+
+        assert ToolResultCache().ttl == SNAPSHOT_TTL
+
+
+class TestTableCache:
+    """Empty reads are not cached"""
+
+    class ProductsDB:
+        def __init__(self, frames):
+            self.frames = list(frames)
+            self.reads = 0
+
+        def get_product_performance(self):
+            self.reads += 1
+            return self.frames.pop(0)
+
+    EMPTY = pd.DataFrame({"product_id": [], "revenue": []})
+    FULL = pd.DataFrame({"product_id": ["prod_001"], "revenue": [100.0]})
+
+    def test_empty_column_snapshot_is_retried(self):
+        db = self.ProductsDB([self.EMPTY, self.EMPTY, self.FULL])
+        cache = TableCache(db)
+
+        assert len(cache.products()["product_id"]) == 0
+        assert len(cache.products()["product_id"]) == 0
+        assert len(cache.products()["product_id"]) == 1
+        assert len(cache.products()["product_id"]) == 1
+
+        # Every empty read went back to the database; the full one is cached
+        assert db.reads == 3
+
+    def test_non_empty_snapshot_is_cached(self):
+        db = self.ProductsDB([self.FULL])
+        cache = TableCache(db)
+
+        cache.products()
+        cache.products()
+        cache.get_product_performance()
+
+        assert db.reads == 1
+
+
+class TestCachedToolResult:
+    """cached_tool_result decorator"""
+
+    def test_repeated_call_is_served_from_cache(self, tool_cache):
+        calls = []
+
+        @cached_tool_result
+        def lookup(employee_id=None):
+            calls.append(employee_id)
+            return json.dumps({"employee_id": employee_id})
+
+        assert lookup("emp_001") == lookup("emp_001")
+        assert calls == ["emp_001"]
+
+    def test_defaults_share_a_key(self, tool_cache):
+        calls = []
+
+        @cached_tool_result
+        def lookup(employee_id=None, department=None):
+            calls.append((employee_id, department))
+            return "{}"
+
+        lookup()
+        lookup(employee_id=None)
+        lookup(None, department=None)
+
+        assert len(calls) == 1
+
+    def test_errors_are_not_cached(self, tool_cache):
+        calls = []
+
+        @cached_tool_result
+        def lookup():
+            calls.append(1)
+            return json.dumps({"error": "No data found"}, separators=(",", ":"))
+
+        lookup()
+        lookup()
+
+        assert len(calls) == 2
+
+    def test_cacheable_predicate(self, tool_cache):
+        calls = []
+
+        @cached_tool_result(cacheable=lambda arguments: arguments["seed"] is not None)
+        def forecast(seed=None):
+            calls.append(seed)
+            return "{}"
+
+        forecast()
+        forecast()
+        forecast(seed=7)
+        forecast(seed=7)
+
+        assert calls == [None, None, 7]
+
+    def test_unseeded_prediction_is_not_cached(self, tool_cache, monkeypatch):
+        class Trends:
+            def customer_trends(self, customer_id=None, months=12):
+                return {
+                    "trend_date": np.array(["2024-01-15", "2024-02-15", "2024-03-15", "2024-04-15"],
+                                           dtype="datetime64[ns]"),
+                    "monthly_revenue": np.array([100.0, 120.0, 130.0, 150.0])
+                }
+        monkeypatch.setattr(analytics_tools, "tables", Trends())
+
+        predict_sales_trend.invoke({"months_ahead": 3})
+        predict_sales_trend.invoke({"months_ahead": 3})
+        assert tool_cache.get(("predict_sales_trend", (("months_ahead", 3), ("seed", None)))) is None
+
+        seeded = predict_sales_trend.invoke({"months_ahead": 3, "seed": 1})
+        assert "predictions" in json.loads(seeded)
+        assert tool_cache.get(("predict_sales_trend", (("months_ahead", 3), ("seed", 1)))) == seeded
+
+
+class TestInvalidation:
+    """Caches are dropped when the sample data is seeded"""
+
+    def test_seeding_clears_caches(self, tool_cache, tmp_path):
+        analytics_tools.tables.get_product_performance()
+        tool_cache.put(("calculate_kpis", ()), "{}")
+
+        MockDatabase(str(tmp_path / "mock_sales.db")).close()
+
+        assert tool_cache.get(("calculate_kpis", ())) is None
+        assert not analytics_tools.tables._entries
+
+    def test_clear_caches(self, tool_cache):
+        analytics_tools.tables.get_product_performance()
+        tool_cache.put(("calculate_kpis", ()), "{}")
+
+        analytics_tools.clear_caches()
+
+        assert tool_cache.get(("calculate_kpis", ())) is None
+        assert not analytics_tools.tables._entries
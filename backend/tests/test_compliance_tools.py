@@ -0,0 +1,261 @@
+"""
+Compliance Tools Tests
+Batch checks and persistence against a temporary validation database
+"""
+import pytest
+import json
+import sqlite3
+import threading
+import types
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.tools import compliance_tools
+from src.tools.compliance_tools import (
+    RuleEngine,
+    ValidationDB,
+    ViolationType,
+    batch_compliance_check,
+    get_compliance_report
+)
+
+
+@pytest.fixture
+def validation_db(tmp_path, monkeypatch):
+    """Point the compliance tools at a fresh validation database"""
+    db = ValidationDB(str(tmp_path / "validation_results.db"))
+    monkeypatch.setattr(compliance_tools, "validation_db", db)
+    yield db
+    db.close()
+
+
+class TestBatchComplianceCheck:
+    """batch_compliance_check tool"""
+
+    def test_batch_with_shared_id_prefix(self, validation_db):
+        """Documents checked in the same second with a shared 8-char id prefix all save"""
+        documents = [
+            {"document_id": "DOC-2024-0001", "document_text": "의사에게 현금 리베이트를 제공합니다."},
+            {"document_id": "DOC-2024-0002", "document_text": "5년 이상 장기 계약을 체결합니다.", "document_type": "proposal"},
+            {"document_id": "DOC-2024-0003", "document_text": "고객 방문 결과 보고서입니다."}
+        ]
+
+        result = json.loads(batch_compliance_check.invoke({"documents": documents}))
+
+        assert "error" not in result
+        assert result["count"] == 3
+        validation_ids = [r["validation_id"] for r in result["results"]]
+        assert len(set(validation_ids)) == 3
+
+        statuses = [r["compliance_status"] for r in result["results"]]
+        assert statuses == ["FAILED", "PASSED_WITH_WARNINGS", "PASSED"]
+        assert result["results"][1]["document_type"] == "proposal"
+        assert result["results"][2]["document_type"] == "general"
+
+        for document, validation_id in zip(documents, validation_ids):
+            report = json.loads(get_compliance_report.invoke({"validation_id": validation_id}))
+            assert report["document_id"] == document["document_id"]
+
+    def test_batch_matches_single_check(self, validation_db):
+        """Each batch result carries the same violations as a single full check"""
+        text = "우리 제품은 암을 완치시킬 수 있으며 80% 할인을 제공합니다."
+        single = json.loads(compliance_tools.perform_full_compliance_check.invoke({
+            "document_id": "DOC-1", "document_text": text
+        }))
+        batch = json.loads(batch_compliance_check.invoke({
+            "documents": [{"document_id": "DOC-1", "document_text": text}]
+        }))
+
+        assert batch["results"][0]["violations"] == single["violations"]
+        assert batch["results"][0]["compliance_status"] == single["compliance_status"]
+
+    def test_empty_batch(self, validation_db):
+        """An empty batch returns no results"""
+        result = json.loads(batch_compliance_check.invoke({"documents": []}))
+
+        assert result == {"count": 0, "results": []}
+
+    def test_save_failure_returns_error_payload(self, validation_db, monkeypatch):
+        """A failed batch save is reported in the payload instead of raising"""
+        def fail(results):
+            raise sqlite3.IntegrityError("UNIQUE constraint failed: validation_results.validation_id")
+        monkeypatch.setattr(validation_db, "save_validation_batch", fail)
+
+        result = json.loads(batch_compliance_check.invoke({
+            "documents": [{"document_id": "DOC-1", "document_text": "리베이트"}]
+        }))
+
+        assert "UNIQUE constraint failed" in result["error"]
+        assert result["count"] == 0
+        assert result["results"] == []
+
+
+class TestValidationPersistence:
+    """save_validation_results / get_compliance_report round trip"""
+
+    def test_non_string_keys_are_saved(self, validation_db):
+        """Model-supplied dicts with int/float keys serialize like the stdlib json module"""
+        result = json.loads(compliance_tools.save_validation_results.invoke({
+            "validation_data": {
+                "document_id": "DOC-1",
+                "violations": [],
+                "suggestions": [],
+                "metadata": {1: "first page", 2.5: "appendix"}
+            }
+        }))
+
+        assert result["success"] is True
+        row = validation_db.conn.execute(
+            "SELECT metadata FROM validation_results WHERE validation_id = ?",
+            (result["validation_id"],)
+        ).fetchone()
+        assert json.loads(row[0]) == {"1": "first page", "2.5": "appendix"}
+
+    def test_suggestions_with_non_string_keys(self, validation_db):
+        """generate_compliance_suggestions echoes matched_text even when it is keyed by position"""
+        violations = [{
+            "rule_id": "REB001",
+            "rule_name": "부당한 경제적 이익 제공",
+            "violation_type": "rebate_law",
+            "level": "critical",
+            "suggestion": "정당한 할인이나 계약 조건으로 변경",
+            "matched_text": {12: "리베이트"}
+        }]
+
+        result = json.loads(compliance_tools.generate_compliance_suggestions.invoke({
+            "violations": violations
+        }))
+
+        assert result["revision_suggestions"][0]["original_issue"] == {"12": "리베이트"}
+
+
+# Hits and near misses for every rule, including mixed case, gaps at the .{0,40}
+# bound and several matches per rule
+ENGINE_PARITY_TEXTS = [
+    "우리 제품은 암을 완치시킬 수 있으며 80% 할인을 제공합니다.",
+    "fda승인 제품으로 임상 결과가 우수하고 FDA승인도 받았습니다.",
+    "처방 없이 진단과 투약이 가능합니다.",
+    "의사에게 현금 리베이트를 제공하고 금품을 무료로 제공합니다.",
+    "현금" + "가" * 40 + "지급",
+    "현금" + "가" * 41 + "지급",
+    "골프 접대와 식사 제공, 해외 여행 경비 지원",
+    "학회 참가비 지원 및 세미나 비용 부담, 교육 프로그램 지원",
+    "독점 공급 계약 후 거래를 거절하고 공급을 중단합니다.",
+    "경쟁사와 가격을 협의하여 담합합니다.",
+    "업계 최고, 유일한 1위 제품으로 효과 100% 보장",
+    "150% 할인 또는 50% 이상 추가 할인",
+    "5년 이상 장기 계약을 체결하고 전액 선납 또는 선불 결제",
+    "주민등록번호와 여권 번호, 운전면허 정보를 수집합니다.",
+    "고객 정보를 제3자에게 제공하고 데이터를 공유합니다.",
+    "고객 방문 결과 보고서입니다.",
+    ""
+]
+
+
+class TestRegexEngines:
+    """RE2 fast path and the stdlib fallback"""
+
+    def test_incompatible_re2_module_falls_back(self, monkeypatch):
+        """A top-level re2 module without google-re2's Options/Set API is not used"""
+        pyre2 = types.ModuleType("re2")
+        pyre2.compile = compliance_tools.re.compile
+        monkeypatch.setitem(sys.modules, "re2", pyre2)
+
+        assert compliance_tools._load_re2() is None
+
+    def test_re2_engine(self):
+        """With google-re2 installed the engine scans through prebuilt RE2 sets"""
+        if compliance_tools.re2 is None:
+            pytest.skip("google-re2 is not installed")
+
+        engine = RuleEngine()
+
+        assert engine._rule_set is not None
+        assert all(rule_set is not None for rule_set in engine._type_rule_sets.values())
+        violations = engine.check_violations("의사에게 현금 리베이트를 제공합니다.")
+        assert [v["rule_id"] for v in violations] == ["REB001"]
+
+    def test_re2_matches_stdlib_fallback(self, monkeypatch):
+        """Both engines report the same violations for the current rule set"""
+        if compliance_tools.re2 is None:
+            pytest.skip("google-re2 is not installed")
+
+        re2_engine = RuleEngine()
+        monkeypatch.setattr(compliance_tools, "re2", None)
+        stdlib_engine = RuleEngine()
+        assert stdlib_engine._rule_set is None
+
+        for text in ENGINE_PARITY_TEXTS:
+            assert re2_engine.check_violations(text) == stdlib_engine.check_violations(text), text
+            for rule_type in ViolationType:
+                assert (
+                    re2_engine.check_by_type(text, rule_type.value)
+                    == stdlib_engine.check_by_type(text, rule_type.value)
+                ), (text, rule_type)
+
+
+class TestLazyOpen:
+    """ValidationDB opens its file on first use"""
+
+    def test_constructing_does_not_touch_the_file(self, tmp_path, monkeypatch):
+        db_path = tmp_path / "nested" / "validation_results.db"
+        db = ValidationDB(str(db_path))
+        assert not db_path.parent.exists()
+
+        monkeypatch.setattr(compliance_tools, "validation_db", db)
+        result = json.loads(compliance_tools.query_validation_history.invoke({}))
+
+        assert result == {"count": 0, "results": []}
+        assert db_path.exists()
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        db.close()
+
+
+class TestReadConnections:
+    """Pooled read connections of ValidationDB"""
+
+    def test_worker_threads_do_not_leak_connections(self, validation_db, monkeypatch):
+        """Reads from many short-lived threads keep at most READ_POOL_SIZE readers open"""
+        opened = []
+        connect = sqlite3.connect
+
+        class TrackedConnection(sqlite3.Connection):
+            closed = False
+
+            def close(self):
+                self.closed = True
+                super().close()
+
+        def tracked_connect(*args, **kwargs):
+            conn = connect(*args, factory=TrackedConnection, **kwargs)
+            opened.append(conn)
+            return conn
+        monkeypatch.setattr(compliance_tools.sqlite3, "connect", tracked_connect)
+
+        saved = json.loads(compliance_tools.save_validation_results.invoke({
+            "validation_data": {"document_id": "DOC-1", "violations": [], "suggestions": []}
+        }))
+        barrier = threading.Barrier(8)
+
+        def read():
+            barrier.wait()
+            report = json.loads(get_compliance_report.invoke({"validation_id": saved["validation_id"]}))
+            assert report["document_id"] == "DOC-1"
+
+        for _ in range(5):
+            threads = [threading.Thread(target=read) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        # The write connection opens lazily, so it is among the tracked ones
+        still_open = [conn for conn in opened if not conn.closed and conn is not validation_db.conn]
+        assert opened
+        assert len(still_open) <= ValidationDB.READ_POOL_SIZE
+
+        validation_db.close()
+        assert all(conn.closed for conn in opened)
@@ -0,0 +1,93 @@
+"""
+WebSocket Connection Manager Tests
+Outbound queue backpressure and flushing with a fake socket
+"""
+import pytest
+import asyncio
+import importlib
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.api.app import EnhancedConnectionManager
+
+# src.api re-exports the FastAPI instance as `app`, shadowing the module
+api_app = importlib.import_module("src.api.app")
+
+
+class FakeWebSocket:
+    """Records sent frames; while `stalled` is set, send_text blocks"""
+
+    def __init__(self):
+        self.sent = []
+        self.stalled = False
+        self.resume = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        if self.stalled:
+            await self.resume.wait()
+        self.sent.append(message)
+
+
+class TestConnectionManager:
+    """EnhancedConnectionManager send path"""
+
+    @pytest.mark.asyncio
+    async def test_frames_are_sent_in_order_and_counted(self):
+        manager = EnhancedConnectionManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket, "c1")
+
+        for i in range(3):
+            assert await manager.send_message(f"frame-{i}", "c1")
+        metadata = manager.get_connection_info("c1")
+        assert metadata["message_count"] == 0  # queued, not yet sent
+
+        await manager.flush(manager.disconnect("c1"), "c1")
+
+        assert websocket.sent == ["frame-0", "frame-1", "frame-2"]
+        assert metadata["message_count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_stalled_client_is_dropped_when_queue_is_full(self, monkeypatch):
+        monkeypatch.setattr(api_app, "WS_QUEUE_SIZE", 2)
+        manager = EnhancedConnectionManager()
+        websocket = FakeWebSocket()
+        websocket.stalled = True
+        await manager.connect(websocket, "c1")
+        writer = manager.writers["c1"]
+
+        # The writer takes the first frame and blocks; two more fill the queue
+        assert await manager.send_message("frame-0", "c1")
+        await asyncio.sleep(0)
+        assert await manager.send_message("frame-1", "c1")
+        assert await manager.send_message("frame-2", "c1")
+
+        assert await manager.send_message("frame-3", "c1") is False
+        assert "c1" not in manager.active_connections
+        assert await manager.send_message("frame-4", "c1") is False
+
+        await asyncio.sleep(0)
+        assert writer.cancelled()
+        assert websocket.sent == []
+
+    @pytest.mark.asyncio
+    async def test_flush_gives_up_on_stalled_peer(self, monkeypatch):
+        monkeypatch.setattr(api_app, "WS_FLUSH_TIMEOUT", 0.05)
+        manager = EnhancedConnectionManager()
+        websocket = FakeWebSocket()
+        websocket.stalled = True
+        await manager.connect(websocket, "c1")
+        await manager.send_message("frame-0", "c1")
+
+        writer = manager.disconnect("c1")
+        await asyncio.wait_for(manager.flush(writer, "c1"), timeout=1)
+        await asyncio.sleep(0)
+
+        assert writer.cancelled()
+        assert websocket.sent == []
@@ -0,0 +1,358 @@
+"""
+Enhanced Graph Routing Tests
+Runs the compiled enhanced graph with the LLM-backed analysis nodes stubbed
+"""
+import pytest
+import asyncio
+import sys
+import os
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from langgraph.checkpoint.memory import MemorySaver
+from src.graph.enhanced_graph import (
+    BoundedMemorySaver,
+    _compile_enhanced_graph,
+    build_graph_input,
+    build_graph_config,
+    execute_enhanced_query,
+    get_execution_trace,
+    merge_agent_outputs,
+    parallel_agents_node
+)
+from src.state.enhanced_state import RESET_ROUTING_HISTORY, add_routing_history
+
+
+def _analyzer_stub(confidence: float):
+    """Query analyzer node returning a fixed intent confidence"""
+    def query_analyzer_agent(state):
+        return {"intent_confidence": confidence, "current_agent": "execution_planner"}
+    return query_analyzer_agent
+
+
+def _planner_stub(plan):
+    """Execution planner node returning a fixed plan"""
+    def execution_planner_agent(state):
+        return {"execution_plan": plan, "current_agent": "dynamic_router"}
+    return execution_planner_agent
+
+
+def _agent_stub(name: str):
+    """Agent node recording a successful result on its own copy of results"""
+    def agent(state):
+        return {
+            "results": {**state.get("results", {}), name: {"status": "success"}},
+            "progress": [{"agent": name}],
+            "current_agent": "dynamic_router"
+        }
+    return agent
+
+
+def _compile_with(confidence: float, plan, checkpointer=None):
+    """Compile a fresh enhanced graph with stubbed analyzer and planner nodes"""
+    with patch("src.agents.query_analyzer.query_analyzer_agent", _analyzer_stub(confidence)), \
+         patch("src.agents.execution_planner.execution_planner_agent", _planner_stub(plan)):
+        return _compile_enhanced_graph(checkpointer or MemorySaver())
+
+
+@pytest.fixture(autouse=True)
+def openai_key(monkeypatch):
+    """Agents build their ChatOpenAI client on entry; no request is sent in these runs"""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+
+class TestSupervisorRouting:
+    """Router -> supervisor hand-offs"""
+
+    def test_low_confidence_query_terminates(self):
+        """A low-confidence plan is handed to the supervisor once, which ends the run"""
+        graph = _compile_with(0.3, {"sequential_tasks": ["analytics"], "parallel_tasks": []})
+
+        result = graph.invoke(
+            build_graph_input("애매한 요청"),
+            {**build_graph_config(), "recursion_limit": 12}
+        )
+
+        assert result["is_complete"] is True
+        hand_offs = [r for r in result["routing_history"] if r["to_agent"] == "supervisor"]
+        assert len(hand_offs) == 1
+        assert "analytics" not in result.get("results", {})
+
+    def test_state_based_routing_clears_next_agent(self):
+        """The supervisor consumes a next_agent signal instead of replaying it"""
+        from src.agents.supervisor import supervisor_agent
+        from src.state.enhanced_state import create_initial_state
+
+        state = create_initial_state()
+        state["next_agent"] = "document"
+        state["current_agent"] = "supervisor"
+
+        update = supervisor_agent(state)
+
+        assert update["current_agent"] == "document"
+        assert update["next_agent"] is None
+
+    def test_supervisor_hand_back_is_not_a_route(self):
+        """next_agent == "supervisor" falls through instead of routing to itself"""
+        from src.agents.supervisor import supervisor_agent
+        from src.state.enhanced_state import create_initial_state
+        from langchain_core.messages import AIMessage
+
+        state = create_initial_state()
+        state["next_agent"] = "supervisor"
+        state["current_agent"] = "supervisor"
+        state["messages"] = [AIMessage(content="Routing to supervisor")]
+
+        update = supervisor_agent(state)
+
+        assert update["task_type"] == "end"
+        assert update["is_complete"] is True
+
+    def test_task_routes_cover_task_types(self):
+        """Each declared task type routes to a graph node"""
+        from src.agents.supervisor import TASK_TYPES, _TASK_ROUTES
+
+        assert set(_TASK_ROUTES) == set(TASK_TYPES)
+
+
+class TestRoutingHistory:
+    """routing_history holds the current turn's decisions only"""
+
+    def test_reducer_appends_and_resets(self):
+        first = add_routing_history([], [RESET_ROUTING_HISTORY])
+        assert first == []
+
+        entries = add_routing_history(first, [{"to_agent": "search"}])
+        entries = add_routing_history(entries, [{"to_agent": "analytics"}])
+        assert [e["to_agent"] for e in entries] == ["search", "analytics"]
+
+        assert add_routing_history(entries, [RESET_ROUTING_HISTORY, {"to_agent": "document"}]) == [
+            {"to_agent": "document"}
+        ]
+
+    def test_history_resets_between_turns(self):
+        """A second turn on the same thread does not carry the first turn's routing"""
+        graph = _compile_with(0.3, {"sequential_tasks": ["analytics"], "parallel_tasks": []})
+        config = {**build_graph_config(), "recursion_limit": 12}
+
+        first = graph.invoke(build_graph_input("첫 번째 요청"), config)
+        second = graph.invoke(build_graph_input("두 번째 요청"), config)
+
+        assert len(first["routing_history"]) == 1
+        assert len(second["routing_history"]) == 1
+
+        routing_trace = [t for t in get_execution_trace(second) if t["type"] == "routing"]
+        assert len(routing_trace) == 1
+
+
+class TestExecuteEnhancedQuery:
+    """execute_enhanced_query failure result"""
+
+    def test_failure_errors_are_strings(self):
+        """A failed run reports errors in the state's List[str] shape"""
+        class FailingGraph:
+            async def ainvoke(self, state, config, **kwargs):
+                raise TimeoutError("checkpointer busy")
+
+        result = asyncio.run(execute_enhanced_query(FailingGraph(), "질문"))
+
+        assert result["is_complete"] is False
+        assert result["errors"] == ["TimeoutError: checkpointer busy"]
+
+
+class TestExecutionTrace:
+    """get_execution_trace ordering"""
+
+    def test_trace_is_in_timestamp_order(self):
+        """A parallel group's progress is in group order; the trace is still chronological"""
+        state = {
+            "routing_history": [
+                {"timestamp": "2024-01-01T09:00:00", "from_agent": "dynamic_router",
+                 "to_agent": "parallel_agents", "reason": "Parallel group"},
+                {"timestamp": "2024-01-01T09:00:05", "from_agent": "dynamic_router",
+                 "to_agent": "END", "reason": "All tasks completed"}
+            ],
+            # document finished before analytics but is listed second
+            "progress": [
+                {"timestamp": "2024-01-01T09:00:04", "agent": "analytics", "action": "completed"},
+                {"timestamp": "2024-01-01T09:00:02", "agent": "document", "action": "completed"}
+            ]
+        }
+
+        trace = get_execution_trace(state)
+
+        timestamps = [entry["timestamp"] for entry in trace]
+        assert timestamps == sorted(timestamps)
+        assert [entry.get("agent", entry.get("to")) for entry in trace] == [
+            "parallel_agents", "document", "analytics", "END"
+        ]
+
+
+class TestMergeAgentOutputs:
+    """Merging the updates of a parallel group"""
+
+    def test_results_and_context_are_merged(self):
+        state = {"results": {"search": {"status": "success"}}, "context": {"query": "q"}}
+        outputs = [
+            {"results": {"search": {"status": "success"}, "analytics": {"score": 1}},
+             "context": {"analytics_ready": True}},
+            {"results": {"search": {"status": "success"}, "document": {"id": "DOC-1"}},
+             "context": {"document_ready": True}}
+        ]
+
+        merged = merge_agent_outputs(state, outputs)
+
+        assert merged["results"] == {
+            "search": {"status": "success"},
+            "analytics": {"score": 1},
+            "document": {"id": "DOC-1"}
+        }
+        assert merged["context"] == {"query": "q", "analytics_ready": True, "document_ready": True}
+        assert state["results"] == {"search": {"status": "success"}}
+
+    def test_new_errors_are_appended_once(self):
+        """Agents return the full error list; prior errors are not duplicated"""
+        state = {"errors": ["earlier failure"]}
+        outputs = [
+            {"errors": ["earlier failure", "analytics failed"]},
+            {"errors": ["earlier failure"]},
+            {"errors": ["earlier failure", "document failed"]}
+        ]
+
+        merged = merge_agent_outputs(state, outputs)
+
+        assert merged["errors"] == ["earlier failure", "analytics failed", "document failed"]
+
+    def test_messages_and_progress_are_concatenated(self):
+        outputs = [
+            {"messages": ["analytics done"], "progress": [{"agent": "analytics"}]},
+            {"messages": ["document done"], "progress": [{"agent": "document"}]},
+            {}
+        ]
+
+        merged = merge_agent_outputs({}, outputs)
+
+        assert merged["messages"] == ["analytics done", "document done"]
+        assert merged["progress"] == [{"agent": "analytics"}, {"agent": "document"}]
+
+    def test_other_keys_keep_last_value(self):
+        merged = merge_agent_outputs({}, [
+            {"current_agent": "dynamic_router", "task_type": "analytics"},
+            {"current_agent": "dynamic_router", "task_type": "document"}
+        ])
+
+        assert merged["current_agent"] == "dynamic_router"
+        assert merged["task_type"] == "document"
+
+
+class TestParallelAgents:
+    """parallel_agents node and its route from the dynamic router"""
+
+    PLAN = {"sequential_tasks": ["search"], "parallel_tasks": [["analytics", "document"]]}
+
+    def _node(self):
+        return parallel_agents_node({name: _agent_stub(name) for name in ("analytics", "document")})
+
+    def test_node_runs_pending_group(self):
+        state = {"execution_plan": self.PLAN, "results": {"search": {"status": "success"}}, "errors": []}
+
+        sync_update = self._node().invoke(state)
+        async_update = asyncio.run(self._node().ainvoke(state))
+
+        for update in (sync_update, async_update):
+            assert set(update["results"]) == {"search", "analytics", "document"}
+            assert update["progress"] == [{"agent": "analytics"}, {"agent": "document"}]
+
+    def test_node_skips_group_with_one_pending_agent(self):
+        state = {
+            "execution_plan": self.PLAN,
+            "results": {"search": {}, "analytics": {}},
+            "errors": []
+        }
+
+        assert self._node().invoke(state) == {}
+
+    def test_router_picks_parallel_agents_for_pending_group(self):
+        from src.agents.dynamic_router import DynamicRouter, route_from_dynamic_router
+
+        router = DynamicRouter()
+        state = {"intent_confidence": 0.9, "results": {"search": {"status": "success"}}, "errors": []}
+
+        next_agent, _ = router.determine_next_route(state, "search", self.PLAN)
+        assert next_agent == "parallel_agents"
+        assert route_from_dynamic_router({"next_agent": next_agent}) == "parallel_agents"
+
+        state["results"]["analytics"] = {"status": "success"}
+        next_agent, _ = router.determine_next_route(state, "analytics", self.PLAN)
+        assert next_agent == "document"
+
+    def test_graph_fans_out_parallel_group(self):
+        """The group runs in one parallel_agents step after the sequential task"""
+        with patch("src.agents.query_analyzer.query_analyzer_agent", _analyzer_stub(0.9)), \
+             patch("src.agents.execution_planner.execution_planner_agent", _planner_stub(self.PLAN)), \
+             patch("src.agents.search.search_agent", _agent_stub("search")), \
+             patch("src.agents.analytics.analytics_agent", _agent_stub("analytics")), \
+             patch("src.agents.document.document_agent", _agent_stub("document")):
+            graph = _compile_enhanced_graph(MemorySaver())
+
+        result = graph.invoke(
+            build_graph_input("검색 후 분석과 문서 작성"),
+            {**build_graph_config(), "recursion_limit": 20}
+        )
+
+        assert set(result["results"]) == {"search", "analytics", "document"}
+        assert [r["to_agent"] for r in result["routing_history"]] == ["search", "parallel_agents", "END"]
+        agents = [p["agent"] for p in result["progress"] if p["agent"] != "dynamic_router"]
+        assert agents == ["search", "analytics", "document"]
+
+
+class TestBoundedMemorySaver:
+    """Checkpoint trimming keeps the retained checkpoints loadable"""
+
+    PLAN = {"sequential_tasks": ["analytics"], "parallel_tasks": []}
+    QUERIES = ["첫 번째 요청", "두 번째 요청", "세 번째 요청", "네 번째 요청"]
+
+    def _run_turns(self, checkpointer):
+        graph = _compile_with(0.3, self.PLAN, checkpointer)
+        config = {**build_graph_config("bounded-thread"), "recursion_limit": 12}
+        for query in self.QUERIES:
+            graph.invoke(build_graph_input(query), config)
+        return graph, config
+
+    @staticmethod
+    def _summary(values):
+        return {
+            "messages": [m.content for m in values["messages"]],
+            "routing": [r["to_agent"] for r in values["routing_history"]],
+            "is_complete": values["is_complete"],
+            "task_type": values["task_type"]
+        }
+
+    def test_resume_after_trimming(self):
+        saver = BoundedMemorySaver(max_checkpoints=4)
+        graph, config = self._run_turns(saver)
+        reference_graph, reference_config = self._run_turns(MemorySaver())
+
+        # Every turn writes several checkpoints; only the newest 4 are kept
+        thread_id = config["configurable"]["thread_id"]
+        assert len(saver.storage[thread_id][""]) == 4
+        assert len(list(reference_graph.get_state_history(reference_config))) > 4
+        assert len(list(graph.get_state_history(config))) == 4
+
+        expected = self._summary(reference_graph.get_state(reference_config).values)
+        assert self._summary(graph.get_state(config).values) == expected
+        assert self._summary(asyncio.run(graph.aget_state(config)).values) == expected
+        assert len(expected["messages"]) >= len(self.QUERIES)
+
+        # Older checkpoints' blobs are dropped, but every retained one still loads
+        assert len(saver.blobs) < len(reference_graph.checkpointer.blobs)
+        for snapshot in graph.get_state_history(config):
+            assert snapshot.values["messages"]
+
+        # The thread keeps going from the trimmed history
+        result = graph.invoke(build_graph_input("다섯 번째 요청"), config)
+        assert result["messages"][-1].content
+        assert len(result["routing_history"]) == 1
+        assert len(saver.storage[thread_id][""]) == 4
@@ -45,9 +45,7 @@ class TestEnhancedGraph:
         query = "작년 대비 올해 매출 성장률을 분석해줘"
         
         config = {"configurable": {"thread_id": "test_analyzer"}}
-        initial_state = create_initial_state()
-        initial_state["messages"] = [HumanMessage(content=query)]
-        initial_state["raw_query"] = query
+        initial_state = create_initial_state(query=query, messages=[HumanMessage(content=query)])
         
         # Run only through query analyzer
         result = None
@@ -67,9 +65,7 @@ class TestEnhancedGraph:
         query = "고객사 A의 제품 정보를 찾고 매출 분석 보고서를 작성해줘"
         
         config = {"configurable": {"thread_id": "test_planner"}}
-        initial_state = create_initial_state()
-        initial_state["messages"] = [HumanMessage(content=query)]
-        initial_state["raw_query"] = query
+        initial_state = create_initial_state(query=query, messages=[HumanMessage(content=query)])
         
         # Run through query analyzer and execution planner
         planner_output = None
@@ -189,9 +185,7 @@ def run_basic_test():
         
         query = "안녕하세요"
         config = {"configurable": {"thread_id": "test_basic"}}
-        initial_state = create_initial_state()
-        initial_state["messages"] = [HumanMessage(content=query)]
-        initial_state["raw_query"] = query
+        initial_state = create_initial_state(query=query, messages=[HumanMessage(content=query)])
         
         # Use synchronous invoke instead of async
         try:
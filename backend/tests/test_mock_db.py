@@ -0,0 +1,198 @@
+"""
+Mock Database API Tests
+Keyset (cursor) pagination of the list endpoints
+"""
+import pytest
+import asyncio
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from tests import mock_db
+from tests.mock_db import CURSOR_HEADER
+
+
+BASE_TIME = datetime(2024, 1, 1, 9, 0, 0)
+
+
+@pytest.fixture
+def client():
+    """Client over empty mock tables; the seed data is restored afterwards"""
+    mock_db._clear_tables()
+    app = FastAPI()
+    app.include_router(mock_db.router)
+    yield TestClient(app)
+    mock_db._clear_tables()
+    mock_db.initialize_mock_data()
+
+
+def _customer(record_id: str, minutes: int, industry: str = "Technology"):
+    mock_db._store("customers", {
+        "id": record_id,
+        "name": record_id,
+        "company": "Test Co",
+        "industry": industry,
+        "email": f"{record_id}@example.com",
+        "created_at": BASE_TIME + timedelta(minutes=minutes)
+    })
+
+
+def _sale(record_id: str, minutes: int, customer_id: str, status: str):
+    mock_db._store("sales", {
+        "id": record_id,
+        "customer_id": customer_id,
+        "product_id": "prod_001",
+        "quantity": 1,
+        "unit_price": 100.0,
+        "total_amount": 100.0,
+        "status": status,
+        "sale_date": BASE_TIME + timedelta(minutes=minutes)
+    })
+
+
+def _pages(client, path: str, params: dict):
+    """Follow the cursor header from the first page to the last"""
+    pages = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get(path, params={**params, "cursor": cursor})
+        assert response.status_code == 200
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get(CURSOR_HEADER)
+    return pages
+
+
+class TestKeysetPagination:
+    """Cursor pages of the list endpoints"""
+
+    def test_first_next_and_last_page(self, client):
+        for minutes, record_id in enumerate(["c1", "c2", "c3", "c4", "c5"]):
+            _customer(record_id, minutes)
+
+        first = client.get("/customers", params={"cursor": "", "limit": 2})
+        assert [item["id"] for item in first.json()] == ["c1", "c2"]
+        cursor = first.headers[CURSOR_HEADER]
+
+        second = client.get("/customers", params={"cursor": cursor, "limit": 2})
+        assert [item["id"] for item in second.json()] == ["c3", "c4"]
+
+        last = client.get("/customers", params={"cursor": second.headers[CURSOR_HEADER], "limit": 2})
+        assert [item["id"] for item in last.json()] == ["c5"]
+        assert CURSOR_HEADER not in last.headers
+
+    def test_exact_multiple_of_limit_has_no_trailing_cursor(self, client):
+        for minutes, record_id in enumerate(["c1", "c2", "c3", "c4"]):
+            _customer(record_id, minutes)
+
+        assert _pages(client, "/customers", {"limit": 2}) == [["c1", "c2"], ["c3", "c4"]]
+
+    def test_ties_on_sort_value_are_ordered_by_id(self, client):
+        for record_id in ["c3", "c1", "c2"]:
+            _customer(record_id, 0)
+
+        assert _pages(client, "/customers", {"limit": 1}) == [["c1"], ["c2"], ["c3"]]
+
+    def test_ids_with_separator_characters(self, client):
+        """Ids containing "|" or other punctuation round-trip through the cursor"""
+        # Same sort value, so resuming relies on the id half of the cursor
+        for record_id in ["a|b", "a|c", "b", "|d", "d|"]:
+            _customer(record_id, 0)
+
+        pages = _pages(client, "/customers", {"limit": 1})
+
+        assert sum(pages, []) == ["a|b", "a|c", "b", "d|", "|d"]
+
+    def test_filter_is_applied_across_pages(self, client):
+        for minutes in range(6):
+            _customer(f"c{minutes}", minutes, "Technology" if minutes % 2 else "Healthcare")
+
+        pages = _pages(client, "/customers", {"limit": 2, "industry": "technology"})
+
+        assert pages == [["c1", "c3"], ["c5"]]
+
+    def test_combined_filters(self, client):
+        """status and customer_id together keep only sales matching both"""
+        statuses = ["completed", "pending", "completed", "completed", "cancelled", "completed"]
+        for minutes, status in enumerate(statuses):
+            _sale(f"s{minutes}", minutes, "cust_a", status)
+            _sale(f"t{minutes}", minutes, "cust_b", status)
+
+        pages = _pages(client, "/sales", {"limit": 2, "status": "completed", "customer_id": "cust_a"})
+
+        assert pages == [["s0", "s2"], ["s3", "s5"]]
+
+    def test_invalid_cursor(self, client):
+        _customer("c1", 0)
+
+        for cursor in ["not-a-cursor", "2024-01-01T09:00:00|c1", "WzFd"]:
+            response = client.get("/customers", params={"cursor": cursor})
+            assert response.status_code == 400, cursor
+
+
+class FakeClock:
+    """Stands in for the time module inside mock_db"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class TestResponseCache:
+    """cached() TTL + LRU bound"""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        fake = FakeClock()
+        monkeypatch.setattr(mock_db, "time", fake)
+        yield fake
+        mock_db.invalidate_cache("test_namespace")
+
+    def _endpoint(self, calls, maxsize=128):
+        @mock_db.cached("test_namespace", expire=5, maxsize=maxsize)
+        async def endpoint(limit=10, offset=0):
+            calls.append((limit, offset))
+            return [limit, offset]
+        return endpoint
+
+    def test_hit_and_expiry(self, clock):
+        calls = []
+        endpoint = self._endpoint(calls)
+
+        asyncio.run(endpoint(limit=5))
+        asyncio.run(endpoint(limit=5))
+        assert calls == [(5, 0)]
+
+        clock.now += 6
+        asyncio.run(endpoint(limit=5))
+        assert calls == [(5, 0), (5, 0)]
+        assert len(mock_db._response_cache["test_namespace"]) == 1
+
+    def test_distinct_arguments_are_bounded(self, clock):
+        calls = []
+        endpoint = self._endpoint(calls, maxsize=3)
+
+        for offset in range(50):
+            asyncio.run(endpoint(offset=offset))
+
+        assert len(mock_db._response_cache["test_namespace"]) == 3
+
+    def test_least_recently_used_is_evicted(self, clock):
+        calls = []
+        endpoint = self._endpoint(calls, maxsize=2)
+
+        asyncio.run(endpoint(offset=1))
+        asyncio.run(endpoint(offset=2))
+        asyncio.run(endpoint(offset=1))  # offset=2 is now least recently used
+        asyncio.run(endpoint(offset=3))
+        calls.clear()
+
+        asyncio.run(endpoint(offset=1))
+        asyncio.run(endpoint(offset=2))
+        assert calls == [(10, 2)]